@@ -0,0 +1,223 @@
+"""Micro-benchmarks for the SQLite email cache.
+
+Usage:
+    python bench_cache_store.py                 # all scenarios, 50k-message cache
+    python bench_cache_store.py --messages 5000 --scenario ingest
+
+Each scenario builds a throwaway cache in a temp directory, so the real
+``email_config/email_cache.db`` is never touched.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+from genimail.constants import EMAIL_COMPANY_FETCH_PER_FOLDER, EMAIL_LIST_FETCH_TOP, EMAIL_LIST_PAGE_SIZE
+from genimail.infra.cache_store import EmailCache
+
+
+DOMAINS = ("acme.com", "northpaint.ca", "buildright.org", "example.com", "vendor.net")
+WORDS = ("invoice", "quote", "drywall", "primer", "schedule", "site", "visit", "estimate", "trim", "ceiling")
+
+
+def synthetic_message(idx, folder_id="inbox"):
+    domain = DOMAINS[idx % len(DOMAINS)]
+    word_a = WORDS[idx % len(WORDS)]
+    word_b = WORDS[(idx * 7) % len(WORDS)]
+    return {
+        "id": f"{folder_id}-msg-{idx:07d}",
+        "subject": f"{word_a.title()} {word_b} #{idx}",
+        "from": {"emailAddress": {"name": f"Sender {idx % 97}", "address": f"user{idx % 97}@{domain}"}},
+        "toRecipients": [
+            {"emailAddress": {"name": "Estimating", "address": f"estimating@{domain}"}},
+            {"emailAddress": {"name": "Me", "address": "me@mycompany.com"}},
+        ],
+        "ccRecipients": [{"emailAddress": {"name": "Office", "address": f"office{idx % 5}@{domain}"}}],
+        "receivedDateTime": f"2026-{1 + idx % 12:02d}-{1 + idx % 28:02d}T{idx % 24:02d}:{idx % 60:02d}:00Z",
+        "isRead": bool(idx % 3),
+        "hasAttachments": not idx % 4,
+        "bodyPreview": f"Following up on the {word_a} for the {word_b} job, message {idx}.",
+        "importance": "normal",
+    }
+
+
+def legacy_save_messages(cache, messages, folder_id):
+    """Row-at-a-time ingest path that save_messages used before bulk staging."""
+    now = int(time.time())
+    updated_ids = []
+    with cache._write_transaction() as conn:
+        for msg in messages:
+            msg_id = msg["id"]
+            updated_ids.append(msg_id)
+            sender = msg.get("from", {}).get("emailAddress", {})
+            conn.execute(
+                """INSERT OR REPLACE INTO messages
+                   (id, folder_id, subject, sender_name, sender_address,
+                    received_datetime, is_read, has_attachments, body_preview,
+                    importance, company_label, cached_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
+                           COALESCE((SELECT company_label FROM messages WHERE id = ?), NULL),
+                           ?)""",
+                (
+                    msg_id,
+                    folder_id,
+                    msg.get("subject"),
+                    sender.get("name"),
+                    sender.get("address"),
+                    msg.get("receivedDateTime"),
+                    1 if msg.get("isRead") else 0,
+                    1 if msg.get("hasAttachments") else 0,
+                    msg.get("bodyPreview"),
+                    msg.get("importance"),
+                    msg_id,
+                    now,
+                ),
+            )
+            conn.execute("DELETE FROM message_recipients WHERE message_id = ?", (msg_id,))
+            for role, recipient_name, recipient_address in cache._extract_recipients(msg):
+                conn.execute(
+                    """INSERT OR REPLACE INTO message_recipients
+                       (message_id, role, recipient_name, recipient_address, cached_at)
+                       VALUES (?, ?, ?, ?, ?)""",
+                    (msg_id, role, recipient_name, recipient_address, now),
+                )
+        cache._refresh_search_docs(conn, updated_ids)
+
+
+def build_cache(path, total, batch_size=EMAIL_COMPANY_FETCH_PER_FOLDER):
+    cache = EmailCache(db_path=path)
+    for start in range(0, total, batch_size):
+        batch = [synthetic_message(idx) for idx in range(start, min(total, start + batch_size))]
+        cache.save_messages(batch, "inbox")
+    return cache
+
+
+def _timed(fn):
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def scenario_ingest(workdir, total, rounds=5):
+    """Re-ingest company-fetch-sized pages into a warm cache of ``total`` messages."""
+    batch_size = EMAIL_COMPANY_FETCH_PER_FOLDER
+    results = {}
+    for label, save in (("legacy", legacy_save_messages), ("bulk", None)):
+        path = os.path.join(workdir, f"ingest-{label}.db")
+        cache = build_cache(path, total)
+        elapsed = 0.0
+        for round_idx in range(rounds):
+            start = (round_idx * batch_size) % max(1, total)
+            batch = [synthetic_message(idx) for idx in range(start, start + batch_size)]
+            if save is None:
+                elapsed += _timed(lambda b=batch: cache.save_messages(b, "inbox"))
+            else:
+                elapsed += _timed(lambda b=batch: save(cache, b, "inbox"))
+        cache.close()
+        results[label] = (rounds * batch_size) / elapsed if elapsed else float("inf")
+
+    print(f"ingest ({total} cached, {rounds}x{batch_size} upserts)")
+    print(f"  legacy row-at-a-time : {results['legacy']:>10.0f} msg/s")
+    print(f"  bulk executemany     : {results['bulk']:>10.0f} msg/s")
+    if results["legacy"]:
+        print(f"  speedup              : {results['bulk'] / results['legacy']:>10.1f}x")
+
+
+def _time_in_new_thread(fn):
+    result = {}
+
+    def run():
+        result["elapsed"] = _timed(fn)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    thread.join()
+    return result["elapsed"]
+
+
+def scenario_reads(workdir, total, cold_threads=5, warm_rounds=20):
+    """List-page and search latency on a fresh worker thread versus a warm one."""
+    path = os.path.join(workdir, "reads.db")
+    build_cache(path, total).close()
+    cache = EmailCache(db_path=path)
+    queries = {
+        "list page": lambda: cache.get_messages_page("inbox"),
+        "search": lambda: cache.search_messages("invoice drywall"),
+    }
+
+    print(f"reads ({total} cached, ms per query)")
+    for label, query in queries.items():
+        per_thread_check = []
+        for _ in range(cold_threads):
+            # Forget the verified path so the new thread pays quick_check, as every thread used to.
+            with EmailCache._verified_paths_lock:
+                EmailCache._verified_paths.clear()
+            per_thread_check.append(_time_in_new_thread(query))
+        once_per_process = [_time_in_new_thread(query) for _ in range(cold_threads)]
+
+        def warm():
+            query()
+            return [_timed(query) for _ in range(warm_rounds)]
+
+        warm_result = {}
+        thread = threading.Thread(target=lambda: warm_result.setdefault("times", warm()))
+        thread.start()
+        thread.join()
+        print(f"  {label:<10} cold thread, check per thread : {1000 * min(per_thread_check):>9.2f}")
+        print(f"  {label:<10} cold thread, check once       : {1000 * min(once_per_process):>9.2f}")
+        print(f"  {label:<10} warm thread                   : {1000 * min(warm_result['times']):>9.2f}")
+    cache.close()
+
+
+def scenario_search(workdir, total, rounds=5, typed="drywall sched"):
+    """Ranked, highlighted search run once per keystroke of ``typed``."""
+    path = os.path.join(workdir, "search.db")
+    build_cache(path, total).close()
+    cache = EmailCache(db_path=path)
+    prefixes = [typed[:end] for end in range(2, len(typed) + 1) if not typed[:end].endswith(" ")]
+
+    print(f"search-as-you-type ({total} cached, {len(prefixes)} keystrokes, ms per keystroke)")
+    last_page = EMAIL_LIST_FETCH_TOP - EMAIL_LIST_PAGE_SIZE
+    queries = {
+        "first page": lambda text: cache.search_messages_page(text, folder_id="inbox"),
+        "last page": lambda text: cache.search_messages_page(text, folder_id="inbox", cursor=last_page),
+        f"all {EMAIL_LIST_FETCH_TOP}": lambda text: cache.search_messages(
+            text, folder_id="inbox", limit=EMAIL_LIST_FETCH_TOP
+        ),
+    }
+    for label, search in queries.items():
+        per_keystroke = []
+        for prefix in prefixes:
+            query = lambda text=prefix: search(text)
+            query()
+            per_keystroke.append(min(_timed(query) for _ in range(rounds)))
+        print(f"  {label:<10} median : {1000 * statistics.median(per_keystroke):>9.2f}")
+        print(f"  {label:<10} worst  : {1000 * max(per_keystroke):>9.2f}")
+    cache.close()
+
+
+SCENARIOS = {
+    "ingest": scenario_ingest,
+    "reads": scenario_reads,
+    "search": scenario_search,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=50000, help="messages in the synthetic cache")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), action="append", help="scenario(s) to run")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="genimail-bench-") as workdir:
+        for name in args.scenario or list(SCENARIOS):
+            SCENARIOS[name](workdir, max(1, args.messages))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,29 @@
 APP_NAME = "Genis Email Hub"
 GRAPH_BASE = "https://graph.microsoft.com/v1.0"
+GRAPH_BATCH_MAX_REQUESTS = 20
+GRAPH_MESSAGE_PAGE_SIZE = 100
 SCOPES = ["Mail.Read", "Mail.Send", "Mail.ReadWrite", "User.Read"]
 DEFAULT_CLIENT_ID = "14d82eec-204b-4c2f-b7e8-296a70dab67e"
 AUTHORITY = "https://login.microsoftonline.com/common"
 POLL_INTERVAL_MS = 30000
+POLL_INBOX_INTERVAL_SEC = 30
+POLL_FOLDER_INTERVAL_SEC = 120
+POLL_LOW_TRAFFIC_INTERVAL_SEC = 600
+POLL_IDLE_BACKOFF_FACTOR = 2.0
+POLL_IDLE_BACKOFF_MAX_FACTOR = 8.0
+POLL_BACKGROUND_FACTOR = 4.0
+POLL_ACTIVITY_DELAY_SEC = 2
+POLL_MIN_TIMER_MS = 1000
+CHANGE_NOTIFICATION_HOST = "127.0.0.1"
+CHANGE_NOTIFICATION_MAX_BODY_BYTES = 1024 * 1024
 HTTP_CONNECT_TIMEOUT_SEC = 10
 HTTP_READ_TIMEOUT_SEC = 45
 HTTP_GET_RETRIES = 1
+HTTP_SERVER_ERROR_RETRIES = 2
+GRAPH_THROTTLE_RATE_PER_SEC = 10.0
+GRAPH_THROTTLE_BURST = 20
+GRAPH_BACKOFF_BASE_SEC = 0.5
+GRAPH_BACKOFF_MAX_SEC = 30.0
 BROWSER_RUNTIME_INSTALL_URL = "https://go.microsoft.com/fwlink/p/?LinkId=2124703"
 
 BYTES_PER_KB = 1024
@@ -33,13 +50,44 @@ QT_THREAD_POOL_MAX_WORKERS = 3
 INTERNET_DEFAULT_URL = "https://www.bing.com"
 
 EMAIL_DELTA_FALLBACK_TOP = 20
+SYNC_FOLDER_MAX_WORKERS = 4
+BODY_PREFETCH_MAX_MESSAGES = 15
+BODY_PREFETCH_MIN_INTERVAL_SEC = 0.5
+MESSAGE_DETAIL_CACHE_MAX_BYTES = 32 * 1024 * 1024
+ATTACHMENT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+ATTACHMENT_BLOB_STORE_MAX_BYTES = 1024 * 1024 * 1024
+ATTACHMENT_DOWNLOAD_CHUNK_BYTES = 256 * 1024
+ATTACHMENT_INLINE_SEND_MAX_BYTES = 3 * 1024 * 1024
+ATTACHMENT_UPLOAD_CHUNK_BYTES = 10 * 320 * 1024
+ATTACHMENT_UPLOAD_RETRIES = 3
 EMAIL_LIST_FETCH_TOP = 1000
+EMAIL_LIST_PAGE_SIZE = 100
 EMAIL_COMPANY_FETCH_PER_FOLDER = 1000
 EMAIL_COMPANY_CACHE_TTL_SEC = 120
+EMAIL_COMPANY_SYNC_STALE_SEC = 15 * 60
+EMAIL_COMPANY_SYNC_SLACK_SEC = 60
 EMAIL_COMPANY_MEMORY_CACHE_MAX = 20
 SEARCH_HISTORY_MAX_ITEMS = 25
+# bm25 weights for the FTS columns: subject, sender, recipients, preview, body.
+SEARCH_RANK_WEIGHTS = (10.0, 6.0, 3.0, 2.0, 1.0)
+# Local search scores at most this many matches, newest received first (or
+# the requested limit, if larger), bounding bm25 work for very common words.
+SEARCH_RANK_CANDIDATES = 1000
+# Above this many matches, a folder search picks its candidates by walking the
+# folder newest-first instead of sorting every match by date.
+SEARCH_FOLDER_WALK_MIN_MATCHES = 4 * SEARCH_RANK_CANDIDATES
+SEARCH_SNIPPET_TOKENS = 12
+# Control characters bracket matched terms in highlighted search text; they
+# never occur in message text, and the list delegate paints the marked terms bold.
+SEARCH_HIGHLIGHT_START = "\x02"
+SEARCH_HIGHLIGHT_END = "\x03"
 TOKEN_CACHE_ID_HASH_CHARS = 12
 SQL_PARAM_CHUNK_SIZE = 900
+CACHE_DB_CACHED_STATEMENTS = 256
+CACHE_DB_PAGE_CACHE_KB = 16 * 1024
+CACHE_DB_MMAP_BYTES = 256 * 1024 * 1024
+CACHE_WRITE_QUEUE_MAX = 256
+CACHE_WRITE_BATCH_MAX = 64
 
 FOLDER_DISPLAY = {
     "inbox": "Inbox",
@@ -1,5 +1,14 @@
 """Infrastructure modules for Genimail."""
 
-from . import cache_store, config_store, document_store, graph_client
+from . import blob_store, cache_store, cache_writer, config_store, document_store, graph_client, graph_throttle, memory_cache
 
-__all__ = ["cache_store", "config_store", "document_store", "graph_client"]
+__all__ = [
+    "blob_store",
+    "cache_store",
+    "cache_writer",
+    "config_store",
+    "document_store",
+    "graph_client",
+    "graph_throttle",
+    "memory_cache",
+]
@@ -0,0 +1,163 @@
+"""Content-addressed on-disk store for downloaded attachment payloads."""
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+
+from genimail.constants import ATTACHMENT_BLOB_STORE_MAX_BYTES
+from genimail.paths import ATTACHMENT_BLOB_DIR
+
+logger = logging.getLogger(__name__)
+
+_HASH_NAME = "sha256"
+_READ_CHUNK_BYTES = 1024 * 1024
+
+
+def hash_bytes(data):
+    return hashlib.new(_HASH_NAME, data or b"").hexdigest()
+
+
+def hash_file(path):
+    digest = hashlib.new(_HASH_NAME)
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(_READ_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class AttachmentBlobStore:
+    """Stores attachment bytes once per content hash, capped at ``max_bytes``.
+
+    Blobs live at ``<root>/<hash[:2]>/<hash>``.  File mtimes double as the LRU
+    clock: ``path_for`` touches a blob when it is served, and ``put`` evicts
+    the stalest blobs once the store grows past its budget.  The blob just
+    written is never evicted by its own ``put``.
+    """
+
+    def __init__(self, root_dir=None, max_bytes=ATTACHMENT_BLOB_STORE_MAX_BYTES):
+        self.root_dir = root_dir or ATTACHMENT_BLOB_DIR
+        self.max_bytes = max(0, int(max_bytes or 0))
+        self._lock = threading.Lock()
+        self._total_bytes = None
+        self.evictions = 0
+
+    @staticmethod
+    def _valid_hash(blob_hash):
+        value = (blob_hash or "").strip().lower()
+        if len(value) != hashlib.new(_HASH_NAME).digest_size * 2:
+            return ""
+        if any(ch not in "0123456789abcdef" for ch in value):
+            return ""
+        return value
+
+    def _blob_path(self, blob_hash):
+        return os.path.join(self.root_dir, blob_hash[:2], blob_hash)
+
+    def path_for(self, blob_hash):
+        """Return the on-disk path for ``blob_hash`` and mark it recently used, or ``None``."""
+        blob_hash = self._valid_hash(blob_hash)
+        if not blob_hash:
+            return None
+        path = self._blob_path(blob_hash)
+        try:
+            os.utime(path, None)
+        except OSError:
+            return None
+        return path
+
+    def has(self, blob_hash):
+        blob_hash = self._valid_hash(blob_hash)
+        return bool(blob_hash) and os.path.isfile(self._blob_path(blob_hash))
+
+    def put(self, data):
+        """Store ``data`` (deduplicated by content) and return its hash."""
+        tmp_path = self.incoming_path()
+        try:
+            with open(tmp_path, "wb") as handle:
+                handle.write(data)
+        except Exception:
+            self.discard_incoming(tmp_path)
+            raise
+        return self.put_file(tmp_path)
+
+    def incoming_path(self):
+        """Reserve a temp file inside the store for a download in progress."""
+        os.makedirs(self.root_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".incoming-", dir=self.root_dir)
+        os.close(fd)
+        return tmp_path
+
+    @staticmethod
+    def discard_incoming(tmp_path):
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+    def put_file(self, tmp_path):
+        """Move a finished ``incoming_path`` file into the store and return its hash.
+
+        The file is consumed: it is renamed into place, or removed when the
+        same content is already stored.
+        """
+        try:
+            blob_hash = hash_file(tmp_path)
+            if self.path_for(blob_hash) is not None:
+                self.discard_incoming(tmp_path)
+                return blob_hash
+            size = os.path.getsize(tmp_path)
+            path = self._blob_path(blob_hash)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(tmp_path, path)
+        except Exception:
+            self.discard_incoming(tmp_path)
+            raise
+        with self._lock:
+            if self._total_bytes is not None:
+                self._total_bytes += size
+        self._evict_over_budget(keep=blob_hash)
+        return blob_hash
+
+    def total_bytes(self):
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(size for _, size, _ in self._scan())
+            return self._total_bytes
+
+    def _scan(self):
+        entries = []
+        if not os.path.isdir(self.root_dir):
+            return entries
+        for bucket in os.listdir(self.root_dir):
+            bucket_dir = os.path.join(self.root_dir, bucket)
+            if not os.path.isdir(bucket_dir):
+                continue
+            for name in os.listdir(bucket_dir):
+                try:
+                    stat = os.stat(os.path.join(bucket_dir, name))
+                except OSError:
+                    continue
+                entries.append((name, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _evict_over_budget(self, keep=None):
+        if self.total_bytes() <= self.max_bytes:
+            return
+        with self._lock:
+            entries = sorted(self._scan(), key=lambda entry: entry[2])
+            total = sum(size for _, size, _ in entries)
+            for name, size, _ in entries:
+                if total <= self.max_bytes:
+                    break
+                if name == keep:
+                    continue
+                try:
+                    os.remove(self._blob_path(name))
+                except OSError:
+                    continue
+                total -= size
+                self.evictions += 1
+            self._total_bytes = total
+        logger.debug("blob store at %d/%d bytes after eviction", total, self.max_bytes)
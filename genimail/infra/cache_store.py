@@ -1,5 +1,8 @@
+import html
 import logging
 import os
+import pathlib
+import re
 import sqlite3
 import threading
 import time
@@ -7,18 +10,38 @@ from contextlib import contextmanager
 
 logger = logging.getLogger(__name__)
 
-from genimail.constants import SQL_PARAM_CHUNK_SIZE
+from genimail.constants import (
+    CACHE_DB_CACHED_STATEMENTS,
+    CACHE_DB_MMAP_BYTES,
+    CACHE_DB_PAGE_CACHE_KB,
+    EMAIL_LIST_FETCH_TOP,
+    EMAIL_LIST_PAGE_SIZE,
+    SEARCH_FOLDER_WALK_MIN_MATCHES,
+    SEARCH_HIGHLIGHT_END,
+    SEARCH_HIGHLIGHT_START,
+    SEARCH_RANK_CANDIDATES,
+    SEARCH_RANK_WEIGHTS,
+    SEARCH_SNIPPET_TOKENS,
+    SQL_PARAM_CHUNK_SIZE,
+)
 from genimail.paths import CACHE_DB_FILE
 
+# Bodies are indexed as stored, so a body snippet can carry markup: whole
+# tags, a tag cut open at the end, or attribute text cut off at the start.
+_SNIPPET_MARKUP_RE = re.compile(r"<[^>]*>|<[^>]*$|^[^<>]*[=/][^<>]*>")
+
 
 class EmailCache:
     """SQLite-based persistent cache for emails with thread-safe connections."""
 
-    SCHEMA_VERSION = 4
+    SCHEMA_VERSION = 13
     DEFAULT_SEARCH_LIMIT = 2000
+    _verified_paths = set()
+    _verified_paths_lock = threading.Lock()
 
-    def __init__(self, db_path=None):
+    def __init__(self, db_path=None, defer_search_rebuild=False):
         self.db_path = db_path or CACHE_DB_FILE
+        self.defer_search_rebuild = bool(defer_search_rebuild)
         self._local = threading.local()
         self._write_lock = threading.RLock()
         self._connection_registry_lock = threading.Lock()
@@ -31,34 +54,89 @@ class EmailCache:
 
     @property
     def conn(self):
-        """Thread-local database connection."""
+        """Thread-local read-write database connection."""
         if not hasattr(self._local, "conn") or self._local.conn is None:
-            conn = None
             try:
-                conn = sqlite3.connect(self.db_path, timeout=self._sqlite_timeout_sec)
-                conn.row_factory = sqlite3.Row
-                conn.execute("PRAGMA journal_mode=WAL")
-                conn.execute("PRAGMA synchronous=NORMAL")
-                conn.execute("PRAGMA foreign_keys=ON")
-                self._ensure_connection_integrity(conn)
+                conn = self._open_write_connection()
             except sqlite3.DatabaseError as exc:
-                if conn is not None:
-                    try:
-                        conn.close()
-                    except Exception:
-                        pass
                 if not self._recover_corrupted_database(exc):
                     raise
-                conn = sqlite3.connect(self.db_path, timeout=self._sqlite_timeout_sec)
-                conn.row_factory = sqlite3.Row
-                conn.execute("PRAGMA journal_mode=WAL")
-                conn.execute("PRAGMA synchronous=NORMAL")
-                conn.execute("PRAGMA foreign_keys=ON")
-                self._ensure_connection_integrity(conn)
+                conn = self._open_write_connection()
             self._local.conn = conn
             self._register_connection(conn)
         return self._local.conn
 
+    @property
+    def read_conn(self):
+        """Thread-local read-only connection for queries.
+
+        Falls back to ``conn`` while this thread has a write transaction open
+        (so it reads its own uncommitted rows), for in-memory databases, and
+        when a read-only handle cannot be opened.
+        """
+        write_conn = getattr(self._local, "conn", None)
+        if write_conn is not None and write_conn.in_transaction:
+            return write_conn
+        read_conn = getattr(self._local, "read_conn", None)
+        if read_conn is None:
+            if self._is_memory_db():
+                return self.conn
+            # The write connection creates the WAL files a read-only handle needs.
+            _ = self.conn
+            try:
+                read_conn = self._open_read_connection()
+            except sqlite3.Error as exc:
+                logger.warning("read-only cache connection unavailable, using read-write: %s", exc)
+                return self.conn
+            self._local.read_conn = read_conn
+            self._register_connection(read_conn)
+        return read_conn
+
+    def _is_memory_db(self):
+        return str(self.db_path or "").strip() in ("", ":memory:")
+
+    @staticmethod
+    def _tune_connection(conn):
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA cache_size=-{CACHE_DB_PAGE_CACHE_KB}")
+        conn.execute(f"PRAGMA mmap_size={CACHE_DB_MMAP_BYTES}")
+
+    def _open_write_connection(self):
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self._sqlite_timeout_sec,
+            cached_statements=CACHE_DB_CACHED_STATEMENTS,
+        )
+        try:
+            self._tune_connection(conn)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._ensure_connection_integrity(conn)
+        except sqlite3.DatabaseError:
+            try:
+                conn.close()
+            except Exception:
+                pass
+            raise
+        return conn
+
+    def _open_read_connection(self):
+        uri = f"{pathlib.Path(os.path.abspath(self.db_path)).as_uri()}?mode=ro"
+        conn = sqlite3.connect(
+            uri,
+            uri=True,
+            timeout=self._sqlite_timeout_sec,
+            cached_statements=CACHE_DB_CACHED_STATEMENTS,
+        )
+        try:
+            self._tune_connection(conn)
+            conn.execute("PRAGMA query_only=ON")
+        except sqlite3.Error:
+            conn.close()
+            raise
+        return conn
+
     def _register_connection(self, conn):
         with self._connection_registry_lock:
             if conn not in self._all_connections:
@@ -72,9 +150,20 @@ class EmailCache:
         value = row[0] if isinstance(row, (tuple, list)) else row[0]
         return str(value or "").strip().lower() == "ok"
 
+    def _integrity_key(self):
+        return None if self._is_memory_db() else os.path.abspath(self.db_path)
+
     def _ensure_connection_integrity(self, conn):
+        # quick_check scans the whole file, so it runs once per database per
+        # process rather than once per worker thread.
+        key = self._integrity_key()
+        with EmailCache._verified_paths_lock:
+            if key is None or key in EmailCache._verified_paths:
+                return
         if not self._integrity_check_ok(conn):
             raise sqlite3.DatabaseError("SQLite integrity check failed")
+        with EmailCache._verified_paths_lock:
+            EmailCache._verified_paths.add(key)
 
     def _recover_corrupted_database(self, exc):
         db_path = str(self.db_path or "").strip()
@@ -169,11 +258,16 @@ class EmailCache:
                 CREATE TABLE IF NOT EXISTS sync_state (
                     folder_id TEXT PRIMARY KEY,
                     delta_link TEXT,
-                    last_sync INTEGER
+                    last_sync INTEGER,
+                    next_link TEXT,
+                    pages_synced INTEGER NOT NULL DEFAULT 0,
+                    started_at INTEGER
                 )
                 """
             )
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_messages_folder ON messages(folder_id, received_datetime DESC)")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_messages_folder ON messages(folder_id, received_datetime DESC, id DESC)"
+            )
             conn.execute("CREATE INDEX IF NOT EXISTS idx_messages_cached ON messages(cached_at)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_messages_company ON messages(company_label)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_messages_sender ON messages(sender_address)")
@@ -197,9 +291,53 @@ class EmailCache:
                 self._migrate_to_v4(conn)
                 self._set_schema_version(conn, 4)
                 current_version = 4
+            if current_version < 5:
+                self._migrate_to_v5(conn)
+                self._set_schema_version(conn, 5)
+                current_version = 5
+            if current_version < 6:
+                self._migrate_to_v6(conn)
+                self._set_schema_version(conn, 6)
+                current_version = 6
+            if current_version < 7:
+                self._migrate_to_v7(conn)
+                self._set_schema_version(conn, 7)
+                current_version = 7
+            if current_version < 8:
+                self._migrate_to_v8(conn)
+                self._set_schema_version(conn, 8)
+                current_version = 8
+            if current_version < 9:
+                self._migrate_to_v9(conn)
+                self._set_schema_version(conn, 9)
+                current_version = 9
+            if current_version < 10:
+                self._migrate_to_v10(conn)
+                self._set_schema_version(conn, 10)
+                current_version = 10
+            if current_version < 11:
+                self._migrate_to_v11(conn)
+                self._set_schema_version(conn, 11)
+                current_version = 11
+            if current_version < 12:
+                self._migrate_to_v12(conn)
+                self._set_schema_version(conn, 12)
+                current_version = 12
+            if current_version < 13:
+                self._migrate_to_v13(conn)
+                self._set_schema_version(conn, 13)
+                current_version = 13
             if current_version != self.SCHEMA_VERSION:
                 self._set_schema_version(conn, self.SCHEMA_VERSION)
 
+        # The v5 and v13 migrations only create the index schema; documents
+        # are filled in bounded chunks outside the migration transaction.
+        # Running the check on every open also resumes a rebuild interrupted
+        # by shutdown.  With ``defer_search_rebuild`` the caller runs
+        # rebuild_search_index itself, e.g. on a worker thread.
+        if not self.defer_search_rebuild and self.search_index_needs_rebuild():
+            self.rebuild_search_index()
+
     @staticmethod
     def _current_schema_version(conn):
         cur = conn.execute("SELECT version FROM schema_version ORDER BY version DESC LIMIT 1")
@@ -260,13 +398,11 @@ class EmailCache:
         active_conn = conn or self.conn
         return self._fts5_supported(active_conn) and self._fts_table_exists(active_conn)
 
-    def _migrate_to_v3(self, conn):
-        if not self._fts5_supported(conn):
-            return
-        conn.execute(
-            "CREATE VIRTUAL TABLE IF NOT EXISTS message_search_fts USING fts5(message_id UNINDEXED, searchable_text)"
-        )
-        self._rebuild_search_index(conn)
+    @staticmethod
+    def _migrate_to_v3(conn):
+        # v3 introduced a Python-maintained FTS table; v5 replaces it outright.
+        _ = conn
+        pass
 
     @staticmethod
     def _table_has_foreign_key(conn, table_name):
@@ -367,8 +503,189 @@ class EmailCache:
             ),
         )
 
+    _FTS_CREATE_SQL = (
+        "CREATE VIRTUAL TABLE IF NOT EXISTS message_search_fts USING fts5("
+        "subject, sender, recipients, preview, body, "
+        "content='message_search_docs', content_rowid='doc_id', prefix='2 3')"
+    )
+
+    # message_search_docs is the external content table for message_search_fts.
+    # The first three triggers are the standard FTS5 external-content sync;
+    # the rest keep documents current when bodies or messages change.
+    _SEARCH_INDEX_TRIGGERS = (
+        """CREATE TRIGGER IF NOT EXISTS message_search_docs_ai AFTER INSERT ON message_search_docs BEGIN
+               INSERT INTO message_search_fts (rowid, subject, sender, recipients, preview, body)
+               VALUES (new.doc_id, new.subject, new.sender, new.recipients, new.preview, new.body);
+           END""",
+        """CREATE TRIGGER IF NOT EXISTS message_search_docs_ad AFTER DELETE ON message_search_docs BEGIN
+               INSERT INTO message_search_fts (message_search_fts, rowid, subject, sender, recipients, preview, body)
+               VALUES ('delete', old.doc_id, old.subject, old.sender, old.recipients, old.preview, old.body);
+           END""",
+        """CREATE TRIGGER IF NOT EXISTS message_search_docs_au AFTER UPDATE ON message_search_docs BEGIN
+               INSERT INTO message_search_fts (message_search_fts, rowid, subject, sender, recipients, preview, body)
+               VALUES ('delete', old.doc_id, old.subject, old.sender, old.recipients, old.preview, old.body);
+               INSERT INTO message_search_fts (rowid, subject, sender, recipients, preview, body)
+               VALUES (new.doc_id, new.subject, new.sender, new.recipients, new.preview, new.body);
+           END""",
+        """CREATE TRIGGER IF NOT EXISTS messages_search_ad AFTER DELETE ON messages BEGIN
+               DELETE FROM message_search_docs WHERE message_id = old.id;
+           END""",
+        """CREATE TRIGGER IF NOT EXISTS message_bodies_search_ai AFTER INSERT ON message_bodies BEGIN
+               UPDATE message_search_docs SET body = new.content
+               WHERE message_id = new.id AND body IS NOT new.content;
+           END""",
+        """CREATE TRIGGER IF NOT EXISTS message_bodies_search_au AFTER UPDATE OF content ON message_bodies BEGIN
+               UPDATE message_search_docs SET body = new.content
+               WHERE message_id = new.id AND body IS NOT new.content;
+           END""",
+        """CREATE TRIGGER IF NOT EXISTS message_bodies_search_ad AFTER DELETE ON message_bodies BEGIN
+               UPDATE message_search_docs SET body = NULL
+               WHERE message_id = old.id AND body IS NOT NULL;
+           END""",
+    )
+
+    def _migrate_to_v5(self, conn):
+        if not self._fts5_supported(conn):
+            return
+        # The v3 table indexed one Python-assembled text blob per message.
+        conn.execute("DROP TABLE IF EXISTS message_search_fts")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS message_search_docs (
+                doc_id INTEGER PRIMARY KEY,
+                message_id TEXT NOT NULL UNIQUE,
+                subject TEXT,
+                sender TEXT,
+                recipients TEXT,
+                preview TEXT,
+                body TEXT
+            )
+            """
+        )
+        conn.execute(self._FTS_CREATE_SQL)
+        for statement in self._SEARCH_INDEX_TRIGGERS:
+            conn.execute(statement)
+
     @staticmethod
-    def _fts_query_from_text(text):
+    def _migrate_to_v6(conn):
+        # Keyset pages order by (received_datetime, id); the id column lets
+        # ties resolve inside the index instead of a temp B-tree sort.
+        conn.execute("DROP INDEX IF EXISTS idx_messages_folder")
+        conn.execute(
+            "CREATE INDEX idx_messages_folder ON messages(folder_id, received_datetime DESC, id DESC)"
+        )
+
+    @classmethod
+    def _migrate_to_v7(cls, conn):
+        # Cached bodies are rendered without Graph, so inline parts must stay
+        # distinguishable from real attachments.
+        if not cls._column_exists(conn, "attachments", "is_inline"):
+            conn.execute("ALTER TABLE attachments ADD COLUMN is_inline INTEGER NOT NULL DEFAULT 0")
+        if not cls._column_exists(conn, "attachments", "content_id"):
+            conn.execute("ALTER TABLE attachments ADD COLUMN content_id TEXT")
+
+    @classmethod
+    def _migrate_to_v8(cls, conn):
+        # Downloaded payloads live in the content-addressed blob store; the
+        # hash lets repeated opens skip Graph entirely.
+        if not cls._column_exists(conn, "attachments", "blob_hash"):
+            conn.execute("ALTER TABLE attachments ADD COLUMN blob_hash TEXT")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_attachments_blob ON attachments(blob_hash)")
+
+    @classmethod
+    def _migrate_to_v9(cls, conn):
+        # Delta rounds are committed page by page; the pending nextLink lets an
+        # interrupted round resume instead of starting over.
+        if not cls._column_exists(conn, "sync_state", "next_link"):
+            conn.execute("ALTER TABLE sync_state ADD COLUMN next_link TEXT")
+
+    @classmethod
+    def _migrate_to_v10(cls, conn):
+        # Page count and start time describe the round behind next_link, so a
+        # resumed initial sync can report how far it already got.
+        if not cls._column_exists(conn, "sync_state", "pages_synced"):
+            conn.execute("ALTER TABLE sync_state ADD COLUMN pages_synced INTEGER NOT NULL DEFAULT 0")
+        if not cls._column_exists(conn, "sync_state", "started_at"):
+            conn.execute("ALTER TABLE sync_state ADD COLUMN started_at INTEGER")
+
+    @classmethod
+    def _migrate_to_v11(cls, conn):
+        # Normalized sender/recipient addresses with their domain, so company
+        # filters are index lookups instead of LOWER(...) LIKE '%@domain' scans.
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS message_participants (
+                message_id TEXT NOT NULL REFERENCES messages(id) ON DELETE CASCADE,
+                role TEXT NOT NULL,
+                address TEXT NOT NULL,
+                domain TEXT NOT NULL,
+                PRIMARY KEY (message_id, role, address)
+            )
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_message_participants_domain ON message_participants(domain)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_message_participants_address ON message_participants(address)")
+        conn.execute(
+            """INSERT OR IGNORE INTO message_participants (message_id, role, address, domain)
+               SELECT id, 'from', address,
+                      CASE WHEN INSTR(address, '@') > 0 THEN SUBSTR(address, INSTR(address, '@') + 1) ELSE '' END
+               FROM (SELECT id, LOWER(TRIM(sender_address)) AS address FROM messages)
+               WHERE COALESCE(address, '') != ''"""
+        )
+        conn.execute(
+            """INSERT OR IGNORE INTO message_participants (message_id, role, address, domain)
+               SELECT message_id, role, address,
+                      CASE WHEN INSTR(address, '@') > 0 THEN SUBSTR(address, INSTR(address, '@') + 1) ELSE '' END
+               FROM (SELECT message_id, role, LOWER(TRIM(recipient_address)) AS address FROM message_recipients)
+               WHERE COALESCE(address, '') != ''"""
+        )
+
+    @classmethod
+    def _migrate_to_v12(cls, conn):
+        # Per-company, per-folder totals maintained on write, so the sidebar
+        # reads every tab's counts in one query instead of filtering messages.
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS company_counts (
+                domain TEXT NOT NULL,
+                folder_id TEXT NOT NULL,
+                total INTEGER NOT NULL DEFAULT 0,
+                unread INTEGER NOT NULL DEFAULT 0,
+                last_received TEXT,
+                PRIMARY KEY (domain, folder_id)
+            )
+            """
+        )
+        cls._rebuild_company_counts(conn)
+
+    def _migrate_to_v13(self, conn):
+        # Two- and three-character prefix indexes keep "pa*" style queries
+        # from scanning the whole term list.  Options are fixed at CREATE
+        # time, so the index is recreated empty and its documents cleared;
+        # the chunked rebuild after migration fills both again.
+        if not self._fts5_supported(conn):
+            return
+        row = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'message_search_fts'"
+        ).fetchone()
+        if row is None or "prefix=" in (row[0] or ""):
+            return
+        # Drop the sync triggers first so clearing documents does no FTS work.
+        for trigger in ("message_search_docs_ai", "message_search_docs_ad", "message_search_docs_au"):
+            conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        conn.execute("DROP TABLE IF EXISTS message_search_fts")
+        conn.execute("DELETE FROM message_search_docs")
+        conn.execute(self._FTS_CREATE_SQL)
+        for statement in self._SEARCH_INDEX_TRIGGERS:
+            conn.execute(statement)
+
+    @staticmethod
+    def _column_exists(conn, table_name, column_name):
+        rows = conn.execute(f"PRAGMA table_info({table_name})").fetchall()
+        return any(row[1] == column_name for row in rows)
+
+    @staticmethod
+    def _fts_query_from_text(text, prefix_last=False):
         tokens = [token.strip() for token in (text or "").split() if token.strip()]
         if not tokens:
             return ""
@@ -381,6 +698,10 @@ class EmailCache:
                     escaped_tokens.append(f'"{base}"*')
             else:
                 escaped_tokens.append(f'"{raw}"')
+        if prefix_last and len(tokens[-1]) > 1 and not tokens[-1].endswith("*"):
+            # The last word may still be being typed.  One letter is left
+            # exact: the prefix indexes start at two and it would match most terms.
+            escaped_tokens[-1] += "*"
         return " AND ".join(escaped_tokens)
 
     @staticmethod
@@ -416,30 +737,30 @@ class EmailCache:
         "m.importance, m.company_label"
     )
 
+    # Column-weighted bm25: subject over sender over recipients and body.
+    _FTS_RANK_SQL = "bm25(message_search_fts, {})".format(", ".join(str(float(w)) for w in SEARCH_RANK_WEIGHTS))
+    _FTS_HIGHLIGHT_PARAMS = (
+        SEARCH_HIGHLIGHT_START,
+        SEARCH_HIGHLIGHT_END,
+        SEARCH_HIGHLIGHT_START,
+        SEARCH_HIGHLIGHT_END,
+        SEARCH_SNIPPET_TOKENS,
+        SEARCH_HIGHLIGHT_START,
+        SEARCH_HIGHLIGHT_END,
+        SEARCH_SNIPPET_TOKENS,
+    )
+
     def _build_company_predicate(self, normalized):
         if "@" in normalized and " " not in normalized:
             return (
-                "("
-                "LOWER(COALESCE(m.sender_address, '')) = ? "
-                "OR EXISTS ("
-                "SELECT 1 FROM message_recipients r "
-                "WHERE r.message_id = m.id AND LOWER(COALESCE(r.recipient_address, '')) = ?"
-                ")"
-                ")",
-                [normalized, normalized],
+                "m.id IN (SELECT p.message_id FROM message_participants p WHERE p.address = ?)",
+                [normalized],
             )
 
         if "." in normalized and "@" not in normalized and " " not in normalized:
-            domain_like = f"%@{normalized}"
             return (
-                "("
-                "LOWER(COALESCE(m.sender_address, '')) LIKE ? "
-                "OR EXISTS ("
-                "SELECT 1 FROM message_recipients r "
-                "WHERE r.message_id = m.id AND LOWER(COALESCE(r.recipient_address, '')) LIKE ?"
-                ")"
-                ")",
-                [domain_like, domain_like],
+                "m.id IN (SELECT p.message_id FROM message_participants p WHERE p.domain = ?)",
+                [normalized],
             )
 
         like_value = f"%{normalized}%"
@@ -488,7 +809,7 @@ class EmailCache:
         if limit is not None:
             limit_clause = "\n               LIMIT ?"
             params.append(int(limit))
-        cur = self.conn.execute(
+        cur = self.read_conn.execute(
             f"""SELECT {self._BASE_MESSAGE_SELECT}
                FROM messages m
                WHERE {company_clause}{search_clause}
@@ -499,96 +820,200 @@ class EmailCache:
 
     def _search_company_messages_fts(self, normalized, search_text, limit=None):
         company_clause, company_params = self._build_company_predicate(normalized)
-        fts_query = self._fts_query_from_text(search_text)
+        fts_query = self._fts_query_from_text(search_text, prefix_last=True)
         if not fts_query:
             return self._search_company_messages_like(normalized, search_text=search_text, limit=limit)
-        params = [*company_params, fts_query]
+        return self._search_fts(fts_query, f" AND {company_clause}", company_params, limit)
+
+    # Candidate pickers for _search_fts: both return the doc ids of the newest
+    # matches.  The first sorts every match by date; the second walks a folder
+    # newest-first and stops once it has enough, which is cheaper when most of
+    # the folder matches.  CROSS JOIN and ``+doc_id`` keep SQLite from turning
+    # either into one prefix-expanding FTS lookup per message.
+    _SEARCH_CANDIDATES_BY_MATCH_SQL = """SELECT d.doc_id
+                         FROM message_search_fts candidate_fts
+                         CROSS JOIN message_search_docs d ON d.doc_id = candidate_fts.rowid
+                         CROSS JOIN messages m ON m.id = d.message_id
+                         WHERE candidate_fts.message_search_fts MATCH ?{filter_clause}
+                         ORDER BY m.received_datetime DESC, m.id DESC
+                         LIMIT ?"""
+    _SEARCH_CANDIDATES_BY_FOLDER_SQL = """SELECT d.doc_id
+                         FROM messages m
+                         CROSS JOIN message_search_docs d ON d.message_id = m.id
+                         WHERE m.folder_id = ?
+                           AND +d.doc_id IN (
+                               SELECT rowid FROM message_search_fts WHERE message_search_fts MATCH ?
+                           )
+                         ORDER BY m.received_datetime DESC, m.id DESC
+                         LIMIT ?"""
+
+    def _search_fts(self, fts_query, filter_clause="", filter_params=(), limit=None, offset=0, folder_id=None):
+        """Rank FTS matches that pass ``filter_clause`` and return highlighted messages.
+
+        Only the ``SEARCH_RANK_CANDIDATES`` newest matches by received date
+        are scored, so a common word or a two-letter prefix costs a bounded
+        amount of bm25 work instead of one call per matching message.  The
+        candidates are picked without bm25 and scored by a second walk of the
+        doclist.  ``folder_id`` restricts the search to one folder and lets a
+        query with many matches pick its candidates from the folder index.
+        ``offset`` skips that many ranked rows; only the returned rows are
+        hydrated and highlighted.
+        """
+        offset = max(0, int(offset or 0))
+        candidates = max(SEARCH_RANK_CANDIDATES, int(limit or 0) + offset)
+        if folder_id and self._count_fts_matches(fts_query) > SEARCH_FOLDER_WALK_MIN_MATCHES:
+            candidate_sql = self._SEARCH_CANDIDATES_BY_FOLDER_SQL
+            params = [fts_query, folder_id, fts_query, candidates]
+        else:
+            if folder_id:
+                filter_clause = f"{filter_clause} AND m.folder_id = ?"
+                filter_params = (*filter_params, folder_id)
+            candidate_sql = self._SEARCH_CANDIDATES_BY_MATCH_SQL.format(filter_clause=filter_clause)
+            params = [fts_query, fts_query, *filter_params, candidates]
         limit_clause = ""
         if limit is not None:
-            limit_clause = "\n               LIMIT ?"
-            params.append(int(limit))
-        cur = self.conn.execute(
-            f"""SELECT {self._BASE_MESSAGE_SELECT}
-               FROM messages m
-               JOIN message_search_fts f ON f.message_id = m.id
-               WHERE {company_clause}
-                 AND message_search_fts MATCH ?
-               ORDER BY bm25(message_search_fts), m.received_datetime DESC{limit_clause}""",
+            limit_clause = "\n               LIMIT ? OFFSET ?"
+            params.extend([int(limit), offset])
+        cur = self.read_conn.execute(
+            f"""SELECT {self._BASE_MESSAGE_SELECT}, ranked.doc_id AS search_doc_id
+               FROM (
+                   SELECT rowid AS doc_id, {self._FTS_RANK_SQL} AS score
+                   FROM message_search_fts
+                   WHERE message_search_fts MATCH ?
+                     AND +rowid IN (
+                         {candidate_sql}
+                     )
+               ) ranked
+               JOIN message_search_docs d ON d.doc_id = ranked.doc_id
+               JOIN messages m ON m.id = d.message_id
+               ORDER BY ranked.score, m.received_datetime DESC, m.id DESC{limit_clause}""",
             tuple(params),
         )
-        return self._rows_to_messages(cur.fetchall())
-
-    def _build_searchable_texts(self, conn, message_ids):
-        documents = {}
-        for chunk in self._chunked(message_ids):
-            placeholders = ",".join("?" for _ in chunk)
-            rows = conn.execute(
-                f"""SELECT m.id, m.subject, m.sender_name, m.sender_address, m.body_preview, mb.content AS body_content
-                    FROM messages m
-                    LEFT JOIN message_bodies mb ON mb.id = m.id
-                    WHERE m.id IN ({placeholders})""",
-                tuple(chunk),
-            ).fetchall()
-            for row in rows:
-                documents[row["id"]] = [
-                    row["subject"] or "",
-                    row["sender_name"] or "",
-                    row["sender_address"] or "",
-                    row["body_preview"] or "",
-                    row["body_content"] or "",
-                ]
+        rows = cur.fetchall()
+        highlights = self._search_highlights(fts_query, [row["search_doc_id"] for row in rows])
+        return self._with_search_highlights(rows, highlights)
 
-            recip_rows = conn.execute(
-                f"""SELECT message_id, recipient_name, recipient_address
-                    FROM message_recipients
-                    WHERE message_id IN ({placeholders})""",
-                tuple(chunk),
-            ).fetchall()
-            for row in recip_rows:
-                bucket = documents.get(row["message_id"])
-                if bucket is None:
-                    continue
-                bucket.append(row["recipient_name"] or "")
-                bucket.append(row["recipient_address"] or "")
+    def _count_fts_matches(self, fts_query):
+        cur = self.read_conn.execute(
+            "SELECT COUNT(*) FROM message_search_fts WHERE message_search_fts MATCH ?", (fts_query,)
+        )
+        return cur.fetchone()[0]
 
-        result = {}
-        for msg_id, parts in documents.items():
-            text = " ".join(part for part in parts if part).strip()
-            if text:
-                result[msg_id] = text
-        return result
+    def _search_highlights(self, fts_query, doc_ids):
+        """Return ``{doc_id: row}`` with the highlighted subject and best snippets.
 
-    def _upsert_search_index_for_messages(self, message_ids, conn=None):
-        active_conn = conn or self.conn
-        if not self._is_fts_enabled(active_conn):
+        snippet() needs the MATCH cursor, so the doclist is walked once per
+        chunk over the chunk's rowid range; ``+rowid`` keeps the id list from
+        becoming a per-id FTS lookup, which re-expands prefix terms each time.
+        """
+        highlights = {}
+        for chunk in self._chunked(sorted(doc_ids)):
+            placeholders = ",".join("?" for _ in chunk)
+            cur = self.read_conn.execute(
+                f"""SELECT rowid AS doc_id,
+                          highlight(message_search_fts, 0, ?, ?) AS search_subject,
+                          snippet(message_search_fts, 3, ?, ?, '…', ?) AS search_preview,
+                          snippet(message_search_fts, 4, ?, ?, '…', ?) AS search_body
+                   FROM message_search_fts
+                   WHERE message_search_fts MATCH ?
+                     AND rowid BETWEEN ? AND ?
+                     AND +rowid IN ({placeholders})""",
+                (*self._FTS_HIGHLIGHT_PARAMS, fts_query, chunk[0], chunk[-1], *chunk),
+            )
+            for row in cur.fetchall():
+                highlights[row["doc_id"]] = row
+        return highlights
+
+    # Documents are refreshed with one set-based statement per chunk.  The
+    # DO UPDATE ... WHERE clause skips unchanged rows, so re-syncing a page
+    # that Graph returned unmodified does no FTS work at all.
+    _REFRESH_SEARCH_DOCS_SQL = """INSERT INTO message_search_docs
+           (message_id, subject, sender, recipients, preview, body)
+           SELECT m.id,
+                  m.subject,
+                  TRIM(COALESCE(m.sender_name, '') || ' ' || COALESCE(m.sender_address, '')),
+                  (SELECT group_concat(part, ' ') FROM (
+                       SELECT TRIM(COALESCE(r.recipient_name, '') || ' ' || r.recipient_address) AS part
+                       FROM message_recipients r
+                       WHERE r.message_id = m.id
+                       ORDER BY r.role, r.recipient_address
+                  )),
+                  m.body_preview,
+                  mb.content
+           FROM messages m
+           LEFT JOIN message_bodies mb ON mb.id = m.id
+           WHERE m.id IN ({placeholders})
+           ON CONFLICT(message_id) DO UPDATE SET
+               subject = excluded.subject,
+               sender = excluded.sender,
+               recipients = excluded.recipients,
+               preview = excluded.preview,
+               body = excluded.body
+           WHERE message_search_docs.subject IS NOT excluded.subject
+              OR message_search_docs.sender IS NOT excluded.sender
+              OR message_search_docs.recipients IS NOT excluded.recipients
+              OR message_search_docs.preview IS NOT excluded.preview
+              OR message_search_docs.body IS NOT excluded.body"""
+
+    def _refresh_search_docs(self, conn, message_ids):
+        if not self._is_fts_enabled(conn):
             return
         unique_ids = self._unique_message_ids(message_ids)
-        if not unique_ids:
-            return
-
         for chunk in self._chunked(unique_ids):
             placeholders = ",".join("?" for _ in chunk)
-            active_conn.execute(f"DELETE FROM message_search_fts WHERE message_id IN ({placeholders})", tuple(chunk))
-
-        documents = self._build_searchable_texts(active_conn, unique_ids)
-        rows_to_insert = [(msg_id, documents[msg_id]) for msg_id in unique_ids if msg_id in documents]
-        if rows_to_insert:
-            active_conn.executemany(
-                "INSERT INTO message_search_fts (message_id, searchable_text) VALUES (?, ?)",
-                rows_to_insert,
+            conn.execute(self._REFRESH_SEARCH_DOCS_SQL.format(placeholders=placeholders), tuple(chunk))
+
+    def search_index_needs_rebuild(self):
+        """True when search documents are missing, e.g. after an index migration."""
+        conn = self.conn
+        return self._is_fts_enabled(conn) and self._search_index_incomplete(conn)
+
+    @staticmethod
+    def _search_index_incomplete(conn):
+        message_count = conn.execute("SELECT COUNT(*) AS count FROM messages").fetchone()["count"]
+        doc_count = conn.execute("SELECT COUNT(*) AS count FROM message_search_docs").fetchone()["count"]
+        return message_count != doc_count
+
+    def rebuild_search_index(self, chunk_size=SQL_PARAM_CHUNK_SIZE, on_progress=None, should_stop=None):
+        """Re-derive search documents from the cache in bounded write transactions.
+
+        Each chunk commits on its own, so other writers are only blocked for
+        one chunk at a time and an interrupted rebuild resumes on next open.
+        ``on_progress(done, total)`` is called after every chunk; a true
+        ``should_stop()`` ends the rebuild between chunks.  Returns the number
+        of messages visited.
+        """
+        conn = self.conn
+        if not self._is_fts_enabled(conn):
+            return 0
+        chunk_size = max(1, min(int(chunk_size or SQL_PARAM_CHUNK_SIZE), SQL_PARAM_CHUNK_SIZE))
+        total = conn.execute("SELECT COUNT(*) AS count FROM messages").fetchone()["count"]
+        with self._write_transaction(conn=conn):
+            conn.execute(
+                "DELETE FROM message_search_docs WHERE message_id NOT IN (SELECT id FROM messages)"
             )
 
-    def _rebuild_search_index(self, conn=None):
-        active_conn = conn or self.conn
-        if not self._is_fts_enabled(active_conn):
-            return
-        active_conn.execute("DELETE FROM message_search_fts")
-        rows = active_conn.execute("SELECT id FROM messages").fetchall()
-        self._upsert_search_index_for_messages([row["id"] for row in rows], conn=active_conn)
+        done = 0
+        last_id = ""
+        while should_stop is None or not should_stop():
+            rows = conn.execute(
+                "SELECT id FROM messages WHERE id > ? ORDER BY id LIMIT ?",
+                (last_id, chunk_size),
+            ).fetchall()
+            if not rows:
+                break
+            chunk_ids = [row["id"] for row in rows]
+            with self._write_transaction(conn=conn):
+                self._refresh_search_docs(conn, chunk_ids)
+            last_id = chunk_ids[-1]
+            done += len(chunk_ids)
+            if on_progress is not None:
+                on_progress(done, total)
+        return done
 
     def get_messages(self, folder_id, limit=100, offset=0):
         """Get cached messages for a folder."""
-        cur = self.conn.execute(
+        cur = self.read_conn.execute(
             """SELECT id, folder_id, subject, sender_name, sender_address,
                       received_datetime, is_read, has_attachments, body_preview,
                       importance, company_label
@@ -601,6 +1026,51 @@ class EmailCache:
         rows = cur.fetchall()
         return self._rows_to_messages(rows)
 
+    def get_messages_page(self, folder_id, limit=EMAIL_LIST_PAGE_SIZE, cursor=None):
+        """Get one page of cached messages, newest first, using a keyset cursor.
+
+        Returns ``(messages, next_cursor)``.  Pass ``next_cursor`` back in to
+        continue; it is ``None`` once the folder is exhausted.  Each page is an
+        index seek on ``(received_datetime, id)``, so its cost does not grow
+        with how far the user has scrolled.
+        """
+        limit = max(1, int(limit))
+        if cursor is None:
+            rows = self._folder_page_rows(folder_id, "", (), limit + 1)
+        else:
+            received, last_id = cursor
+            if received is None:
+                rows = self._folder_page_rows(
+                    folder_id, "AND received_datetime IS NULL AND id < ?", (last_id,), limit + 1
+                )
+            else:
+                rows = self._folder_page_rows(
+                    folder_id, "AND (received_datetime, id) < (?, ?)", (received, last_id), limit + 1
+                )
+                # Row-value comparison skips NULL dates, which sort after every dated row.
+                if len(rows) <= limit:
+                    rows += self._folder_page_rows(
+                        folder_id, "AND received_datetime IS NULL", (), limit + 1 - len(rows)
+                    )
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = (rows[-1]["received_datetime"], rows[-1]["id"])
+        return self._rows_to_messages(rows), next_cursor
+
+    def _folder_page_rows(self, folder_id, seek_sql, seek_params, limit):
+        cur = self.read_conn.execute(
+            f"""SELECT id, folder_id, subject, sender_name, sender_address,
+                      received_datetime, is_read, has_attachments, body_preview,
+                      importance, company_label
+               FROM messages
+               WHERE folder_id = ? {seek_sql}
+               ORDER BY received_datetime DESC, id DESC
+               LIMIT ?""",
+            (folder_id, *seek_params, limit),
+        )
+        return cur.fetchall()
+
     def _row_to_message(self, row):
         """Convert a database row to a message dict matching Graph API format."""
         return {
@@ -624,6 +1094,35 @@ class EmailCache:
             "ccRecipients": [],
         }
 
+    @staticmethod
+    def _marked(text):
+        return text if text and SEARCH_HIGHLIGHT_START in text else None
+
+    @classmethod
+    def _clean_body_snippet(cls, text):
+        text = _SNIPPET_MARKUP_RE.sub(" ", text or "")
+        return cls._marked(" ".join(html.unescape(text).split()))
+
+    def _with_search_highlights(self, rows, highlights):
+        """Convert FTS rows to messages, keeping highlights that contain a match.
+
+        ``_searchSubject`` is the subject and ``_searchSnippet`` the best
+        matching passage (preview before body), both with matched terms
+        wrapped in ``SEARCH_HIGHLIGHT_START``/``SEARCH_HIGHLIGHT_END``.
+        """
+        messages = self._rows_to_messages(rows)
+        for message, row in zip(messages, rows):
+            marks = highlights.get(row["search_doc_id"])
+            if marks is None:
+                continue
+            subject = self._marked(marks["search_subject"])
+            snippet = self._marked(marks["search_preview"]) or self._clean_body_snippet(marks["search_body"])
+            if subject:
+                message["_searchSubject"] = subject
+            if snippet:
+                message["_searchSnippet"] = snippet
+        return messages
+
     def _rows_to_messages(self, rows):
         """Convert DB rows to Graph-API-shaped dicts, hydrating recipients via extra queries."""
         messages = [self._row_to_message(row) for row in rows]
@@ -642,7 +1141,7 @@ class EmailCache:
         recipient_map = {}
         for chunk in self._chunked(unique_ids):
             placeholders = ",".join("?" for _ in chunk)
-            cur = self.conn.execute(
+            cur = self.read_conn.execute(
                 f"""SELECT message_id, role, recipient_name, recipient_address
                    FROM message_recipients
                    WHERE message_id IN ({placeholders})
@@ -686,56 +1185,203 @@ class EmailCache:
                 recipients.append((role, (email.get("name") or "").strip(), address))
         return recipients
 
+    # Upsert keeps company_label (set by label_domain) and, unlike INSERT OR
+    # REPLACE, does not delete the row first, so cascaded bodies/attachments survive.
+    _UPSERT_MESSAGE_SQL = """INSERT INTO messages
+           (id, folder_id, subject, sender_name, sender_address,
+            received_datetime, is_read, has_attachments, body_preview,
+            importance, cached_at)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+           ON CONFLICT(id) DO UPDATE SET
+               folder_id = excluded.folder_id,
+               subject = excluded.subject,
+               sender_name = excluded.sender_name,
+               sender_address = excluded.sender_address,
+               received_datetime = excluded.received_datetime,
+               is_read = excluded.is_read,
+               has_attachments = excluded.has_attachments,
+               body_preview = excluded.body_preview,
+               importance = excluded.importance,
+               cached_at = excluded.cached_at"""
+
+    @staticmethod
+    def _participant_row(msg_id, role, address):
+        address = (address or "").strip().lower()
+        if not address:
+            return None
+        _local, at, domain = address.partition("@")
+        return (msg_id, role, address, domain if at else "")
+
+    @classmethod
+    def _stage_message_rows(cls, messages, folder_id, now):
+        """Flatten Graph message dicts into parameter rows for bulk statements.
+
+        Returns ``(message_ids, message_rows, recipient_rows, recipient_ids,
+        participant_rows)``.  ``recipient_ids`` lists the messages whose payload
+        carried recipient fields; lean list projections omit them, and those
+        messages keep the recipients already cached.  ``participant_rows`` hold
+        the sender of every message plus the recipients of ``recipient_ids``.
+        A message id that appears more than once keeps its last occurrence,
+        matching the old row-at-a-time replace semantics.
+        """
+        staged = {}
+        for msg in messages:
+            msg_id = msg["id"]
+            sender = msg.get("from", {}).get("emailAddress", {})
+            message_row = (
+                msg_id,
+                folder_id,
+                msg.get("subject"),
+                sender.get("name"),
+                sender.get("address"),
+                msg.get("receivedDateTime"),
+                1 if msg.get("isRead") else 0,
+                1 if msg.get("hasAttachments") else 0,
+                msg.get("bodyPreview"),
+                msg.get("importance"),
+                now,
+            )
+            participant_rows = [cls._participant_row(msg_id, "from", sender.get("address"))]
+            recipient_rows = None
+            if "toRecipients" in msg or "ccRecipients" in msg:
+                recipient_rows = [
+                    (msg_id, role, recipient_name, recipient_address, now)
+                    for role, recipient_name, recipient_address in cls._extract_recipients(msg)
+                ]
+                participant_rows.extend(
+                    cls._participant_row(msg_id, row[1], row[3]) for row in recipient_rows
+                )
+            staged.pop(msg_id, None)
+            staged[msg_id] = (message_row, recipient_rows, [row for row in participant_rows if row])
+
+        message_ids = list(staged.keys())
+        message_rows = [message_row for message_row, _, _ in staged.values()]
+        recipient_rows = [row for _, rows, _ in staged.values() for row in rows or []]
+        recipient_ids = [msg_id for msg_id, (_, rows, _) in staged.items() if rows is not None]
+        participant_rows = [row for _, _, rows in staged.values() for row in rows]
+        return message_ids, message_rows, recipient_rows, recipient_ids, participant_rows
+
+    _COMPANY_CONTRIBUTION_SQL = """SELECT DISTINCT p.message_id, p.domain, m.folder_id,
+                  CASE WHEN m.is_read THEN 0 ELSE 1 END AS unread, m.received_datetime
+           FROM message_participants p
+           JOIN messages m ON m.id = p.message_id
+           WHERE p.message_id IN ({placeholders}) AND p.domain != ''"""
+
+    @staticmethod
+    def _rebuild_company_counts(conn):
+        conn.execute("DELETE FROM company_counts")
+        conn.execute(
+            """INSERT INTO company_counts (domain, folder_id, total, unread, last_received)
+               SELECT p.domain, m.folder_id, COUNT(*),
+                      SUM(CASE WHEN m.is_read THEN 0 ELSE 1 END), MAX(m.received_datetime)
+               FROM (SELECT DISTINCT message_id, domain FROM message_participants WHERE domain != '') p
+               JOIN messages m ON m.id = p.message_id
+               GROUP BY p.domain, m.folder_id"""
+        )
+
+    def _company_contributions(self, conn, message_ids):
+        """Return what ``message_ids`` currently add to ``company_counts``."""
+        rows = set()
+        for chunk in self._chunked(list(message_ids)):
+            placeholders = ",".join("?" for _ in chunk)
+            cur = conn.execute(self._COMPANY_CONTRIBUTION_SQL.format(placeholders=placeholders), tuple(chunk))
+            rows.update(tuple(row) for row in cur.fetchall())
+        return rows
+
+    @staticmethod
+    def _apply_company_count_changes(conn, before, after):
+        """Fold the difference between two contribution snapshots into ``company_counts``."""
+        deltas = {}
+        for sign, rows in ((-1, before - after), (1, after - before)):
+            for _msg_id, domain, folder_id, unread, received in rows:
+                entry = deltas.setdefault((domain, folder_id), {"total": 0, "unread": 0, "added": "", "removed": ""})
+                entry["total"] += sign
+                entry["unread"] += sign * unread
+                side = "added" if sign > 0 else "removed"
+                entry[side] = max(entry[side], received or "")
+        for (domain, folder_id), entry in deltas.items():
+            conn.execute(
+                """INSERT INTO company_counts (domain, folder_id, total, unread, last_received)
+                   VALUES (?, ?, ?, ?, NULLIF(?, ''))
+                   ON CONFLICT(domain, folder_id) DO UPDATE SET
+                       total = company_counts.total + excluded.total,
+                       unread = company_counts.unread + excluded.unread,
+                       last_received = NULLIF(
+                           MAX(COALESCE(company_counts.last_received, ''), COALESCE(excluded.last_received, '')), ''
+                       )""",
+                (domain, folder_id, entry["total"], entry["unread"], entry["added"]),
+            )
+            if entry["removed"] > entry["added"]:
+                # The newest message for this company may be the one removed.
+                conn.execute(
+                    """UPDATE company_counts SET last_received = (
+                           SELECT MAX(m.received_datetime) FROM messages m
+                           WHERE m.folder_id = ?
+                             AND m.id IN (SELECT message_id FROM message_participants WHERE domain = ?)
+                       )
+                       WHERE domain = ? AND folder_id = ? AND COALESCE(last_received, '') <= ?""",
+                    (folder_id, domain, domain, folder_id, entry["removed"]),
+                )
+        if deltas:
+            conn.execute("DELETE FROM company_counts WHERE total <= 0")
+
     def save_messages(self, messages, folder_id):
         """Save messages to cache (batch insert/update)."""
         now = int(time.time())
-        updated_ids = []
+        message_ids, message_rows, recipient_rows, recipient_ids, participant_rows = self._stage_message_rows(
+            messages or [], folder_id, now
+        )
+        if not message_ids:
+            return
         with self._write_transaction() as conn:
-            for msg in messages:
-                msg_id = msg["id"]
-                updated_ids.append(msg_id)
-                sender = msg.get("from", {}).get("emailAddress", {})
+            counts_before = self._company_contributions(conn, message_ids)
+            conn.executemany(self._UPSERT_MESSAGE_SQL, message_rows)
+            for chunk in self._chunked(message_ids):
+                placeholders = ",".join("?" for _ in chunk)
                 conn.execute(
-                    """INSERT OR REPLACE INTO messages
-                       (id, folder_id, subject, sender_name, sender_address,
-                        received_datetime, is_read, has_attachments, body_preview,
-                        importance, company_label, cached_at)
-                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
-                               COALESCE((SELECT company_label FROM messages WHERE id = ?), NULL),
-                               ?)""",
-                    (
-                        msg_id,
-                        folder_id,
-                        msg.get("subject"),
-                        sender.get("name"),
-                        sender.get("address"),
-                        msg.get("receivedDateTime"),
-                        1 if msg.get("isRead") else 0,
-                        1 if msg.get("hasAttachments") else 0,
-                        msg.get("bodyPreview"),
-                        msg.get("importance"),
-                        msg_id,
-                        now,
-                    ),
+                    f"DELETE FROM message_participants WHERE role = 'from' AND message_id IN ({placeholders})",
+                    tuple(chunk),
                 )
-                conn.execute("DELETE FROM message_recipients WHERE message_id = ?", (msg_id,))
-                for role, recipient_name, recipient_address in self._extract_recipients(msg):
-                    conn.execute(
-                        """INSERT OR REPLACE INTO message_recipients
-                           (message_id, role, recipient_name, recipient_address, cached_at)
-                           VALUES (?, ?, ?, ?, ?)""",
-                        (msg_id, role, recipient_name, recipient_address, now),
-                    )
-            self._upsert_search_index_for_messages(updated_ids, conn=conn)
+            for chunk in self._chunked(recipient_ids):
+                placeholders = ",".join("?" for _ in chunk)
+                conn.execute(f"DELETE FROM message_recipients WHERE message_id IN ({placeholders})", tuple(chunk))
+                conn.execute(
+                    f"DELETE FROM message_participants WHERE role != 'from' AND message_id IN ({placeholders})",
+                    tuple(chunk),
+                )
+            if participant_rows:
+                conn.executemany(
+                    """INSERT OR IGNORE INTO message_participants (message_id, role, address, domain)
+                       VALUES (?, ?, ?, ?)""",
+                    participant_rows,
+                )
+            self._apply_company_count_changes(conn, counts_before, self._company_contributions(conn, message_ids))
+            if recipient_rows:
+                conn.executemany(
+                    """INSERT OR REPLACE INTO message_recipients
+                       (message_id, role, recipient_name, recipient_address, cached_at)
+                       VALUES (?, ?, ?, ?, ?)""",
+                    recipient_rows,
+                )
+            self._refresh_search_docs(conn, message_ids)
 
     def get_message_body(self, msg_id):
         """Get cached full message body."""
-        cur = self.conn.execute("SELECT content_type, content FROM message_bodies WHERE id = ?", (msg_id,))
+        cur = self.read_conn.execute("SELECT content_type, content FROM message_bodies WHERE id = ?", (msg_id,))
         row = cur.fetchone()
         if row:
             return {"contentType": row["content_type"], "content": row["content"]}
         return None
 
+    def get_cached_body_ids(self, message_ids):
+        """Return the subset of ``message_ids`` that already have a cached body."""
+        cached = set()
+        for chunk in self._chunked(self._unique_message_ids(message_ids)):
+            placeholders = ",".join("?" for _ in chunk)
+            cur = self.read_conn.execute(f"SELECT id FROM message_bodies WHERE id IN ({placeholders})", tuple(chunk))
+            cached.update(row["id"] for row in cur.fetchall())
+        return cached
+
     def save_message_body(self, msg_id, content_type, content):
         """Save full message body to cache."""
         with self._write_transaction() as conn:
@@ -744,12 +1390,11 @@ class EmailCache:
                    VALUES (?, ?, ?, ?)""",
                 (msg_id, content_type, content, int(time.time())),
             )
-            self._upsert_search_index_for_messages([msg_id], conn=conn)
 
     def get_attachments(self, msg_id):
         """Get cached attachment metadata for a message."""
-        cur = self.conn.execute(
-            "SELECT id, name, size, content_type FROM attachments WHERE message_id = ?",
+        cur = self.read_conn.execute(
+            "SELECT id, name, size, content_type, is_inline, content_id FROM attachments WHERE message_id = ?",
             (msg_id,),
         )
         return [
@@ -758,6 +1403,8 @@ class EmailCache:
                 "name": row["name"],
                 "size": row["size"],
                 "contentType": row["content_type"],
+                "isInline": bool(row["is_inline"]),
+                "contentId": row["content_id"],
                 "@odata.type": "#microsoft.graph.fileAttachment",
             }
             for row in cur.fetchall()
@@ -769,24 +1416,47 @@ class EmailCache:
         with self._write_transaction() as conn:
             for att in attachments:
                 if att.get("@odata.type") == "#microsoft.graph.fileAttachment":
+                    # Upsert rather than REPLACE so a known blob_hash survives a metadata refresh.
                     conn.execute(
-                        """INSERT OR REPLACE INTO attachments
-                           (id, message_id, name, size, content_type, cached_at)
-                           VALUES (?, ?, ?, ?, ?, ?)""",
+                        """INSERT INTO attachments
+                           (id, message_id, name, size, content_type, is_inline, content_id, cached_at)
+                           VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                           ON CONFLICT(id) DO UPDATE SET
+                               message_id = excluded.message_id,
+                               name = excluded.name,
+                               size = excluded.size,
+                               content_type = excluded.content_type,
+                               is_inline = excluded.is_inline,
+                               content_id = excluded.content_id,
+                               cached_at = excluded.cached_at""",
                         (
                             att["id"],
                             msg_id,
                             att.get("name"),
                             att.get("size"),
                             att.get("contentType"),
+                            1 if att.get("isInline") else 0,
+                            att.get("contentId"),
                             now,
                         ),
                     )
 
+    def get_attachment_blob_hash(self, attachment_id):
+        """Return the blob-store hash recorded for an attachment, or ``None``."""
+        row = self.read_conn.execute("SELECT blob_hash FROM attachments WHERE id = ?", (attachment_id,)).fetchone()
+        return row["blob_hash"] if row else None
+
+    def set_attachment_blob_hash(self, attachment_id, blob_hash):
+        """Record where an attachment's downloaded bytes live in the blob store."""
+        with self._write_transaction() as conn:
+            conn.execute("UPDATE attachments SET blob_hash = ? WHERE id = ?", (blob_hash, attachment_id))
+
     def update_read_status(self, msg_id, is_read):
         """Update read status in cache."""
         with self._write_transaction() as conn:
+            counts_before = self._company_contributions(conn, [msg_id])
             conn.execute("UPDATE messages SET is_read = ? WHERE id = ?", (1 if is_read else 0, msg_id))
+            self._apply_company_count_changes(conn, counts_before, self._company_contributions(conn, [msg_id]))
 
     def delete_messages(self, message_ids):
         """Remove deleted messages from cache."""
@@ -796,6 +1466,7 @@ class EmailCache:
         if not unique_ids:
             return
         with self._write_transaction() as conn:
+            counts_before = self._company_contributions(conn, unique_ids)
             for chunk in self._chunked(unique_ids):
                 placeholders = ",".join("?" for _ in chunk)
                 ids_tuple = tuple(chunk)
@@ -803,8 +1474,8 @@ class EmailCache:
                 conn.execute(f"DELETE FROM message_bodies WHERE id IN ({placeholders})", ids_tuple)
                 conn.execute(f"DELETE FROM attachments WHERE message_id IN ({placeholders})", ids_tuple)
                 conn.execute(f"DELETE FROM message_recipients WHERE message_id IN ({placeholders})", ids_tuple)
-                if self._is_fts_enabled(conn):
-                    conn.execute(f"DELETE FROM message_search_fts WHERE message_id IN ({placeholders})", ids_tuple)
+                conn.execute(f"DELETE FROM message_participants WHERE message_id IN ({placeholders})", ids_tuple)
+            self._apply_company_count_changes(conn, counts_before, set())
 
     def prune_old(self, days=30):
         """Delete cache entries older than N days."""
@@ -814,8 +1485,8 @@ class EmailCache:
             conn.execute("DELETE FROM message_bodies WHERE cached_at < ?", (cutoff,))
             conn.execute("DELETE FROM attachments WHERE cached_at < ?", (cutoff,))
             conn.execute("DELETE FROM message_recipients WHERE message_id NOT IN (SELECT id FROM messages)")
-            if self._is_fts_enabled(conn):
-                conn.execute("DELETE FROM message_search_fts WHERE message_id NOT IN (SELECT id FROM messages)")
+            conn.execute("DELETE FROM message_participants WHERE message_id NOT IN (SELECT id FROM messages)")
+            self._rebuild_company_counts(conn)
 
     def clear(self):
         """Reset entire cache."""
@@ -824,8 +1495,8 @@ class EmailCache:
             conn.execute("DELETE FROM message_bodies")
             conn.execute("DELETE FROM attachments")
             conn.execute("DELETE FROM message_recipients")
-            if self._is_fts_enabled(conn):
-                conn.execute("DELETE FROM message_search_fts")
+            conn.execute("DELETE FROM message_participants")
+            conn.execute("DELETE FROM company_counts")
             conn.execute("DELETE FROM sync_state")
 
     def search_by_domain(self, domain):
@@ -833,23 +1504,21 @@ class EmailCache:
         normalized = (domain or "").strip().lower()
         if not normalized:
             return []
-        cur = self.conn.execute(
-            """SELECT DISTINCT
+        cur = self.read_conn.execute(
+            """SELECT
                       m.id, m.folder_id, m.subject, m.sender_name, m.sender_address,
                       m.received_datetime, m.is_read, m.has_attachments, m.body_preview,
                       m.importance, m.company_label
                FROM messages m
-               LEFT JOIN message_recipients r ON r.message_id = m.id
-               WHERE LOWER(COALESCE(m.sender_address, '')) LIKE ?
-                  OR LOWER(COALESCE(r.recipient_address, '')) LIKE ?
+               WHERE m.id IN (SELECT p.message_id FROM message_participants p WHERE p.domain = ?)
                ORDER BY m.received_datetime DESC""",
-            (f"%@{normalized}", f"%@{normalized}"),
+            (normalized,),
         )
         return self._rows_to_messages(cur.fetchall())
 
     def search_by_company_label(self, label):
         """Find all emails with a specific company label."""
-        cur = self.conn.execute(
+        cur = self.read_conn.execute(
             """SELECT id, folder_id, subject, sender_name, sender_address,
                       received_datetime, is_read, has_attachments, body_preview,
                       importance, company_label
@@ -885,45 +1554,53 @@ class EmailCache:
             )
         return self._search_company_messages_like(normalized, limit=effective_limit)
 
-    def search_messages(self, search_text, folder_id=None, limit=None):
-        """Search all cached messages by text across subject, body, sender, recipients."""
+    def search_messages(self, search_text, folder_id=None, limit=None, offset=0):
+        """Search all cached messages by text across subject, body, sender, recipients.
+
+        With the FTS index, results are ranked by relevance and the last word
+        matches as a prefix; see ``_with_search_highlights`` for the extra keys.
+        """
         normalized = (search_text or "").strip().lower()
         if not normalized:
             return []
         effective_limit = self._effective_limit(limit)
+        offset = max(0, int(offset or 0))
         if self._is_fts_enabled():
             try:
-                return self._search_messages_fts(normalized, folder_id, effective_limit)
+                return self._search_messages_fts(normalized, folder_id, effective_limit, offset)
             except sqlite3.OperationalError as exc:
                 logger.warning("FTS search failed, falling back to LIKE: %s", exc)
-        return self._search_messages_like(normalized, folder_id, effective_limit)
-
-    def _search_messages_fts(self, search_text, folder_id=None, limit=None):
-        fts_query = self._fts_query_from_text(search_text)
+        return self._search_messages_like(normalized, folder_id, effective_limit, offset)
+
+    def search_messages_page(self, search_text, folder_id=None, limit=EMAIL_LIST_PAGE_SIZE, cursor=None):
+        """Get one page of ``search_messages`` results.
+
+        Returns ``(messages, next_cursor)`` like ``get_messages_page``; the
+        cursor is the offset of the next page and is ``None`` once the results,
+        capped at ``EMAIL_LIST_FETCH_TOP``, are exhausted.  Only the rows of
+        the page are hydrated, so each page costs the same whatever the cap.
+        """
+        limit = max(1, int(limit))
+        offset = max(0, int(cursor or 0))
+        remaining = EMAIL_LIST_FETCH_TOP - offset
+        if remaining <= 0:
+            return [], None
+        page_limit = min(limit, remaining)
+        messages = self.search_messages(search_text, folder_id=folder_id, limit=page_limit + 1, offset=offset)
+        next_cursor = None
+        if len(messages) > page_limit:
+            messages = messages[:page_limit]
+            if offset + page_limit < EMAIL_LIST_FETCH_TOP:
+                next_cursor = offset + page_limit
+        return messages, next_cursor
+
+    def _search_messages_fts(self, search_text, folder_id=None, limit=None, offset=0):
+        fts_query = self._fts_query_from_text(search_text, prefix_last=True)
         if not fts_query:
-            return self._search_messages_like(search_text, folder_id, limit)
-        params = []
-        folder_clause = ""
-        if folder_id:
-            folder_clause = " AND m.folder_id = ?"
-            params.append(folder_id)
-        params.append(fts_query)
-        limit_clause = ""
-        if limit is not None:
-            limit_clause = "\n               LIMIT ?"
-            params.append(int(limit))
-        cur = self.conn.execute(
-            f"""SELECT {self._BASE_MESSAGE_SELECT}
-               FROM messages m
-               JOIN message_search_fts f ON f.message_id = m.id
-               WHERE 1=1{folder_clause}
-                 AND message_search_fts MATCH ?
-               ORDER BY m.received_datetime DESC{limit_clause}""",
-            tuple(params),
-        )
-        return self._rows_to_messages(cur.fetchall())
+            return self._search_messages_like(search_text, folder_id, limit, offset)
+        return self._search_fts(fts_query, limit=limit, offset=offset, folder_id=folder_id)
 
-    def _search_messages_like(self, search_text, folder_id=None, limit=None):
+    def _search_messages_like(self, search_text, folder_id=None, limit=None, offset=0):
         like_value = f"%{search_text}%"
         params = [like_value, like_value, like_value, like_value, like_value, like_value, like_value]
         folder_clause = ""
@@ -932,9 +1609,9 @@ class EmailCache:
             params.append(folder_id)
         limit_clause = ""
         if limit is not None:
-            limit_clause = "\n               LIMIT ?"
-            params.append(int(limit))
-        cur = self.conn.execute(
+            limit_clause = "\n               LIMIT ? OFFSET ?"
+            params.extend([int(limit), int(offset or 0)])
+        cur = self.read_conn.execute(
             f"""SELECT {self._BASE_MESSAGE_SELECT}
                FROM messages m
                WHERE (
@@ -954,7 +1631,7 @@ class EmailCache:
                        WHERE mb.id = m.id AND LOWER(COALESCE(mb.content, '')) LIKE ?
                    )
                ){folder_clause}
-               ORDER BY m.received_datetime DESC{limit_clause}""",
+               ORDER BY m.received_datetime DESC, m.id DESC{limit_clause}""",
             tuple(params),
         )
         return self._rows_to_messages(cur.fetchall())
@@ -963,14 +1640,17 @@ class EmailCache:
         """Bulk-label all emails from a domain."""
         with self._write_transaction() as conn:
             cur = conn.execute(
-                "UPDATE messages SET company_label = ? WHERE sender_address LIKE ?",
-                (label, f"%@{domain}"),
+                """UPDATE messages SET company_label = ?
+                   WHERE id IN (
+                       SELECT message_id FROM message_participants WHERE role = 'from' AND domain = ?
+                   )""",
+                (label, (domain or "").strip().lower()),
             )
         return cur.rowcount
 
     def get_all_domains(self):
         """Get all unique sender domains with counts."""
-        cur = self.conn.execute(
+        cur = self.read_conn.execute(
             """SELECT
                  LOWER(SUBSTR(sender_address, INSTR(sender_address, '@') + 1)) as domain,
                  COUNT(*) as count,
@@ -983,9 +1663,38 @@ class EmailCache:
         )
         return [dict(row) for row in cur.fetchall()]
 
+    def get_company_counts(self, domains, folder_ids=None):
+        """Return ``{domain: {"total", "unread", "last_received"}}`` for company domains.
+
+        Counts are summed over ``folder_ids`` (default: every folder).  Domains
+        with no cached mail are omitted.
+        """
+        wanted = sorted({(domain or "").strip().lower() for domain in domains or [] if (domain or "").strip()})
+        folders = [folder_id for folder_id in folder_ids or [] if folder_id]
+        counts = {}
+        for chunk in self._chunked(wanted, max(1, SQL_PARAM_CHUNK_SIZE - len(folders))):
+            domain_placeholders = ",".join("?" for _ in chunk)
+            folder_clause = ""
+            if folders:
+                folder_clause = f" AND folder_id IN ({','.join('?' for _ in folders)})"
+            cur = self.read_conn.execute(
+                f"""SELECT domain, SUM(total) AS total, SUM(unread) AS unread, MAX(last_received) AS last_received
+                    FROM company_counts
+                    WHERE domain IN ({domain_placeholders}){folder_clause}
+                    GROUP BY domain""",
+                tuple(chunk) + tuple(folders),
+            )
+            for row in cur.fetchall():
+                counts[row["domain"]] = {
+                    "total": int(row["total"] or 0),
+                    "unread": int(row["unread"] or 0),
+                    "last_received": row["last_received"],
+                }
+        return counts
+
     def get_unlabeled_domains(self):
         """Get domains that haven't been labeled yet."""
-        cur = self.conn.execute(
+        cur = self.read_conn.execute(
             """SELECT
                  LOWER(SUBSTR(sender_address, INSTR(sender_address, '@') + 1)) as domain,
                  COUNT(*) as count
@@ -1000,9 +1709,9 @@ class EmailCache:
     def get_message_count(self, folder_id=None):
         """Get total cached message count."""
         if folder_id:
-            cur = self.conn.execute("SELECT COUNT(*) as count FROM messages WHERE folder_id = ?", (folder_id,))
+            cur = self.read_conn.execute("SELECT COUNT(*) as count FROM messages WHERE folder_id = ?", (folder_id,))
         else:
-            cur = self.conn.execute("SELECT COUNT(*) as count FROM messages")
+            cur = self.read_conn.execute("SELECT COUNT(*) as count FROM messages")
         return cur.fetchone()["count"]
 
     def clear_delta_links(self):
@@ -1017,7 +1726,7 @@ class EmailCache:
 
     def get_delta_link(self, folder_id):
         """Get stored delta link for a folder."""
-        cur = self.conn.execute("SELECT delta_link FROM sync_state WHERE folder_id = ?", (folder_id,))
+        cur = self.read_conn.execute("SELECT delta_link FROM sync_state WHERE folder_id = ?", (folder_id,))
         row = cur.fetchone()
         return row["delta_link"] if row else None
 
@@ -1030,6 +1739,81 @@ class EmailCache:
                 (folder_id, delta_link, int(time.time())),
             )
 
+    def get_last_sync_times(self, folder_ids):
+        """Return ``{folder_id: last_sync}`` for folders whose last delta round completed.
+
+        Folders that were never synced, or that are part-way through a round,
+        are omitted.
+        """
+        wanted = [folder_id for folder_id in dict.fromkeys(folder_ids or []) if folder_id]
+        synced = {}
+        for chunk in self._chunked(wanted):
+            placeholders = ",".join("?" for _ in chunk)
+            cur = self.read_conn.execute(
+                f"""SELECT folder_id, last_sync FROM sync_state
+                    WHERE folder_id IN ({placeholders})
+                      AND delta_link IS NOT NULL AND next_link IS NULL""",
+                tuple(chunk),
+            )
+            synced.update((row["folder_id"], int(row["last_sync"] or 0)) for row in cur.fetchall())
+        return synced
+
+    def get_delta_checkpoint(self, folder_id):
+        """Get the nextLink of a delta round that did not finish, if any."""
+        cur = self.read_conn.execute("SELECT next_link FROM sync_state WHERE folder_id = ?", (folder_id,))
+        row = cur.fetchone()
+        return row["next_link"] if row else None
+
+    def get_sync_progress(self, folder_id):
+        """Describe the unfinished delta round for a folder, or ``None``.
+
+        Returns ``{"next_link", "pages_synced", "started_at"}``.
+        """
+        cur = self.read_conn.execute(
+            "SELECT next_link, pages_synced, started_at FROM sync_state WHERE folder_id = ?",
+            (folder_id,),
+        )
+        row = cur.fetchone()
+        if not row or not row["next_link"]:
+            return None
+        return {
+            "next_link": row["next_link"],
+            "pages_synced": int(row["pages_synced"] or 0),
+            "started_at": row["started_at"],
+        }
+
+    def apply_delta_page(self, folder_id, messages, deleted_ids, next_link=None, delta_link=None):
+        """Apply one delta page and advance the folder's checkpoint atomically.
+
+        A page carrying ``delta_link`` ends the round: the link is stored and
+        the checkpoint cleared.  Otherwise ``next_link`` is kept so the round
+        can resume after this page.  Messages are upserted, so replaying a
+        page after a resume leaves the cache unchanged.
+        """
+        now = int(time.time())
+        with self._write_transaction() as conn:
+            if deleted_ids:
+                self.delete_messages(deleted_ids)
+            if messages:
+                self.save_messages(messages, folder_id)
+            if delta_link:
+                conn.execute(
+                    """INSERT OR REPLACE INTO sync_state (folder_id, delta_link, last_sync)
+                       VALUES (?, ?, ?)""",
+                    (folder_id, delta_link, now),
+                )
+            elif next_link:
+                conn.execute(
+                    """INSERT INTO sync_state (folder_id, next_link, pages_synced, started_at, last_sync)
+                       VALUES (?, ?, 1, ?, ?)
+                       ON CONFLICT(folder_id) DO UPDATE SET
+                           next_link = excluded.next_link,
+                           pages_synced = sync_state.pages_synced + 1,
+                           started_at = COALESCE(sync_state.started_at, excluded.started_at),
+                           last_sync = excluded.last_sync""",
+                    (folder_id, next_link, now, now),
+                )
+
     def close(self):
         current_conn = getattr(self._local, "conn", None)
         with self._connection_registry_lock:
@@ -1042,3 +1826,4 @@ class EmailCache:
                 pass
         if current_conn is not None:
             self._local.conn = None
+        self._local.read_conn = None
@@ -0,0 +1,149 @@
+"""Write-behind queue that moves SQLite cache writes off worker threads."""
+
+import logging
+import queue
+import threading
+
+from genimail.constants import CACHE_WRITE_BATCH_MAX, CACHE_WRITE_QUEUE_MAX
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class CacheWriteBehind:
+    """Applies ``EmailCache`` writes on one dedicated thread.
+
+    ``save_messages``, ``save_message_body`` and ``save_attachments`` mirror
+    the cache methods but only enqueue the write, so a worker can hand its
+    network result to the UI without waiting on SQLite.  The writer drains up
+    to ``max_batch`` queued writes into a single transaction; a body or
+    attachment list queued twice for the same message in one batch is written
+    once.  The queue is bounded, so a producer blocks when the writer falls
+    ``max_pending`` writes behind.
+
+    ``flush`` waits until everything queued so far is committed; call it
+    before reading back what was just written.  After ``close`` writes run
+    synchronously on the caller's thread.
+    """
+
+    def __init__(self, cache_store, max_pending=CACHE_WRITE_QUEUE_MAX, max_batch=CACHE_WRITE_BATCH_MAX):
+        self.cache = cache_store
+        self.max_batch = max(1, int(max_batch or 1))
+        self._queue = queue.Queue(maxsize=max(1, int(max_pending or 1)))
+        self._lock = threading.Lock()
+        self._closed = False
+        self.batches = 0
+        self.writes = 0
+        self.coalesced = 0
+        self.failures = 0
+        self._thread = threading.Thread(target=self._run, name="genimail-cache-writer", daemon=True)
+        self._thread.start()
+
+    def save_messages(self, messages, folder_id):
+        self._submit("save_messages", (list(messages or []), folder_id), None)
+
+    def save_message_body(self, message_id, content_type, content):
+        self._submit("save_message_body", (message_id, content_type, content), ("body", message_id))
+
+    def save_attachments(self, message_id, attachments):
+        self._submit("save_attachments", (message_id, list(attachments or [])), ("attachments", message_id))
+
+    def _submit(self, method_name, args, coalesce_key):
+        with self._lock:
+            closed = self._closed
+        if closed:
+            getattr(self.cache, method_name)(*args)
+            return
+        self._queue.put((method_name, args, coalesce_key))
+
+    def flush(self, timeout=None):
+        """Block until every write queued before this call is committed."""
+        with self._lock:
+            if self._closed:
+                return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout=5.0):
+        """Flush pending writes and stop the writer thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        # Writes that raced with close land after the stop marker; apply them here.
+        leftovers = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is not _STOP:
+                leftovers.append(item)
+        self._apply(leftovers)
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            writes = []
+            markers = []
+            stop = False
+            for item in batch:
+                if item is _STOP:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    markers.append(item)
+                else:
+                    writes.append(item)
+            self._apply(writes)
+            for marker in markers:
+                marker.set()
+            if stop:
+                return
+
+    def _coalesce(self, writes):
+        latest = {}
+        for index, (_, _, key) in enumerate(writes):
+            if key is not None:
+                latest[key] = index
+        kept = [write for index, write in enumerate(writes) if write[2] is None or latest[write[2]] == index]
+        self.coalesced += len(writes) - len(kept)
+        return kept
+
+    def _apply(self, writes):
+        if not writes:
+            return
+        writes = self._coalesce(writes)
+        try:
+            with self.cache._write_transaction():
+                for method_name, args, _ in writes:
+                    getattr(self.cache, method_name)(*args)
+        except Exception:
+            # One bad write must not sink the rest of the batch.
+            for method_name, args, _ in writes:
+                try:
+                    getattr(self.cache, method_name)(*args)
+                except Exception as exc:
+                    self.failures += 1
+                    logger.warning("cache write %s failed: %s", method_name, exc)
+        self.batches += 1
+        self.writes += len(writes)
+
+    def stats(self):
+        return {
+            "pending": self._queue.qsize(),
+            "batches": self.batches,
+            "writes": self.writes,
+            "coalesced": self.coalesced,
+            "failures": self.failures,
+        }
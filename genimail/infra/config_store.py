@@ -17,6 +17,7 @@ class Config:
             "company_favorites": [],
             "company_hidden": [],
             "company_order": [],
+            "company_cache_authoritative": True,
             "client_id": "",
             "browser_engine": "webview2",
             "theme_mode": "light",
@@ -26,6 +27,9 @@ class Config:
             "quote_output_dir": QUOTE_DIR,
             "takeoff_default_wall_height": TAKEOFF_DEFAULT_WALL_HEIGHT,
             "door_finder_enabled": True,
+            "change_notifications_port": 0,
+            "change_notifications_client_state": "",
+            "change_notifications_subscriptions": {},
         }
         self.load()
 
@@ -1,6 +1,8 @@
+import base64
 import os
 import threading
 import time
+import weakref
 import webbrowser
 from datetime import timezone
 from email.utils import parsedate_to_datetime
@@ -16,15 +18,25 @@ except ImportError:
     requests = None
 
 from genimail.constants import (
+    ATTACHMENT_DOWNLOAD_CHUNK_BYTES,
+    ATTACHMENT_INLINE_SEND_MAX_BYTES,
+    ATTACHMENT_UPLOAD_CHUNK_BYTES,
+    ATTACHMENT_UPLOAD_RETRIES,
     AUTHORITY,
     DEFAULT_CLIENT_ID,
     GRAPH_BASE,
+    GRAPH_BATCH_MAX_REQUESTS,
+    GRAPH_MESSAGE_PAGE_SIZE,
     HTTP_CONNECT_TIMEOUT_SEC,
     HTTP_GET_RETRIES,
     HTTP_READ_TIMEOUT_SEC,
+    HTTP_SERVER_ERROR_RETRIES,
+    QT_THREAD_POOL_MAX_WORKERS,
     SCOPES,
+    SYNC_FOLDER_MAX_WORKERS,
 )
 from genimail.domain.helpers import token_cache_path_for_client_id
+from genimail.infra.graph_throttle import ThrottleGovernor, shared_governor
 from genimail.paths import CONFIG_DIR
 
 
@@ -40,6 +52,9 @@ class GraphClient:
         rate_limit_retries=3,
         max_retry_after_sec=30,
         max_delta_pages=200,
+        upload_retries=ATTACHMENT_UPLOAD_RETRIES,
+        server_error_retries=HTTP_SERVER_ERROR_RETRIES,
+        governor=None,
     ):
         if msal is None or requests is None:
             missing = []
@@ -58,6 +73,9 @@ class GraphClient:
         self.rate_limit_retries = max(0, int(rate_limit_retries or 0))
         self.max_retry_after_sec = max(1, int(max_retry_after_sec or 1))
         self.max_delta_pages = max(1, int(max_delta_pages or 1))
+        self.upload_retries = max(0, int(upload_retries or 0))
+        self.server_error_retries = max(0, int(server_error_retries or 0))
+        self.governor = governor or shared_governor()
         self.token_cache_file = token_cache_path_for_client_id(self.client_id)
         self.token_cache = msal.SerializableTokenCache()
         if os.path.exists(self.token_cache_file):
@@ -67,16 +85,64 @@ class GraphClient:
             self.client_id, authority=AUTHORITY, token_cache=self.token_cache
         )
         self._thread_local = threading.local()
+        self._sessions_lock = threading.Lock()
+        self._sessions = weakref.WeakSet()
+        self._adapter = None
+
+    # Worker-pool threads plus the concurrent folder-sync threads can all be
+    # in flight at once; each keeps one warm connection in the shared pool.
+    HTTP_POOL_MAXSIZE = QT_THREAD_POOL_MAX_WORKERS + SYNC_FOLDER_MAX_WORKERS
+
+    def _shared_adapter(self):
+        with self._sessions_lock:
+            if self._adapter is None:
+                self._adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=2,
+                    pool_maxsize=self.HTTP_POOL_MAXSIZE,
+                )
+            return self._adapter
 
     @property
     def session(self):
-        """Return a per-thread requests.Session (SSL contexts are not thread-safe)."""
+        """Return this thread's requests.Session.
+
+        Sessions are per thread, but all of them mount one shared
+        ``HTTPAdapter`` whose urllib3 pool hands each connection to a single
+        thread at a time.  Keep-alive connections therefore outlive the
+        short-lived pool threads that opened them.
+        """
         local = self._thread_local
         s = getattr(local, "session", None)
         if s is None:
-            local.session = s = requests.Session()
+            s = requests.Session()
+            adapter = self._shared_adapter()
+            s.mount("https://", adapter)
+            s.mount("http://", adapter)
+            s.headers["Accept-Encoding"] = "gzip, deflate"
+            with self._sessions_lock:
+                self._sessions.add(s)
+            local.session = s
         return s
 
+    def connection_stats(self):
+        """Requests sent vs TLS connections opened across the shared connection pool."""
+        adapter = getattr(self, "_adapter", None)
+        total_requests = 0
+        new_connections = 0
+        if adapter is not None:
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                total_requests += int(getattr(pool, "num_requests", 0) or 0)
+                new_connections += int(getattr(pool, "num_connections", 0) or 0)
+        return {
+            "requests": total_requests,
+            "new_connections": new_connections,
+            "reused_connections": max(0, total_requests - new_connections),
+        }
+
     def _save_cache(self):
         if self.token_cache.has_state_changed:
             os.makedirs(CONFIG_DIR, exist_ok=True)
@@ -136,12 +202,20 @@ class GraphClient:
                 parsed = parsed.replace(tzinfo=timezone.utc)
             return max(0, int(parsed.timestamp() - time.time()))
 
+    @property
+    def throttle(self):
+        """The request governor; stub clients built without ``__init__`` get a private one."""
+        governor = getattr(self, "governor", None)
+        if governor is None:
+            governor = self.governor = ThrottleGovernor()
+        return governor
+
     def _sleep_for_retry_after(self, response):
         headers = getattr(response, "headers", {}) or {}
         retry_after = headers.get("Retry-After") if hasattr(headers, "get") else None
         max_retry_after_sec = max(1, int(getattr(self, "max_retry_after_sec", 30) or 30))
         delay = min(max_retry_after_sec, self._retry_after_to_seconds(retry_after))
-        time.sleep(delay)
+        self.throttle.wait_for_retry_after(delay)
 
     @staticmethod
     def _json_or_error(response, endpoint):
@@ -153,14 +227,21 @@ class GraphClient:
             raise RuntimeError(f"Unexpected JSON shape from Graph endpoint: {endpoint}")
         return payload
 
-    def _request(self, method, url, params=None, data=None, allow_410=False):
+    _RETRYABLE_SERVER_STATUSES = (500, 502, 503, 504)
+
+    def _request(self, method, url, params=None, data=None, allow_410=False, stream=False):
         auth_retried = False
-        transport_retries = self.get_retries if method.upper() == "GET" else 0
+        is_get = method.upper() == "GET"
+        transport_retries = self.get_retries if is_get else 0
+        server_error_retries = max(0, int(getattr(self, "server_error_retries", HTTP_SERVER_ERROR_RETRIES) or 0))
         rate_limit_retries = getattr(self, "rate_limit_retries", 3)
         rate_limit_attempt = 0
+        server_error_attempt = 0
         attempt = 0
+        throttle = self.throttle
 
         while True:
+            throttle.acquire()
             try:
                 resp = self.session.request(
                     method,
@@ -169,11 +250,13 @@ class GraphClient:
                     params=params,
                     json=data,
                     timeout=self.request_timeout,
+                    stream=stream,
                 )
             except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
                 if attempt >= transport_retries:
                     raise
                 attempt += 1
+                throttle.wait_for_backoff(attempt)
                 continue
 
             if resp.status_code == 401 and not auth_retried and self.authenticate():
@@ -188,9 +271,102 @@ class GraphClient:
                 self._sleep_for_retry_after(resp)
                 continue
 
+            # Only idempotent reads are replayed after a server error; a POST
+            # such as sendMail may already have taken effect.
+            retryable_server_error = is_get and resp.status_code in self._RETRYABLE_SERVER_STATUSES
+            if retryable_server_error and server_error_attempt < server_error_retries:
+                server_error_attempt += 1
+                headers = getattr(resp, "headers", {}) or {}
+                if resp.status_code == 503 and headers.get("Retry-After"):
+                    self._sleep_for_retry_after(resp)
+                else:
+                    throttle.wait_for_backoff(server_error_attempt)
+                continue
+
             resp.raise_for_status()
             return resp
 
+    @staticmethod
+    def _batch_relative_url(url):
+        text = str(url or "")
+        if text.startswith(GRAPH_BASE):
+            text = text[len(GRAPH_BASE):]
+        return text if text.startswith("/") else f"/{text}"
+
+    def _sleep_for_batch_retry_after(self, responses):
+        delays = []
+        for response in responses:
+            headers = response.get("headers") or {}
+            retry_after = None
+            for key, value in headers.items():
+                if str(key).lower() == "retry-after":
+                    retry_after = value
+                    break
+            delays.append(self._retry_after_to_seconds(retry_after))
+        max_retry_after_sec = max(1, int(getattr(self, "max_retry_after_sec", 30) or 30))
+        self.throttle.wait_for_retry_after(min(max_retry_after_sec, max(delays or [1])))
+
+    def batch(self, requests_list):
+        """Send sub-requests through Graph's JSON ``$batch`` endpoint.
+
+        Each entry is a dict with ``method`` and ``url`` (relative to the API
+        root, or a full ``GRAPH_BASE`` URL) and an optional ``body``.  Requests
+        are sent in chunks of ``GRAPH_BATCH_MAX_REQUESTS``; throttled (429)
+        sub-requests are retried after their ``Retry-After``.  Returns one
+        ``{"status", "headers", "body"}`` dict per entry, in input order.
+        """
+        entries = []
+        for idx, item in enumerate(requests_list or []):
+            entry = {
+                "id": str(idx + 1),
+                "method": str(item.get("method") or "GET").upper(),
+                "url": self._batch_relative_url(item.get("url")),
+            }
+            if item.get("body") is not None:
+                entry["body"] = item["body"]
+                entry["headers"] = {"Content-Type": "application/json"}
+            entries.append(entry)
+
+        results = {}
+        rate_limit_retries = max(0, int(getattr(self, "rate_limit_retries", 3) or 0))
+        batch_url = f"{GRAPH_BASE}/$batch"
+        for start in range(0, len(entries), GRAPH_BATCH_MAX_REQUESTS):
+            pending = entries[start : start + GRAPH_BATCH_MAX_REQUESTS]
+            rate_limit_attempt = 0
+            while pending:
+                payload = self._json_or_error(self._post(batch_url, {"requests": pending}), batch_url)
+                responses = payload.get("responses")
+                if not isinstance(responses, list):
+                    raise RuntimeError("Malformed batch payload: expected list in 'responses'.")
+                by_id = {str(item.get("id")): item for item in responses if isinstance(item, dict)}
+                throttled = []
+                for entry in pending:
+                    response = by_id.get(entry["id"]) or {"status": 0, "headers": {}, "body": None}
+                    status = int(response.get("status") or 0)
+                    if status == 429 and rate_limit_attempt < rate_limit_retries:
+                        throttled.append((entry, response))
+                        continue
+                    results[entry["id"]] = {
+                        "status": status,
+                        "headers": response.get("headers") or {},
+                        "body": response.get("body"),
+                    }
+                if not throttled:
+                    break
+                rate_limit_attempt += 1
+                self._sleep_for_batch_retry_after([response for _, response in throttled])
+                pending = [entry for entry, _ in throttled]
+
+        return [results[entry["id"]] for entry in entries]
+
+    @staticmethod
+    def _batch_body_or_error(result, url):
+        status = result.get("status") or 0
+        if not 200 <= status < 300:
+            raise RuntimeError(f"Graph batch sub-request failed with status {status}: {url}")
+        body = result.get("body")
+        return body if isinstance(body, dict) else {}
+
     def _get(self, url, params=None):
         return self._json_or_error(self._request("GET", url, params=params), url)
 
@@ -207,39 +383,178 @@ class GraphClient:
         data = self._get(f"{GRAPH_BASE}/me/mailFolders", params={"$top": "50"})
         return data.get("value", [])
 
-    def get_messages(self, folder_id="inbox", top=50, skip=0, search=None, filter_str=None):
+    # $select profiles for folder listings.  "list" feeds the message list
+    # and leaves out the recipient arrays; "company" adds them for participant
+    # matching; "full" is everything the cache can store.
+    _MESSAGE_PROJECTIONS = {
+        "list": "id,subject,from,receivedDateTime,isRead,hasAttachments,bodyPreview,importance",
+        "company": "id,subject,from,toRecipients,ccRecipients,receivedDateTime,"
+        "isRead,hasAttachments,bodyPreview,importance",
+        "full": "id,subject,from,toRecipients,ccRecipients,replyTo,receivedDateTime,"
+        "isRead,hasAttachments,bodyPreview,importance",
+    }
+
+    def iter_message_pages(
+        self,
+        folder_id="inbox",
+        search=None,
+        filter_str=None,
+        projection="list",
+        page_size=GRAPH_MESSAGE_PAGE_SIZE,
+        max_messages=None,
+        skip=0,
+    ):
+        """Yield folder messages a page at a time, newest first.
+
+        ``@odata.nextLink`` is only requested when the caller asks for the next
+        page, so a consumer can render the first page while later ones are
+        still on the wire, or stop early.  At most ``max_messages`` are
+        yielded in total (``None`` means the whole folder).
+        """
+        select = self._MESSAGE_PROJECTIONS.get(projection)
+        if select is None:
+            raise ValueError(f"Unknown message projection: {projection}")
+        remaining = None if max_messages is None else max(0, int(max_messages))
+        page_size = max(1, int(page_size or 1))
         params = {
-            "$top": str(top),
-            "$skip": str(skip),
+            "$top": str(page_size if remaining is None else max(1, min(page_size, remaining))),
             "$orderby": "receivedDateTime desc",
-            "$select": "id,subject,from,toRecipients,ccRecipients,receivedDateTime,"
-            "isRead,hasAttachments,bodyPreview,importance",
+            "$select": select,
         }
+        if skip:
+            params["$skip"] = str(skip)
         if search:
             params["$search"] = f'"{search}"'
         if filter_str:
             params["$filter"] = filter_str
         url = f"{GRAPH_BASE}/me/mailFolders/{folder_id}/messages"
-        data = self._get(url, params=params)
-        return data.get("value", []), data.get("@odata.count", None)
+        seen_links = set()
+
+        while url and (remaining is None or remaining > 0):
+            data = self._get(url, params=params)
+            items = data.get("value") or []
+            if not isinstance(items, list):
+                raise RuntimeError("Malformed messages payload: expected list in 'value'.")
+            if remaining is not None:
+                items = items[:remaining]
+                remaining -= len(items)
+            if items:
+                yield items
+
+            next_link = data.get("@odata.nextLink")
+            if next_link is not None and not isinstance(next_link, str):
+                raise RuntimeError("Malformed messages payload: '@odata.nextLink' must be a string.")
+            if next_link in seen_links:
+                raise RuntimeError("Message pagination cycle detected.")
+            if next_link:
+                seen_links.add(next_link)
+            url = next_link
+            params = None
+
+    def get_messages(self, folder_id="inbox", top=50, skip=0, search=None, filter_str=None, projection="full"):
+        """Return up to ``top`` messages, following pagination; see ``iter_message_pages``."""
+        messages = []
+        for page in self.iter_message_pages(
+            folder_id=folder_id,
+            search=search,
+            filter_str=filter_str,
+            projection=projection,
+            max_messages=top,
+            skip=skip,
+        ):
+            messages.extend(page)
+        return messages, None
+
+    _MESSAGE_DETAIL_SELECT = (
+        "id,subject,from,toRecipients,ccRecipients,replyTo,"
+        "receivedDateTime,isRead,hasAttachments,body,importance,bodyPreview"
+    )
+
+    # Attachment lists carry metadata only; without $select Graph inlines
+    # every file's contentBytes.  contentId lives on the fileAttachment
+    # subtype, so it is selected through a type cast.
+    _ATTACHMENT_LIST_SELECT = "id,name,contentType,size,isInline,microsoft.graph.fileAttachment/contentId"
 
     def get_message(self, message_id):
-        params = {
-            "$select": "id,subject,from,toRecipients,ccRecipients,replyTo,"
-            "receivedDateTime,isRead,hasAttachments,body,importance,bodyPreview"
-        }
+        params = {"$select": self._MESSAGE_DETAIL_SELECT}
         return self._get(f"{GRAPH_BASE}/me/messages/{message_id}", params=params)
 
+    def get_message_with_attachments(self, message_id):
+        """Fetch a message and its attachment list in one batch round-trip."""
+        message_url = f"/me/messages/{message_id}?$select={self._MESSAGE_DETAIL_SELECT}"
+        attachments_url = f"/me/messages/{message_id}/attachments?$select={self._ATTACHMENT_LIST_SELECT}"
+        detail_result, attachments_result = self.batch(
+            [{"method": "GET", "url": message_url}, {"method": "GET", "url": attachments_url}]
+        )
+        detail = self._batch_body_or_error(detail_result, message_url)
+        attachments = self._batch_body_or_error(attachments_result, attachments_url).get("value", [])
+        return detail, attachments
+
     def get_attachments(self, message_id):
-        data = self._get(f"{GRAPH_BASE}/me/messages/{message_id}/attachments")
+        params = {"$select": self._ATTACHMENT_LIST_SELECT}
+        data = self._get(f"{GRAPH_BASE}/me/messages/{message_id}/attachments", params=params)
         return data.get("value", [])
 
     def download_attachment(self, message_id, attachment_id):
         return self._get(f"{GRAPH_BASE}/me/messages/{message_id}/attachments/{attachment_id}")
 
+    def download_attachment_to(self, message_id, attachment_id, target_path, on_progress=None):
+        """Stream an attachment's raw bytes from ``/$value`` into ``target_path``.
+
+        The payload is written in ``ATTACHMENT_DOWNLOAD_CHUNK_BYTES`` chunks, so
+        memory stays flat regardless of size.  ``on_progress(written, total)``
+        is called after each chunk; ``total`` is ``None`` when the server sends
+        no ``Content-Length``.  Returns the number of bytes written.
+        """
+        url = f"{GRAPH_BASE}/me/messages/{message_id}/attachments/{attachment_id}/$value"
+        resp = self._request("GET", url, stream=True)
+        try:
+            headers = getattr(resp, "headers", {}) or {}
+            try:
+                total = int(headers.get("Content-Length"))
+            except (TypeError, ValueError):
+                total = None
+            written = 0
+            with open(target_path, "wb") as handle:
+                for chunk in resp.iter_content(chunk_size=ATTACHMENT_DOWNLOAD_CHUNK_BYTES):
+                    if not chunk:
+                        continue
+                    handle.write(chunk)
+                    written += len(chunk)
+                    if on_progress is not None:
+                        on_progress(written, total)
+        finally:
+            close = getattr(resp, "close", None)
+            if close is not None:
+                close()
+        return written
+
+    def download_attachments(self, message_id, attachment_ids):
+        """Fetch several attachments of one message; returns ``{attachment_id: payload}``.
+
+        Attachments whose sub-request fails are left out of the result.
+        """
+        ids = [attachment_id for attachment_id in attachment_ids or [] if attachment_id]
+        results = self.batch(
+            [{"method": "GET", "url": f"/me/messages/{message_id}/attachments/{attachment_id}"} for attachment_id in ids]
+        )
+        downloaded = {}
+        for attachment_id, result in zip(ids, results):
+            if 200 <= result["status"] < 300 and isinstance(result["body"], dict):
+                downloaded[attachment_id] = result["body"]
+        return downloaded
+
     def mark_read(self, message_id, is_read=True):
         self._patch(f"{GRAPH_BASE}/me/messages/{message_id}", {"isRead": is_read})
 
+    def mark_read_many(self, message_ids, is_read=True):
+        """PATCH ``isRead`` on many messages through ``$batch``; returns the ids that failed."""
+        ids = [message_id for message_id in message_ids or [] if message_id]
+        results = self.batch(
+            [{"method": "PATCH", "url": f"/me/messages/{message_id}", "body": {"isRead": is_read}} for message_id in ids]
+        )
+        return [message_id for message_id, result in zip(ids, results) if not 200 <= result["status"] < 300]
+
     def send_mail(
         self,
         to_list,
@@ -250,6 +565,14 @@ class GraphClient:
         reply_to_id=None,
         reply_mode=None,
     ):
+        """Send a message, inlining attachments when small and uploading them otherwise.
+
+        ``attachments`` may mix ready Graph ``fileAttachment`` dicts with
+        file-backed entries (``{"name", "path", "size"}``).  When the file-backed
+        total fits in ``ATTACHMENT_INLINE_SEND_MAX_BYTES`` everything goes out in
+        one ``sendMail`` call; otherwise the message is staged as a draft and
+        large files are streamed from disk through upload sessions.
+        """
         message = {
             "subject": subject,
             "body": {"contentType": "Text", "content": body},
@@ -257,54 +580,181 @@ class GraphClient:
         }
         if cc_list:
             message["ccRecipients"] = [{"emailAddress": {"address": a}} for a in cc_list if a.strip()]
+
+        attachments = list(attachments or [])
+        file_backed_bytes = sum(int(item.get("size") or 0) for item in attachments if item.get("path"))
+        if file_backed_bytes > ATTACHMENT_INLINE_SEND_MAX_BYTES:
+            self._send_mail_via_draft(message, attachments)
+            return
+
         if attachments:
-            message["attachments"] = attachments
+            message["attachments"] = [self._inline_file_attachment(item) for item in attachments]
 
         # Use sendMail for all compose modes so edited recipients/subject/body/attachments
         # are transmitted exactly as composed.
         _ = reply_to_id, reply_mode
         self._post(f"{GRAPH_BASE}/me/sendMail", {"message": message, "saveToSentItems": True})
 
+    @staticmethod
+    def _inline_file_attachment(item):
+        if not item.get("path"):
+            return item
+        with open(item["path"], "rb") as handle:
+            encoded = base64.b64encode(handle.read()).decode("utf-8")
+        return {
+            "@odata.type": "#microsoft.graph.fileAttachment",
+            "name": item.get("name") or os.path.basename(item["path"]),
+            "contentBytes": encoded,
+        }
+
+    def _send_mail_via_draft(self, message, attachments):
+        draft_url = f"{GRAPH_BASE}/me/messages"
+        draft = self._json_or_error(self._post(draft_url, message), draft_url)
+        draft_id = draft.get("id")
+        if not draft_id:
+            raise RuntimeError("Graph did not return an id for the draft message.")
+        try:
+            for item in attachments:
+                if item.get("path") and int(item.get("size") or 0) > ATTACHMENT_INLINE_SEND_MAX_BYTES:
+                    self._upload_attachment(draft_id, item)
+                else:
+                    self._post(f"{GRAPH_BASE}/me/messages/{draft_id}/attachments", self._inline_file_attachment(item))
+            self._post(f"{GRAPH_BASE}/me/messages/{draft_id}/send", None)
+        except Exception:
+            try:
+                self.delete_message(draft_id)
+            except Exception:
+                pass
+            raise
+
+    def _upload_attachment(self, message_id, item):
+        """Stream one file into a Graph upload session, resuming after transient failures."""
+        path = item["path"]
+        size = os.path.getsize(path)
+        session_url = f"{GRAPH_BASE}/me/messages/{message_id}/attachments/createUploadSession"
+        upload_session = self._json_or_error(
+            self._post(
+                session_url,
+                {
+                    "AttachmentItem": {
+                        "attachmentType": "file",
+                        "name": item.get("name") or os.path.basename(path),
+                        "size": size,
+                    }
+                },
+            ),
+            session_url,
+        )
+        upload_url = upload_session.get("uploadUrl")
+        if not upload_url:
+            raise RuntimeError("Graph did not return an upload URL for the attachment.")
+
+        upload_retries = max(0, int(getattr(self, "upload_retries", ATTACHMENT_UPLOAD_RETRIES) or 0))
+        failures = 0
+        offset = 0
+        with open(path, "rb") as handle:
+            while offset < size:
+                handle.seek(offset)
+                chunk = handle.read(min(ATTACHMENT_UPLOAD_CHUNK_BYTES, size - offset))
+                end = offset + len(chunk) - 1
+                try:
+                    # The upload URL is pre-authorized; Graph rejects a bearer token on it.
+                    resp = self.session.put(
+                        upload_url,
+                        data=chunk,
+                        headers={"Content-Length": str(len(chunk)), "Content-Range": f"bytes {offset}-{end}/{size}"},
+                        timeout=self.request_timeout,
+                    )
+                except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
+                    resp = None
+
+                if resp is not None and resp.status_code in (200, 201):
+                    return
+                if resp is not None and resp.status_code == 202:
+                    failures = 0
+                    offset = self._upload_next_offset(self._json_or_error(resp, upload_url), end + 1)
+                    continue
+                transient = resp is None or resp.status_code == 429 or resp.status_code >= 500
+                if not transient or failures >= upload_retries:
+                    if resp is None:
+                        raise RuntimeError(f"Attachment upload failed after {failures + 1} attempts: {path}")
+                    resp.raise_for_status()
+                    raise RuntimeError(f"Unexpected upload status {resp.status_code}: {path}")
+                failures += 1
+                if resp is not None and resp.status_code == 429:
+                    self._sleep_for_retry_after(resp)
+                else:
+                    # Same jittered backoff _request uses, so a failing service is not hammered.
+                    self.throttle.wait_for_backoff(failures)
+                offset = self._upload_session_offset(upload_url, offset)
+
+    @staticmethod
+    def _upload_next_offset(payload, fallback):
+        ranges = payload.get("nextExpectedRanges") or []
+        if not ranges:
+            return fallback
+        try:
+            return int(str(ranges[0]).split("-", 1)[0])
+        except ValueError:
+            return fallback
+
+    def _upload_session_offset(self, upload_url, fallback):
+        """Ask the upload session which byte it expects next."""
+        try:
+            resp = self.session.get(upload_url, timeout=self.request_timeout)
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
+            return fallback
+        if resp.status_code != 200:
+            return fallback
+        try:
+            return self._upload_next_offset(self._json_or_error(resp, upload_url), fallback)
+        except RuntimeError:
+            return fallback
+
     def move_message(self, message_id, destination_folder_id):
         self._post(f"{GRAPH_BASE}/me/messages/{message_id}/move", {"destinationId": destination_folder_id})
 
     def delete_message(self, message_id):
         self._request("DELETE", f"{GRAPH_BASE}/me/messages/{message_id}")
 
-    def get_messages_delta(self, folder_id="inbox", delta_link=None):
-        """Fetch messages using delta query. Returns (messages, new_delta_link, deleted_ids)."""
+    _DELTA_SELECT = (
+        "id,subject,from,toRecipients,ccRecipients,receivedDateTime,"
+        "isRead,hasAttachments,bodyPreview,importance"
+    )
+
+    def iter_delta_pages(self, folder_id="inbox", delta_link=None):
+        """Yield one delta round a page at a time.
+
+        Each page is ``(messages, deleted_ids, next_link, delta_link)``; exactly
+        one of the two links is set.  ``delta_link`` may also be a saved
+        ``@odata.nextLink`` checkpoint, which resumes a round part way through.
+        When Graph answers 410 the round is stale and a single
+        ``(None, None, None, None)`` page is yielded instead.
+        """
         if delta_link:
             url = delta_link
             params = None
         else:
             url = f"{GRAPH_BASE}/me/mailFolders/{folder_id}/messages/delta"
-            params = {
-                "$select": "id,subject,from,toRecipients,ccRecipients,receivedDateTime,"
-                "isRead,hasAttachments,bodyPreview,importance",
-            }
-
-        messages = []
-        deleted_ids = []
+            params = {"$select": self._DELTA_SELECT}
         seen_links = set()
-        max_pages = max(1, int(getattr(self, "max_delta_pages", 200) or 200))
-        pages_seen = 0
 
         while url:
             if url in seen_links:
                 raise RuntimeError("Delta pagination cycle detected.")
             seen_links.add(url)
-            pages_seen += 1
-            if pages_seen > max_pages:
-                raise RuntimeError("Delta pagination exceeded maximum page limit.")
 
             resp = self._request("GET", url, params=params, allow_410=True)
             if resp.status_code == 410:
-                return None, None, None
+                yield None, None, None, None
+                return
             data = self._json_or_error(resp, url)
 
             items = data.get("value") or []
             if not isinstance(items, list):
                 raise RuntimeError("Malformed delta payload: expected list in 'value'.")
+            messages = []
+            deleted_ids = []
             for item in items:
                 if not isinstance(item, dict):
                     continue
@@ -318,20 +768,59 @@ class GraphClient:
             next_link = data.get("@odata.nextLink")
             if next_link is not None and not isinstance(next_link, str):
                 raise RuntimeError("Malformed delta payload: '@odata.nextLink' must be a string.")
+            new_delta_link = data.get("@odata.deltaLink")
+            if new_delta_link is not None and not isinstance(new_delta_link, str):
+                raise RuntimeError("Malformed delta payload: '@odata.deltaLink' must be a string.")
+            if new_delta_link:
+                yield messages, deleted_ids, None, new_delta_link
+                return
+            yield messages, deleted_ids, next_link or None, None
             url = next_link
             params = None
-            if "@odata.deltaLink" in data:
-                new_delta_link = data["@odata.deltaLink"]
-                if not isinstance(new_delta_link, str):
-                    raise RuntimeError("Malformed delta payload: '@odata.deltaLink' must be a string.")
+
+    def get_messages_delta(self, folder_id="inbox", delta_link=None):
+        """Fetch messages using delta query. Returns (messages, new_delta_link, deleted_ids).
+
+        Collects a whole round in memory, capped at ``max_delta_pages``; sync
+        code streams ``iter_delta_pages`` instead.
+        """
+        messages = []
+        deleted_ids = []
+        max_pages = max(1, int(getattr(self, "max_delta_pages", 200) or 200))
+        pages_seen = 0
+
+        for page_messages, page_deleted, _, new_delta_link in self.iter_delta_pages(
+            folder_id=folder_id, delta_link=delta_link
+        ):
+            if page_messages is None:
+                return None, None, None
+            pages_seen += 1
+            if pages_seen > max_pages:
+                raise RuntimeError("Delta pagination exceeded maximum page limit.")
+            messages.extend(page_messages)
+            deleted_ids.extend(page_deleted)
+            if new_delta_link:
                 return messages, new_delta_link, deleted_ids
 
         return messages, None, deleted_ids
 
     def close(self):
+        """Close every thread's session and the shared connection pool."""
+        lock = getattr(self, "_sessions_lock", None)
+        sessions = []
+        adapter = None
+        if lock is not None:
+            with lock:
+                sessions = list(self._sessions)
+                self._sessions = weakref.WeakSet()
+                adapter, self._adapter = self._adapter, None
         local = getattr(self, "_thread_local", None)
         if local is not None:
             s = getattr(local, "session", None)
-            if s is not None:
-                s.close()
-                local.session = None
+            if s is not None and s not in sessions:
+                sessions.append(s)
+            local.session = None
+        for s in sessions:
+            s.close()
+        if adapter is not None:
+            adapter.close()
@@ -0,0 +1,109 @@
+"""Process-wide request governor shared by every Graph client thread."""
+
+import random
+import threading
+import time
+
+from genimail.constants import (
+    GRAPH_BACKOFF_BASE_SEC,
+    GRAPH_BACKOFF_MAX_SEC,
+    GRAPH_THROTTLE_BURST,
+    GRAPH_THROTTLE_RATE_PER_SEC,
+)
+
+
+class ThrottleGovernor:
+    """Token bucket plus a global ``Retry-After`` window for Graph requests.
+
+    ``acquire`` blocks until a token is available and no throttle window is
+    open.  When Graph answers 429 (or 503 with ``Retry-After``), the throttled
+    thread calls ``wait_for_retry_after``: it sleeps out the delay itself and
+    opens a window that holds back every other thread for the same period,
+    instead of each of them discovering the throttle on its own.
+    """
+
+    def __init__(
+        self,
+        rate_per_sec=GRAPH_THROTTLE_RATE_PER_SEC,
+        burst=GRAPH_THROTTLE_BURST,
+        backoff_base_sec=GRAPH_BACKOFF_BASE_SEC,
+        backoff_max_sec=GRAPH_BACKOFF_MAX_SEC,
+        clock=time.monotonic,
+    ):
+        self.rate_per_sec = max(0.001, float(rate_per_sec or 0.001))
+        self.burst = max(1.0, float(burst or 1))
+        self.backoff_base_sec = max(0.0, float(backoff_base_sec or 0.0))
+        self.backoff_max_sec = max(self.backoff_base_sec, float(backoff_max_sec or 0.0))
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._tokens = self.burst
+        self._updated_at = clock()
+        self._blocked_until = 0.0
+        self.requests = 0
+        self.throttled = 0
+        self.retried = 0
+        self.waited_sec = 0.0
+
+    def acquire(self):
+        """Block until this thread may send one request."""
+        while True:
+            with self._lock:
+                now = self._clock()
+                served_until = getattr(self._local, "served_until", 0.0)
+                if now < self._blocked_until and served_until < self._blocked_until:
+                    wait = self._blocked_until - now
+                else:
+                    elapsed = max(0.0, now - self._updated_at)
+                    self._tokens = min(self.burst, self._tokens + elapsed * self.rate_per_sec)
+                    self._updated_at = now
+                    if self._tokens >= 1.0:
+                        self._tokens -= 1.0
+                        self.requests += 1
+                        return
+                    wait = (1.0 - self._tokens) / self.rate_per_sec
+                self.waited_sec += wait
+            time.sleep(wait)
+
+    def wait_for_retry_after(self, delay_sec):
+        """Open a global throttle window of ``delay_sec`` and sleep through it."""
+        delay_sec = max(0.0, float(delay_sec or 0.0))
+        with self._lock:
+            self.throttled += 1
+            self.retried += 1
+            self.waited_sec += delay_sec
+            self._blocked_until = max(self._blocked_until, self._clock() + delay_sec)
+            self._local.served_until = self._blocked_until
+        time.sleep(delay_sec)
+
+    def wait_for_backoff(self, attempt):
+        """Sleep a jittered exponential delay before retry ``attempt`` (1-based)."""
+        ceiling = min(self.backoff_max_sec, self.backoff_base_sec * (2 ** max(0, int(attempt) - 1)))
+        delay = random.uniform(0.0, ceiling)
+        with self._lock:
+            self.retried += 1
+            self.waited_sec += delay
+        time.sleep(delay)
+        return delay
+
+    def stats(self):
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "throttled": self.throttled,
+                "retried": self.retried,
+                "waited_sec": round(self.waited_sec, 3),
+            }
+
+
+_shared_governor = None
+_shared_governor_lock = threading.Lock()
+
+
+def shared_governor():
+    """Return the governor every ``GraphClient`` in this process shares."""
+    global _shared_governor
+    with _shared_governor_lock:
+        if _shared_governor is None:
+            _shared_governor = ThrottleGovernor()
+        return _shared_governor
@@ -0,0 +1,216 @@
+"""In-process caches bounded by an approximate byte budget or entry count."""
+
+import logging
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+def approximate_size(value):
+    """Rough resident size of a JSON-like value (dicts, lists, strings, scalars)."""
+    size = 0
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        size += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+    return size
+
+
+class SizedLRUCache:
+    """Dict-like LRU cache that evicts least-recently-used entries past ``max_bytes``.
+
+    Entry sizes are measured once on insert with ``sizeof``.  ``on_evict(key, value)``
+    runs for every entry pushed out by the budget (not for ``pop``/``clear``), so
+    callers can spill evicted data somewhere cheaper.  An entry larger than the
+    whole budget is still kept until the next insert, since it is usually the one
+    the caller is about to use.
+    """
+
+    def __init__(self, max_bytes, sizeof=approximate_size, on_evict=None):
+        self.max_bytes = max(0, int(max_bytes or 0))
+        self._sizeof = sizeof
+        self._on_evict = on_evict
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.evicted_bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __getitem__(self, key):
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                raise KeyError(key)
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key][0]
+
+    def __setitem__(self, key, value):
+        size = self._sizeof(value)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= previous[1]
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+            evicted = self._evict_over_budget()
+        for evicted_key, evicted_value in evicted:
+            if self._on_evict is not None:
+                self._on_evict(evicted_key, evicted_value)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return default
+            self.current_bytes -= entry[1]
+            return entry[0]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def keys(self):
+        with self._lock:
+            return list(self._entries.keys())
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "evicted_bytes": self.evicted_bytes,
+            }
+
+    def _evict_over_budget(self):
+        evicted = []
+        # Never evict the entry that was just inserted (the last one).
+        while self.current_bytes > self.max_bytes and len(self._entries) > 1:
+            key, (value, size) = self._entries.popitem(last=False)
+            self.current_bytes -= size
+            self.evictions += 1
+            self.evicted_bytes += size
+            evicted.append((key, value))
+        if evicted:
+            logger.debug(
+                "evicted %d entries; %d/%d bytes resident", len(evicted), self.current_bytes, self.max_bytes
+            )
+        return evicted
+
+
+class TTLLRUCache:
+    """LRU cache bounded by entry count whose entries go stale after ``ttl_sec``.
+
+    Stale entries are not dropped on expiry: ``lookup`` still returns them,
+    flagged as not fresh, so callers can show old results while refreshing.
+    ``get`` only returns fresh values.  Inserting past ``max_entries`` evicts
+    the least recently used entry in O(1).  ``invalidate(predicate)`` drops
+    every entry for which ``predicate(key, value)`` is true.
+    """
+
+    def __init__(self, max_entries, ttl_sec, clock=time.monotonic):
+        self.max_entries = max(1, int(max_entries or 1))
+        self.ttl_sec = max(0.0, float(ttl_sec or 0.0))
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (value, self._clock())
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def lookup(self, key):
+        """Return ``(value, fresh)``, or ``(None, False)`` when ``key`` is absent."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None, False
+            self._entries.move_to_end(key)
+            value, stored_at = entry
+            fresh = self._clock() - stored_at <= self.ttl_sec
+            if fresh:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+            return value, fresh
+
+    def get(self, key, default=None):
+        value, fresh = self.lookup(key)
+        return value if fresh else default
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            return default if entry is None else entry[0]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def keys(self):
+        with self._lock:
+            return list(self._entries.keys())
+
+    def invalidate(self, predicate):
+        """Drop entries where ``predicate(key, value)`` is true; return how many."""
+        with self._lock:
+            doomed = [key for key, (value, _) in self._entries.items() if predicate(key, value)]
+            for key in doomed:
+                del self._entries[key]
+            self.invalidations += len(doomed)
+            return len(doomed)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
@@ -6,6 +6,7 @@ CONFIG_DIR = os.path.join(ROOT_DIR, "email_config")
 CONFIG_FILE = os.path.join(CONFIG_DIR, "config.json")
 TOKEN_CACHE_FILE = os.path.join(CONFIG_DIR, "token_cache.json")
 CACHE_DB_FILE = os.path.join(CONFIG_DIR, "email_cache.db")
+ATTACHMENT_BLOB_DIR = os.path.join(CONFIG_DIR, "attachment_blobs")
 PDF_DIR = os.path.join(ROOT_DIR, "pdf")
 QUOTE_DIR = os.path.join(ROOT_DIR, "quotes")
 DEFAULT_QUOTE_TEMPLATE_FILE = os.path.join(CONFIG_DIR, "quote_template.docx")
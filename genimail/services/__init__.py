@@ -1,5 +1,5 @@
 """Service-layer modules for Genimail."""
 
-from . import mail_sync
+from . import body_prefetch, mail_sync, poll_scheduler, sync_triggers
 
-__all__ = ["mail_sync"]
+__all__ = ["body_prefetch", "mail_sync", "poll_scheduler", "sync_triggers"]
@@ -0,0 +1,110 @@
+import threading
+
+from genimail.constants import BODY_PREFETCH_MAX_MESSAGES, BODY_PREFETCH_MIN_INTERVAL_SEC
+
+
+class BodyPrefetcher:
+    """Warms the SQLite body cache for messages the user is likely to open next.
+
+    One background thread fetches bodies and attachment metadata, spaced at
+    least ``min_interval_sec`` apart.  Each ``prefetch`` call replaces the
+    previous run; ``cancel`` stops it without waiting for in-flight requests.
+
+    Fetched bodies are saved through ``cache_writer`` (the window's
+    ``CacheWriteBehind``) when one is given, so the prefetch thread never
+    takes the SQLite write lock itself; ``cache_store`` is only read.
+    """
+
+    def __init__(
+        self,
+        graph_client,
+        cache_store,
+        cache_writer=None,
+        max_messages=BODY_PREFETCH_MAX_MESSAGES,
+        min_interval_sec=BODY_PREFETCH_MIN_INTERVAL_SEC,
+        max_consecutive_failures=3,
+    ):
+        self.graph = graph_client
+        self.cache = cache_store
+        self.cache_writer = cache_writer or cache_store
+        self.max_messages = max(0, int(max_messages or 0))
+        self.min_interval_sec = max(0.0, float(min_interval_sec or 0.0))
+        self.max_consecutive_failures = max(1, int(max_consecutive_failures or 1))
+        self.fetched_count = 0
+        self.failed_count = 0
+        self._lock = threading.Lock()
+        self._cancel_event = None
+        self._thread = None
+
+    def prefetch(self, message_ids):
+        """Start warming ``message_ids`` (in priority order), replacing any earlier run."""
+        self.cancel()
+        wanted = []
+        for message_id in message_ids or []:
+            if message_id and message_id not in wanted:
+                wanted.append(message_id)
+            if len(wanted) >= self.max_messages:
+                break
+        if not wanted:
+            return None
+        cancel_event = threading.Event()
+        thread = threading.Thread(
+            target=self._run,
+            args=(wanted, cancel_event),
+            name="genimail-body-prefetch",
+            daemon=True,
+        )
+        with self._lock:
+            self._cancel_event = cancel_event
+            self._thread = thread
+        thread.start()
+        return thread
+
+    def cancel(self):
+        with self._lock:
+            cancel_event, self._cancel_event = self._cancel_event, None
+            self._thread = None
+        if cancel_event is not None:
+            cancel_event.set()
+
+    def close(self):
+        self.cancel()
+
+    def _run(self, message_ids, cancel_event):
+        try:
+            cached = self.cache.get_cached_body_ids(message_ids)
+        except Exception:
+            return
+        failures = 0
+        first = True
+        for message_id in message_ids:
+            if message_id in cached:
+                continue
+            # Waiting on the event doubles as the rate limit and the cancel check.
+            if not first and cancel_event.wait(self.min_interval_sec):
+                return
+            if cancel_event.is_set():
+                return
+            first = False
+            try:
+                self._fetch_into_cache(message_id, cancel_event)
+            except Exception:
+                self.failed_count += 1
+                failures += 1
+                if failures >= self.max_consecutive_failures:
+                    return
+                continue
+            failures = 0
+
+    def _fetch_into_cache(self, message_id, cancel_event):
+        if hasattr(self.graph, "get_message_with_attachments"):
+            detail, attachments = self.graph.get_message_with_attachments(message_id)
+        else:
+            detail = self.graph.get_message(message_id)
+            attachments = self.graph.get_attachments(message_id)
+        if cancel_event.is_set():
+            return
+        body = detail.get("body", {}) or {}
+        self.cache_writer.save_message_body(message_id, body.get("contentType", ""), body.get("content", ""))
+        self.cache_writer.save_attachments(message_id, attachments or [])
+        self.fetched_count += 1
@@ -1,22 +1,119 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from genimail.constants import SYNC_FOLDER_MAX_WORKERS
+
+
 class MailSyncService:
     """Coordinates Graph delta sync and cache persistence."""
 
-    def __init__(self, graph_client, cache_store):
+    def __init__(self, graph_client, cache_store, max_workers=SYNC_FOLDER_MAX_WORKERS):
         self.graph = graph_client
         self.cache = cache_store
+        self.max_workers = max(1, int(max_workers or 1))
+        # Folder deltas run on pool threads; cache writes still land one folder at a time.
+        self._cache_write_lock = threading.Lock()
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def close(self):
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _delta_checkpoint(self, folder_id):
+        get_checkpoint = getattr(self.cache, "get_delta_checkpoint", None)
+        if not callable(get_checkpoint):
+            return None
+        return get_checkpoint(folder_id)
+
+    def _sync_progress(self, folder_id):
+        get_progress = getattr(self.cache, "get_sync_progress", None)
+        if not callable(get_progress):
+            checkpoint = self._delta_checkpoint(folder_id)
+            return {"next_link": checkpoint, "pages_synced": 0} if checkpoint else None
+        return get_progress(folder_id)
+
+    def _delta_pages(self, folder_id, link=None):
+        iter_pages = getattr(self.graph, "iter_delta_pages", None)
+        if callable(iter_pages):
+            return iter_pages(folder_id=folder_id, delta_link=link)
+        messages, delta_link, deleted_ids = self.graph.get_messages_delta(folder_id=folder_id, delta_link=link)
+        return iter([(messages, deleted_ids, None, delta_link)])
+
+    def _apply_delta_page(self, folder_id, messages, deleted_ids, next_link, delta_link):
+        with self._cache_write_lock:
+            apply_page = getattr(self.cache, "apply_delta_page", None)
+            if callable(apply_page):
+                apply_page(folder_id, messages, deleted_ids, next_link=next_link, delta_link=delta_link)
+                return
+            if deleted_ids:
+                self.cache.delete_messages(deleted_ids)
+            if messages:
+                self.cache.save_messages(messages, folder_id)
+            if delta_link:
+                self.cache.save_delta_link(folder_id, delta_link)
+
+    def _clear_delta_state(self, folder_id):
+        with self._cache_write_lock:
+            clear_delta_link = getattr(self.cache, "clear_delta_link", None)
+            if callable(clear_delta_link):
+                clear_delta_link(folder_id)
+            else:
+                self.cache.clear_delta_links()
 
-    def initialize_delta_token(self, folder_id="inbox"):
+    def _run_delta_round(self, folder_id, link=None, collect=True, on_progress=None, pages_done=0):
+        """Stream one delta round into the cache, committing page by page.
+
+        Returns ``(messages, deleted_ids, delta_link)``, or ``None`` when Graph
+        reports the link as expired.  With ``collect=False`` pages are not kept
+        after they are committed, so an initial sync holds one page at a time.
+        ``on_progress(folder_id, pages, message_count)`` runs after each
+        commit; ``pages`` continues from ``pages_done``.
+        """
+        messages = []
+        deleted_ids = []
+        delta_link = None
+        pages = int(pages_done or 0)
+        message_count = 0
+        for page_messages, page_deleted, next_link, page_delta_link in self._delta_pages(folder_id, link):
+            if page_messages is None:
+                return None
+            page_deleted = page_deleted or []
+            self._apply_delta_page(folder_id, page_messages, page_deleted, next_link, page_delta_link)
+            pages += 1
+            message_count += len(page_messages)
+            if on_progress is not None:
+                on_progress(folder_id, pages, message_count)
+            if collect:
+                messages.extend(page_messages)
+                deleted_ids.extend(page_deleted)
+            if page_delta_link:
+                delta_link = page_delta_link
+        return messages, deleted_ids, delta_link
+
+    def initialize_delta_token(self, folder_id="inbox", on_progress=None):
         existing = self.cache.get_delta_link(folder_id)
         if existing:
             return existing
-        messages, delta_link, deleted_ids = self.graph.get_messages_delta(folder_id=folder_id)
-        if delta_link:
-            self.cache.save_delta_link(folder_id, delta_link)
-        if messages:
-            self.cache.save_messages(messages, folder_id)
-        if deleted_ids:
-            self.cache.delete_messages(deleted_ids)
-        return delta_link
+        progress = self._sync_progress(folder_id) or {}
+        checkpoint = progress.get("next_link")
+        result = self._run_delta_round(
+            folder_id,
+            checkpoint,
+            collect=False,
+            on_progress=on_progress,
+            pages_done=progress.get("pages_synced") or 0,
+        )
+        if result is None and checkpoint:
+            # The saved nextLink outlived its round; start the round over.
+            self._clear_delta_state(folder_id)
+            result = self._run_delta_round(folder_id, None, collect=False, on_progress=on_progress)
+        if result is None:
+            return None
+        return result[2]
 
     def fetch_recent_messages(self, folder_id="inbox", top=50):
         messages, _ = self.graph.get_messages(folder_id=folder_id, top=top)
@@ -28,35 +125,22 @@ class MailSyncService:
             messages, _ = self.graph.get_messages(folder_id=folder_id, top=fallback_top)
             return messages or [], []
 
-        messages, new_delta_link, deleted_ids = self.graph.get_messages_delta(
-            folder_id=folder_id,
-            delta_link=delta_link,
-        )
-
-        if messages is None:
-            clear_delta_link = getattr(self.cache, "clear_delta_link", None)
-            if callable(clear_delta_link):
-                clear_delta_link(folder_id)
-            else:
-                self.cache.clear_delta_links()
-            messages, new_delta_link, deleted_ids = self.graph.get_messages_delta(folder_id=folder_id)
-            if messages is None:
-                messages, _ = self.graph.get_messages(folder_id=folder_id, top=fallback_top)
-                _, new_delta_link, _ = self.graph.get_messages_delta(folder_id=folder_id)
-            elif not messages:
-                messages, _ = self.graph.get_messages(folder_id=folder_id, top=fallback_top)
-
-        if new_delta_link:
-            self.cache.save_delta_link(folder_id, new_delta_link)
-
-        deleted_ids = deleted_ids or []
-        if deleted_ids:
-            self.cache.delete_messages(deleted_ids)
+        result = self._run_delta_round(folder_id, self._delta_checkpoint(folder_id) or delta_link)
+        if result is not None:
+            return result[0], result[1]
 
+        self._clear_delta_state(folder_id)
+        result = self._run_delta_round(folder_id, None)
+        if result is not None and result[0]:
+            return result[0], result[1]
+        deleted_ids = result[1] if result is not None else []
+        messages, _ = self.graph.get_messages(folder_id=folder_id, top=fallback_top)
         messages = messages or []
+        if result is None:
+            self._run_delta_round(folder_id, None, collect=False)
         if messages:
-            self.cache.save_messages(messages, folder_id)
-
+            with self._cache_write_lock:
+                self.cache.save_messages(messages, folder_id)
         return messages, deleted_ids
 
     @staticmethod
@@ -79,17 +163,61 @@ class MailSyncService:
             add(folder_id)
         return ordered
 
-    def initialize_delta_tokens(self, folder_ids, primary_folder_id="inbox"):
+    def _get_executor(self):
+        with self._executor_lock:
+            if self._executor is None:
+                # A long-lived pool keeps GraphClient's per-thread sessions warm between polls.
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="genimail-sync",
+                )
+            return self._executor
+
+    def _run_per_folder(self, folder_ids, task):
+        """Run ``task(folder_id)`` for each folder, in parallel when allowed.
+
+        Returns ``(folder_id, result, error, elapsed_ms)`` tuples in the order of
+        ``folder_ids``.  The first folder is submitted first, so the primary
+        folder never waits behind the others for a worker.
+        """
+
+        def timed(folder_id):
+            started = time.perf_counter()
+            try:
+                result, error = task(folder_id), None
+            except Exception as exc:
+                result, error = None, exc
+            return folder_id, result, error, round((time.perf_counter() - started) * 1000.0, 1)
+
+        if self.max_workers <= 1 or len(folder_ids) <= 1:
+            return [timed(folder_id) for folder_id in folder_ids]
+        executor = self._get_executor()
+        futures = [executor.submit(timed, folder_id) for folder_id in folder_ids]
+        return [future.result() for future in futures]
+
+    def initialize_delta_tokens(self, folder_ids, primary_folder_id="inbox", on_progress=None):
         ordered_folders = self._ordered_folder_ids(folder_ids, primary_folder_id=primary_folder_id)
         ready = []
         errors = []
-        for folder_id in ordered_folders:
-            try:
-                self.initialize_delta_token(folder_id=folder_id)
-                ready.append(folder_id)
-            except Exception as exc:
-                errors.append(f"{folder_id}: {exc}")
-        return {"folder_ids": ordered_folders, "ready": ready, "errors": errors}
+        timings_ms = {}
+        started = time.perf_counter()
+        results = self._run_per_folder(
+            ordered_folders,
+            lambda folder_id: self.initialize_delta_token(folder_id=folder_id, on_progress=on_progress),
+        )
+        for folder_id, _, error, elapsed_ms in results:
+            timings_ms[folder_id] = elapsed_ms
+            if error is not None:
+                errors.append(f"{folder_id}: {error}")
+                continue
+            ready.append(folder_id)
+        return {
+            "folder_ids": ordered_folders,
+            "ready": ready,
+            "errors": errors,
+            "timings_ms": timings_ms,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000.0, 1),
+        }
 
     def sync_delta_for_folders(self, folder_ids, fallback_top=10, primary_folder_id="inbox"):
         ordered_folders = self._ordered_folder_ids(folder_ids, primary_folder_id=primary_folder_id)
@@ -100,13 +228,19 @@ class MailSyncService:
         all_messages = []
         all_deleted_ids = []
         seen_deleted = set()
+        timings_ms = {}
 
-        for folder_id in ordered_folders:
-            try:
-                messages, deleted_ids = self.sync_delta_once(folder_id=folder_id, fallback_top=fallback_top)
-            except Exception as exc:
-                errors.append(f"{folder_id}: {exc}")
+        started = time.perf_counter()
+        results = self._run_per_folder(
+            ordered_folders,
+            lambda folder_id: self.sync_delta_once(folder_id=folder_id, fallback_top=fallback_top),
+        )
+        for folder_id, result, error, elapsed_ms in results:
+            timings_ms[folder_id] = elapsed_ms
+            if error is not None:
+                errors.append(f"{folder_id}: {error}")
                 continue
+            messages, deleted_ids = result
 
             current_messages = list(messages or [])
             current_deleted = list(deleted_ids or [])
@@ -130,6 +264,8 @@ class MailSyncService:
             "all_messages": all_messages,
             "all_deleted_ids": all_deleted_ids,
             "errors": errors,
+            "timings_ms": timings_ms,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000.0, 1),
         }
 
 
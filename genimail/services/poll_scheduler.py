@@ -0,0 +1,129 @@
+import time
+
+from genimail.constants import (
+    POLL_ACTIVITY_DELAY_SEC,
+    POLL_BACKGROUND_FACTOR,
+    POLL_FOLDER_INTERVAL_SEC,
+    POLL_IDLE_BACKOFF_FACTOR,
+    POLL_IDLE_BACKOFF_MAX_FACTOR,
+    POLL_INBOX_INTERVAL_SEC,
+    POLL_LOW_TRAFFIC_INTERVAL_SEC,
+)
+
+LOW_TRAFFIC_FOLDER_KEYS = frozenset({"archive", "deleteditems", "junkemail"})
+
+
+def base_interval_for_folder(folder_key):
+    """Return the resting poll interval (seconds) for a well-known folder key."""
+    key = (folder_key or "").strip().lower()
+    if key == "inbox":
+        return POLL_INBOX_INTERVAL_SEC
+    if key in LOW_TRAFFIC_FOLDER_KEYS:
+        return POLL_LOW_TRAFFIC_INTERVAL_SEC
+    return POLL_FOLDER_INTERVAL_SEC
+
+
+class PollScheduler:
+    """Decides which folders are due for a delta poll.
+
+    Every folder has a resting interval.  A poll that finds nothing stretches
+    that folder's interval by ``backoff_factor`` (up to ``max_backoff_factor``
+    times the resting value); a poll with changes snaps it back.  While the
+    window is in the background all intervals are multiplied by
+    ``background_factor``.  ``boost`` pulls folders forward after a send or
+    user activity.  The scheduler is not thread-safe; the UI thread owns it.
+    """
+
+    def __init__(
+        self,
+        backoff_factor=POLL_IDLE_BACKOFF_FACTOR,
+        max_backoff_factor=POLL_IDLE_BACKOFF_MAX_FACTOR,
+        background_factor=POLL_BACKGROUND_FACTOR,
+        activity_delay_sec=POLL_ACTIVITY_DELAY_SEC,
+        clock=time.monotonic,
+    ):
+        self.backoff_factor = max(1.0, float(backoff_factor or 1.0))
+        self.max_backoff_factor = max(1.0, float(max_backoff_factor or 1.0))
+        self.background_factor = max(1.0, float(background_factor or 1.0))
+        self.activity_delay_sec = max(0.0, float(activity_delay_sec or 0.0))
+        self._clock = clock
+        self._folders = {}
+        self.background = False
+
+    def set_folders(self, base_intervals):
+        """Track exactly the folders in ``{folder_id: resting_interval_sec}``.
+
+        New folders are due immediately; folders already tracked keep their
+        backoff state unless their resting interval changed.
+        """
+        now = self._clock()
+        folders = {}
+        for folder_id, base_sec in (base_intervals or {}).items():
+            if not folder_id:
+                continue
+            base_sec = max(1.0, float(base_sec or 1.0))
+            state = self._folders.get(folder_id)
+            if state is None or state["base"] != base_sec:
+                state = {"base": base_sec, "interval": base_sec, "due_at": now}
+            folders[folder_id] = state
+        self._folders = folders
+
+    def folder_ids(self):
+        return list(self._folders)
+
+    def set_background(self, background):
+        """Slow every folder down while the window is minimized."""
+        self.background = bool(background)
+
+    def _effective_interval(self, state):
+        factor = self.background_factor if self.background else 1.0
+        return state["interval"] * factor
+
+    def due_folders(self):
+        now = self._clock()
+        due = []
+        for folder_id, state in self._folders.items():
+            if state["due_at"] <= now:
+                # The poll about to run covers any boost requested so far.
+                state.pop("boost_due_at", None)
+                due.append(folder_id)
+        return due
+
+    def seconds_until_next(self):
+        """Seconds until the next folder is due (0 when one already is), or ``None``."""
+        if not self._folders:
+            return None
+        now = self._clock()
+        return max(0.0, min(state["due_at"] for state in self._folders.values()) - now)
+
+    def record_result(self, folder_id, changed):
+        """Reschedule ``folder_id`` after a poll; ``changed`` means it had updates."""
+        state = self._folders.get(folder_id)
+        if state is None:
+            return
+        if changed:
+            state["interval"] = state["base"]
+        else:
+            ceiling = state["base"] * self.max_backoff_factor
+            state["interval"] = min(ceiling, state["interval"] * self.backoff_factor)
+        state["due_at"] = self._clock() + self._effective_interval(state)
+        # A boost that arrived while this poll was in flight still stands.
+        boost_due_at = state.pop("boost_due_at", None)
+        if boost_due_at is not None:
+            state["due_at"] = min(state["due_at"], boost_due_at)
+
+    def boost(self, folder_ids=None):
+        """Reset ``folder_ids`` (default: all) to their resting interval and poll them soon."""
+        due_at = self._clock() + self.activity_delay_sec
+        targets = self._folders if folder_ids is None else folder_ids
+        for folder_id in targets:
+            state = self._folders.get(folder_id)
+            if state is None:
+                continue
+            state["interval"] = state["base"]
+            state["due_at"] = min(state["due_at"], due_at)
+            state["boost_due_at"] = due_at
+
+    def intervals(self):
+        """Current effective interval per folder, for diagnostics."""
+        return {folder_id: self._effective_interval(state) for folder_id, state in self._folders.items()}
@@ -0,0 +1,181 @@
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from genimail.constants import CHANGE_NOTIFICATION_HOST, CHANGE_NOTIFICATION_MAX_BODY_BYTES
+
+_FOLDER_IN_RESOURCE = re.compile(r"mailFolders(?:\('([^']+)'\)|/([^/?]+))", re.IGNORECASE)
+
+
+class SyncTrigger:
+    """Source of "this folder changed" events that complement timer polling.
+
+    ``start(on_folder_changed)`` begins delivery; the callback receives a
+    folder id (or well-known folder key) and may run on any thread.
+    ``stop`` ends delivery.  Subclasses report changes through ``_notify``.
+    """
+
+    def __init__(self):
+        self._on_folder_changed = None
+
+    def start(self, on_folder_changed):
+        self._on_folder_changed = on_folder_changed
+
+    def stop(self):
+        self._on_folder_changed = None
+
+    def close(self):
+        self.stop()
+
+    def _notify(self, folder_id):
+        callback = self._on_folder_changed
+        if callback is not None and folder_id:
+            callback(folder_id)
+
+
+class _NotificationHandler(BaseHTTPRequestHandler):
+    server_version = "GenimailNotify/1.0"
+
+    def do_POST(self):
+        receiver = self.server.receiver
+        query = parse_qs(urlparse(self.path).query)
+        validation_token = (query.get("validationToken") or [""])[0]
+        if validation_token:
+            # Graph's subscription handshake: echo the token back as plain text.
+            self._reply(200, validation_token.encode("utf-8"), "text/plain; charset=utf-8")
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0 or length > receiver.max_body_bytes:
+            receiver.rejected += 1
+            self._reply(413)
+            return
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            receiver.rejected += 1
+            self._reply(400)
+            return
+
+        folder_ids = receiver.folders_for_payload(payload)
+        # Graph expects an answer within seconds, so acknowledge before syncing.
+        self._reply(202)
+        for folder_id in folder_ids:
+            receiver._notify(folder_id)
+
+    def _reply(self, status, body=b"", content_type=None):
+        self.send_response(status)
+        if content_type:
+            self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def log_message(self, _format, *_args):
+        pass
+
+
+class ChangeNotificationReceiver(SyncTrigger):
+    """Local HTTP endpoint that accepts Graph-style change notifications.
+
+    Each POST carries ``{"value": [notification, ...]}``.  A notification is
+    mapped to a folder through its ``subscriptionId`` (see
+    ``register_subscription``) or, failing that, a ``mailFolders`` segment in
+    its ``resource``.  Notifications whose ``clientState`` does not match are
+    dropped.  Every changed folder is reported once per request.
+
+    Graph only delivers to public HTTPS URLs, so in practice a relay or tunnel
+    forwards to this endpoint; it binds to loopback by default.
+    """
+
+    def __init__(
+        self,
+        host=CHANGE_NOTIFICATION_HOST,
+        port=0,
+        client_state=None,
+        subscriptions=None,
+        max_body_bytes=CHANGE_NOTIFICATION_MAX_BODY_BYTES,
+    ):
+        super().__init__()
+        self.host = host
+        self.port = int(port or 0)
+        self.client_state = client_state or None
+        self.max_body_bytes = max(1, int(max_body_bytes or 1))
+        self._subscriptions = {}
+        for subscription_id, folder_id in (subscriptions or {}).items():
+            self.register_subscription(subscription_id, folder_id)
+        self._server = None
+        self._thread = None
+        self.received = 0
+        self.rejected = 0
+
+    @property
+    def url(self):
+        if self._server is None:
+            return None
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def register_subscription(self, subscription_id, folder_id):
+        if subscription_id and folder_id:
+            self._subscriptions[str(subscription_id)] = str(folder_id)
+
+    def start(self, on_folder_changed):
+        super().start(on_folder_changed)
+        if self._server is not None:
+            return
+        server = ThreadingHTTPServer((self.host, self.port), _NotificationHandler)
+        server.daemon_threads = True
+        server.receiver = self
+        self._server = server
+        self._thread = threading.Thread(
+            target=server.serve_forever,
+            name="genimail-change-notifications",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self):
+        super().stop()
+        server, self._server = self._server, None
+        thread, self._thread = self._thread, None
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+        if thread is not None:
+            thread.join(timeout=2)
+
+    def folders_for_payload(self, payload):
+        """Return the unique folders named by a notification payload, in order."""
+        items = payload.get("value") if isinstance(payload, dict) else None
+        if not isinstance(items, list):
+            self.rejected += 1
+            return []
+        folder_ids = []
+        for notification in items:
+            if not isinstance(notification, dict):
+                continue
+            if self.client_state is not None and notification.get("clientState") != self.client_state:
+                self.rejected += 1
+                continue
+            self.received += 1
+            folder_id = self._folder_for_notification(notification)
+            if folder_id and folder_id not in folder_ids:
+                folder_ids.append(folder_id)
+        return folder_ids
+
+    def _folder_for_notification(self, notification):
+        folder_id = self._subscriptions.get(str(notification.get("subscriptionId") or ""))
+        if folder_id:
+            return folder_id
+        match = _FOLDER_IN_RESOURCE.search(str(notification.get("resource") or ""))
+        if match:
+            return match.group(1) or match.group(2)
+        return None
+
@@ -1,4 +1,3 @@
-import base64
 import os
 
 from PySide6.QtWidgets import (
@@ -106,18 +105,13 @@ class ComposeDialog(QDialog):
         subject = self.subject_input.text().strip()
         body = self.body_input.toPlainText()
 
+        # Files are read by the send worker, so large attachments never sit in memory here.
         attachments = []
         for path in self._attachments:
             try:
-                with open(path, "rb") as handle:
-                    encoded = base64.b64encode(handle.read()).decode("utf-8")
-                attachments.append(
-                    {
-                        "@odata.type": "#microsoft.graph.fileAttachment",
-                        "name": os.path.basename(path),
-                        "contentBytes": encoded,
-                    }
-                )
+                if not os.access(path, os.R_OK):
+                    raise OSError("File is not readable.")
+                attachments.append({"name": os.path.basename(path), "path": path, "size": os.path.getsize(path)})
             except OSError as exc:
                 QMessageBox.warning(self, "Attachment Error", f"Could not read attachment:\n{path}\n\n{exc}")
                 return None
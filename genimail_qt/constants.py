@@ -68,6 +68,7 @@ SEARCH_HISTORY_CONFIG_KEY = "search_history"
 EMAIL_LIST_DENSITY_CONFIG_KEY = "email_list_density"
 EMAIL_LIST_DENSITY_COMPACT = "compact"
 EMAIL_LIST_DENSITY_COMFORTABLE = "comfortable"
+EMAIL_LIST_PREVIEW_MAX_CHARS = 200
 
 __all__ = [
     "ATTACHMENT_THUMBNAIL_HEIGHT_PX",
@@ -84,6 +85,7 @@ __all__ = [
     "EMAIL_LIST_DENSITY_COMPACT",
     "EMAIL_LIST_DENSITY_COMFORTABLE",
     "EMAIL_LIST_DENSITY_CONFIG_KEY",
+    "EMAIL_LIST_PREVIEW_MAX_CHARS",
     "JS_CONSOLE_DEBUG_ENV",
     "JS_NOISE_PATTERNS",
     "LOCAL_JS_SOURCE_PREFIXES",
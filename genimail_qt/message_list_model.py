@@ -0,0 +1,231 @@
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt, Signal
+from PySide6.QtWidgets import QListView
+
+from genimail.constants import SEARCH_HIGHLIGHT_END, SEARCH_HIGHLIGHT_START
+from genimail.domain.helpers import format_date
+from genimail_qt.constants import EMAIL_LIST_PREVIEW_MAX_CHARS
+
+MessageRole = Qt.UserRole
+MessageIdRole = Qt.UserRole + 1
+ReceivedRole = Qt.UserRole + 2
+SenderRole = Qt.UserRole + 3
+SubjectRole = Qt.UserRole + 4
+PreviewRole = Qt.UserRole + 5
+UnreadRole = Qt.UserRole + 6
+DomainsRole = Qt.UserRole + 7
+SubjectHighlightRole = Qt.UserRole + 8
+PreviewHighlightRole = Qt.UserRole + 9
+
+
+def summarize_preview(text, max_chars=90):
+    compact = " ".join((text or "").split())
+    if not compact:
+        return "No preview available"
+    if len(compact) <= max_chars:
+        return compact
+    return compact[: max_chars - 3].rstrip() + "..."
+
+
+def strip_highlights(text):
+    return (text or "").replace(SEARCH_HIGHLIGHT_START, "").replace(SEARCH_HIGHLIGHT_END, "")
+
+
+def _participant_domains(msg):
+    domains = []
+    addresses = [(msg.get("from", {}).get("emailAddress", {}).get("address") or "")]
+    for field in ("toRecipients", "ccRecipients"):
+        for entry in msg.get(field) or []:
+            addresses.append((entry or {}).get("emailAddress", {}).get("address") or "")
+    for address in addresses:
+        address = address.strip().lower()
+        if "@" not in address:
+            continue
+        domain = address.split("@", 1)[1]
+        if domain not in domains:
+            domains.append(domain)
+    return tuple(domains)
+
+
+class MessageRecord:
+    """Display fields for one message row, formatted once when the row is stored.
+
+    Local search hits carry ``_searchSubject``/``_searchSnippet`` from the
+    cache; the row then previews the matching passage instead of the body
+    preview, and the ``*_highlight`` fields keep the match markers for the
+    delegate.  Rows without a match leave them ``None``.
+    """
+
+    __slots__ = (
+        "message_id",
+        "received",
+        "sender",
+        "subject",
+        "preview",
+        "subject_highlight",
+        "preview_highlight",
+        "unread",
+        "domains",
+        "message",
+    )
+
+    def __init__(self, msg):
+        self.message = msg
+        self.message_id = msg.get("id")
+        self.received = format_date(msg.get("receivedDateTime", ""))
+        self.sender = msg.get("from", {}).get("emailAddress", {}).get("name") or "Unknown"
+        self.subject = msg.get("subject") or "(No subject)"
+        self.subject_highlight = msg.get("_searchSubject") or None
+        snippet = msg.get("_searchSnippet")
+        if snippet:
+            self.preview_highlight = summarize_preview(snippet, max_chars=EMAIL_LIST_PREVIEW_MAX_CHARS)
+            self.preview = strip_highlights(self.preview_highlight)
+        else:
+            self.preview_highlight = None
+            self.preview = summarize_preview(msg.get("bodyPreview", ""), max_chars=EMAIL_LIST_PREVIEW_MAX_CHARS)
+        self.unread = not msg.get("isRead", True)
+        self.domains = _participant_domains(msg)
+
+
+class MessageListModel(QAbstractListModel):
+    """List model over message records; edits are reported as row-level signals."""
+
+    _ROLE_FIELDS = {
+        MessageIdRole: "message_id",
+        ReceivedRole: "received",
+        SenderRole: "sender",
+        SubjectRole: "subject",
+        PreviewRole: "preview",
+        SubjectHighlightRole: "subject_highlight",
+        PreviewHighlightRole: "preview_highlight",
+        UnreadRole: "unread",
+        DomainsRole: "domains",
+    }
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._records = []
+        self._rows_by_id = None
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._records)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._records):
+            return None
+        record = self._records[index.row()]
+        if role == MessageRole:
+            return record.message
+        if role == Qt.DisplayRole:
+            return record.subject
+        field = self._ROLE_FIELDS.get(role)
+        return getattr(record, field) if field else None
+
+    def message_at(self, row):
+        if not 0 <= row < len(self._records):
+            return None
+        return self._records[row].message
+
+    def messages(self):
+        return [record.message for record in self._records]
+
+    def set_messages(self, messages):
+        self.beginResetModel()
+        self._records = [MessageRecord(msg) for msg in messages]
+        self._rows_by_id = None
+        self.endResetModel()
+
+    def clear(self):
+        self.set_messages([])
+
+    def append_messages(self, messages):
+        if not messages:
+            return
+        first = len(self._records)
+        self.beginInsertRows(QModelIndex(), first, first + len(messages) - 1)
+        self._records.extend(MessageRecord(msg) for msg in messages)
+        self._rows_by_id = None
+        self.endInsertRows()
+
+    def apply_updates(self, updates, deleted_ids=(), newer_than=None):
+        """Remove ``deleted_ids``, refresh known rows in place and prepend new ones.
+
+        New messages are inserted at the top one at a time, so a batch ends up
+        in reverse arrival order, matching how the list has always shown polls.
+        When only the first pages of a folder are loaded, pass the oldest
+        loaded ``receivedDateTime`` as ``newer_than``: unknown messages that
+        are not newer belong to a page not yet fetched and are skipped.
+        """
+        deleted = {msg_id for msg_id in deleted_ids or () if msg_id}
+        if deleted:
+            rows = sorted((row for msg_id, row in self._row_index().items() if msg_id in deleted), reverse=True)
+            for row in rows:
+                self.beginRemoveRows(QModelIndex(), row, row)
+                del self._records[row]
+                self.endRemoveRows()
+            if rows:
+                self._rows_by_id = None
+
+        rows_by_id = dict(self._row_index())
+        inserted = 0
+        for msg in updates or ():
+            msg_id = msg.get("id")
+            if not msg_id:
+                continue
+            row = rows_by_id.get(msg_id)
+            if row is None:
+                if newer_than is not None and (msg.get("receivedDateTime") or "") <= newer_than:
+                    continue
+                self.beginInsertRows(QModelIndex(), 0, 0)
+                self._records.insert(0, MessageRecord(msg))
+                self.endInsertRows()
+                # Earlier rows shift down by one; new ids live at negative offsets.
+                inserted += 1
+                rows_by_id[msg_id] = -inserted
+                continue
+            row += inserted
+            self._records[row] = MessageRecord(msg)
+            index = self.index(row, 0)
+            self.dataChanged.emit(index, index)
+        if inserted:
+            self._rows_by_id = None
+
+    def _row_index(self):
+        if self._rows_by_id is None:
+            self._rows_by_id = {
+                record.message_id: row for row, record in enumerate(self._records) if record.message_id
+            }
+        return self._rows_by_id
+
+
+class MessageListView(QListView):
+    """Message list view with the row-oriented conveniences of QListWidget."""
+
+    currentRowChanged = Signal(int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setModel(MessageListModel(self))
+        # Row height is fixed per density mode, so skip per-row size queries.
+        self.setUniformItemSizes(True)
+        self.selectionModel().currentRowChanged.connect(
+            lambda current, _previous: self.currentRowChanged.emit(current.row())
+        )
+        # A reset drops the current index without notifying selection listeners.
+        self.model().modelReset.connect(lambda: self.currentRowChanged.emit(-1))
+
+    def count(self):
+        return self.model().rowCount()
+
+    def currentRow(self):
+        return self.currentIndex().row()
+
+    def setCurrentRow(self, row):
+        self.setCurrentIndex(self.model().index(row, 0))
+
+    def message_at(self, row):
+        return self.model().message_at(row)
+
+    def clear(self):
+        self.model().clear()
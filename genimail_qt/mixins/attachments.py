@@ -1,10 +1,11 @@
-import base64
 import os
-from functools import partial
+import shutil
 
 from PySide6.QtCore import Qt
 from PySide6.QtWidgets import QFileDialog, QMessageBox, QPushButton
 
+from genimail.constants import BYTES_PER_KB
+from genimail.infra.blob_store import hash_file
 from genimail.infra.document_store import open_document_file
 from genimail.paths import PDF_DIR
 
@@ -38,18 +39,72 @@ class EmailAttachmentMixin:
         message_id = (self.current_message or {}).get("id")
         if not message_id or not attachment_id:
             return
-        self._set_status("Downloading attachment...")
+        self._set_status("Opening attachment...")
         self.workers.submit(
-            lambda: self._download_attachment_bytes(message_id, attachment_id),
+            lambda: self._fetch_attachment_file(message_id, attachment_id, attachment.get("name")),
             self._on_open_attachment_ready,
         )
 
-    def _download_attachment_bytes(self, message_id, attachment_id):
-        attachment = self.graph.download_attachment(message_id, attachment_id)
-        encoded = attachment.get("contentBytes")
-        if not encoded:
-            raise RuntimeError("Attachment payload did not include content bytes.")
-        return base64.b64decode(encoded), attachment.get("name") or "attachment.bin"
+    def _fetch_attachment_blob(self, message_id, attachment_id, filename=None):
+        """Return ``(blob_path, filename)``, downloading only when the blob store misses."""
+        filename = filename or "attachment.bin"
+        blob_path = None
+        try:
+            blob_path = self.attachment_blobs.path_for(self.cache.get_attachment_blob_hash(attachment_id))
+        except Exception as exc:
+            print(f"[CACHE] attachment blob lookup failed {attachment_id}: {exc}")
+        if blob_path is not None:
+            return blob_path, filename
+        incoming_path = self.attachment_blobs.incoming_path()
+        try:
+            self.graph.download_attachment_to(
+                message_id,
+                attachment_id,
+                incoming_path,
+                on_progress=lambda written, total: self.attachment_download_progress.emit(filename, written, total),
+            )
+        except Exception:
+            self.attachment_blobs.discard_incoming(incoming_path)
+            raise
+        blob_hash = self.attachment_blobs.put_file(incoming_path)
+        try:
+            self.cache.set_attachment_blob_hash(attachment_id, blob_hash)
+        except Exception as exc:
+            print(f"[CACHE] unable to record attachment blob {attachment_id}: {exc}")
+        return self.attachment_blobs.path_for(blob_hash), filename
+
+    def _fetch_attachment_file(self, message_id, attachment_id, filename=None, target_path=None):
+        """Worker side of open/save: fetch the blob and copy it out, returning the final path.
+
+        Hashing and copying large files happens here rather than on the UI
+        thread.  Without ``target_path`` the copy lands in ``PDF_DIR``.
+        """
+        blob_path, filename = self._fetch_attachment_blob(message_id, attachment_id, filename)
+        if target_path is None:
+            return self._materialize_attachment(blob_path, filename)
+        shutil.copyfile(blob_path, target_path)
+        return target_path
+
+    def _on_attachment_download_progress(self, filename, written, total):
+        if total:
+            percent = min(100, int(written * 100 / total))
+            self._set_status(f"Downloading {filename}... {percent}%")
+        else:
+            self._set_status(f"Downloading {filename}... {written // BYTES_PER_KB:,} KB")
+
+    def _materialize_attachment(self, blob_path, filename):
+        """Expose a blob under its real name in ``PDF_DIR``, reusing an identical earlier copy."""
+        os.makedirs(PDF_DIR, exist_ok=True)
+        existing = os.path.join(PDF_DIR, os.path.basename(filename or "attachment.bin"))
+        try:
+            same_size = os.path.getsize(existing) == os.path.getsize(blob_path)
+            if same_size and hash_file(existing) == os.path.basename(blob_path):
+                return existing
+        except OSError:
+            pass
+        target_path = self._unique_output_path(PDF_DIR, filename)
+        shutil.copyfile(blob_path, target_path)
+        return target_path
 
     def _open_selected_attachment(self):
         attachment = self._selected_attachment()
@@ -59,18 +114,13 @@ class EmailAttachmentMixin:
         message_id = (self.current_message or {}).get("id")
         if not message_id:
             return
-        self._set_status("Downloading attachment...")
+        self._set_status("Opening attachment...")
         self.workers.submit(
-            lambda: self._download_attachment_bytes(message_id, attachment.get("id")),
+            lambda: self._fetch_attachment_file(message_id, attachment.get("id"), attachment.get("name")),
             self._on_open_attachment_ready,
         )
 
-    def _on_open_attachment_ready(self, payload):
-        payload_bytes, filename = payload
-        os.makedirs(PDF_DIR, exist_ok=True)
-        target_path = self._unique_output_path(PDF_DIR, filename)
-        with open(target_path, "wb") as handle:
-            handle.write(payload_bytes)
+    def _on_open_attachment_ready(self, target_path):
         lower = target_path.lower()
         if lower.endswith(".pdf"):
             self._open_pdf_file(target_path, activate=True)
@@ -125,14 +175,13 @@ class EmailAttachmentMixin:
             return
         self._set_status("Saving attachment...")
         self.workers.submit(
-            lambda: self._download_attachment_bytes(message_id, attachment.get("id")),
-            partial(self._on_save_attachment_ready, target_path=target_path),
+            lambda: self._fetch_attachment_file(
+                message_id, attachment.get("id"), attachment.get("name"), target_path=target_path
+            ),
+            self._on_save_attachment_ready,
         )
 
-    def _on_save_attachment_ready(self, payload, target_path):
-        payload_bytes, _ = payload
-        with open(target_path, "wb") as handle:
-            handle.write(payload_bytes)
+    def _on_save_attachment_ready(self, target_path):
         self._set_status(f"Saved attachment: {os.path.basename(target_path)}")
 
 
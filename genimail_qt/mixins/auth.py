@@ -2,10 +2,20 @@ import os
 
 from PySide6.QtWidgets import QMessageBox
 
-from genimail.constants import APP_NAME, DEFAULT_CLIENT_ID, EMAIL_DELTA_FALLBACK_TOP
+from genimail.constants import (
+    APP_NAME,
+    DEFAULT_CLIENT_ID,
+    EMAIL_DELTA_FALLBACK_TOP,
+    POLL_INBOX_INTERVAL_SEC,
+    POLL_INTERVAL_MS,
+    POLL_MIN_TIMER_MS,
+)
 from genimail.domain.helpers import token_cache_path_for_client_id
 from genimail.infra.graph_client import GraphClient
+from genimail.services.body_prefetch import BodyPrefetcher
 from genimail.services.mail_sync import MailSyncService, collect_new_unread
+from genimail.services.poll_scheduler import base_interval_for_folder
+from genimail.services.sync_triggers import ChangeNotificationReceiver
 
 
 class AuthPollMixin:
@@ -44,6 +54,57 @@ class AuthPollMixin:
         add(self.current_folder_id)
         return ordered
 
+    def _poll_base_intervals(self):
+        """Resting poll interval per sync folder; the visible folder polls like the inbox."""
+        keys_by_id = {}
+        for source in self.company_folder_sources or []:
+            folder_id = (source or {}).get("id") or (source or {}).get("key")
+            if folder_id:
+                keys_by_id[folder_id] = source.get("key")
+        inbox_id = self._resolve_inbox_id()
+        intervals = {}
+        for folder_id in self._collect_sync_folder_ids():
+            key = "inbox" if folder_id == inbox_id else keys_by_id.get(folder_id, folder_id)
+            interval = base_interval_for_folder(key)
+            if folder_id == self.current_folder_id:
+                interval = min(interval, POLL_INBOX_INTERVAL_SEC)
+            intervals[folder_id] = interval
+        return intervals
+
+    def _schedule_next_poll(self):
+        scheduler = getattr(self, "poll_scheduler", None)
+        if scheduler is None or not getattr(self, "sync_service", None) or self._poll_in_flight:
+            return
+        delay_sec = scheduler.seconds_until_next()
+        delay_ms = POLL_INTERVAL_MS if delay_sec is None else max(POLL_MIN_TIMER_MS, int(delay_sec * 1000))
+        self._poll_timer.start(delay_ms)
+
+    def _boost_polling(self, folder_keys=None):
+        """Poll the given folders (well-known keys or ids; default: all) soon."""
+        scheduler = getattr(self, "poll_scheduler", None)
+        if scheduler is None:
+            return
+        folder_ids = None if folder_keys is None else self._poll_folder_ids(folder_keys)
+        scheduler.boost(folder_ids)
+        self._schedule_next_poll()
+
+    def _poll_folder_ids(self, folder_keys):
+        """Map well-known folder keys to the ids the poll scheduler tracks."""
+        ids_by_key = {
+            ((source or {}).get("key") or "").lower(): source.get("id") or source.get("key")
+            for source in self.company_folder_sources or []
+        }
+        ids_by_key["inbox"] = self._resolve_inbox_id()
+        return [ids_by_key.get((key or "").lower(), key) for key in folder_keys if key]
+
+    def _set_poll_background(self, background):
+        scheduler = getattr(self, "poll_scheduler", None)
+        if scheduler is None:
+            return
+        scheduler.set_background(background)
+        if not background:
+            self._boost_polling(["inbox", self.current_folder_id])
+
     def _auto_connect_on_startup(self):
         if self.graph is not None:
             return
@@ -74,13 +135,15 @@ class AuthPollMixin:
                     os.remove(cache_path)
                 except OSError:
                     pass
+        self._close_background_services()
         self.graph = None
-        self.sync_service = None
         self.current_messages = []
         self.filtered_messages = []
         self.message_cache.clear()
         self.attachment_cache.clear()
         self.known_ids.clear()
+        self._message_page_cursor = None
+        self._message_page_search = None
         self._reset_company_state(clear_cache=True)
         self.current_message = None
         self.message_list.clear()
@@ -114,7 +177,10 @@ class AuthPollMixin:
 
     def _on_authenticated(self, result):
         self.graph = result["graph"]
+        self._close_background_services()
         self.sync_service = MailSyncService(self.graph, self.cache)
+        self.body_prefetcher = BodyPrefetcher(self.graph, self.cache, cache_writer=self._cache_sink())
+        self._start_sync_trigger()
         profile = result.get("profile") or {}
         self.current_user_email = profile.get("mail") or profile.get("userPrincipalName") or ""
         self.connect_btn.setEnabled(True)
@@ -125,6 +191,45 @@ class AuthPollMixin:
         self._migrate_full_cache_sync()
         self._start_polling()
 
+    def _close_background_services(self):
+        for attr in ("sync_trigger", "sync_service", "body_prefetcher"):
+            service = getattr(self, attr, None)
+            setattr(self, attr, None)
+            close_service = getattr(service, "close", None)
+            if callable(close_service):
+                close_service()
+
+    def _start_sync_trigger(self):
+        """Start the change-notification receiver when a port is configured."""
+        try:
+            port = int(self.config.get("change_notifications_port") or 0)
+        except (TypeError, ValueError):
+            port = 0
+        if port <= 0:
+            return
+        subscriptions = self.config.get("change_notifications_subscriptions") or {}
+        trigger = ChangeNotificationReceiver(
+            port=port,
+            client_state=(self.config.get("change_notifications_client_state") or "").strip() or None,
+            subscriptions=subscriptions if isinstance(subscriptions, dict) else {},
+        )
+        try:
+            trigger.start(self.folder_change_notified.emit)
+        except OSError as exc:
+            print(f"[NOTIFY] unable to listen on port {port}: {exc}")
+            return
+        self.sync_trigger = trigger
+
+    def _on_folder_change_notified(self, folder_id):
+        # The timer stays the fallback; a notification only pulls its folder forward.
+        scheduler = getattr(self, "poll_scheduler", None)
+        if scheduler is not None:
+            tracked = set(scheduler.folder_ids())
+            for resolved_id in self._poll_folder_ids([folder_id]):
+                if resolved_id not in tracked:
+                    print(f"[NOTIFY] ignoring change for unpolled folder: {folder_id}")
+        self._boost_polling([folder_id])
+
     def _migrate_full_cache_sync(self):
         """One-time migration: clear delta links so the next delta init
         re-downloads all messages into the SQLite cache.
@@ -158,8 +263,19 @@ class AuthPollMixin:
         return self.sync_service.initialize_delta_tokens(
             folder_ids=self._collect_sync_folder_ids(),
             primary_folder_id=self._resolve_inbox_id(),
+            on_progress=self.delta_sync_progress.emit,
         )
 
+    def _sync_folder_label(self, folder_id):
+        for source in self.company_folder_sources or []:
+            if (source or {}).get("id") == folder_id or (source or {}).get("key") == folder_id:
+                return source.get("label") or source.get("key") or folder_id
+        return "Inbox" if folder_id == "inbox" else folder_id
+
+    def _on_delta_sync_progress(self, folder_id, pages, message_count):
+        label = self._sync_folder_label(folder_id)
+        self._set_status(f"Syncing {label}: page {pages}, {message_count:,} message(s) downloaded...")
+
     def _on_delta_token_ready(self, payload):
         if not isinstance(payload, dict):
             self._set_status("Connected. Delta sync ready.")
@@ -187,19 +303,28 @@ class AuthPollMixin:
             return
         if self._poll_in_flight:
             return
+        scheduler = self.poll_scheduler
+        scheduler.set_folders(self._poll_base_intervals())
+        due_folders = scheduler.due_folders()
+        if not due_folders:
+            self._schedule_next_poll()
+            return
         generation = getattr(self, "_poll_generation", 0)
         self._poll_in_flight = True
+        self._poll_due_folders = due_folders
         self.workers.submit(
-            lambda: self._poll_worker(generation),
+            lambda: self._poll_worker(generation, due_folders),
             self._on_poll_result,
             lambda trace_text, poll_generation=generation: self._on_poll_error(trace_text, poll_generation),
         )
 
-    def _poll_worker(self, poll_generation):
+    def _poll_worker(self, poll_generation, folder_ids=None):
+        folder_ids = list(folder_ids or self._collect_sync_folder_ids())
+        inbox_id = self._resolve_inbox_id()
         payload = self.sync_service.sync_delta_for_folders(
-            folder_ids=self._collect_sync_folder_ids(),
+            folder_ids=folder_ids,
             fallback_top=EMAIL_DELTA_FALLBACK_TOP,
-            primary_folder_id=self._resolve_inbox_id(),
+            primary_folder_id=inbox_id if inbox_id in folder_ids else folder_ids[0],
         )
         if isinstance(payload, dict):
             payload["_poll_generation"] = poll_generation
@@ -216,9 +341,16 @@ class AuthPollMixin:
                 return
             if payload.get("_poll_generation") != getattr(self, "_poll_generation", 0):
                 return
+            self._record_poll_results(payload)
 
             all_updates = payload.get("all_messages") or []
             all_deleted_ids = payload.get("all_deleted_ids") or []
+            invalidate_company_cache = getattr(self, "_invalidate_company_cache", None)
+            if invalidate_company_cache is not None:
+                invalidate_company_cache(all_updates, all_deleted_ids)
+            refresh_company_tab_counts = getattr(self, "_refresh_company_tab_counts", None)
+            if refresh_company_tab_counts is not None and (all_updates or all_deleted_ids):
+                refresh_company_tab_counts()
             updates_by_folder = payload.get("updates_by_folder") or {}
             deleted_by_folder = payload.get("deleted_by_folder") or {}
             errors = payload.get("errors") or []
@@ -244,29 +376,17 @@ class AuthPollMixin:
             active_updates = updates_by_folder.get(self.current_folder_id, [])
             active_deletes = deleted_by_folder.get(self.current_folder_id, [])
 
-            if active_deletes:
-                deleted_set = set(active_deletes)
-                self.current_messages = [msg for msg in self.current_messages if msg.get("id") not in deleted_set]
-                for msg_id in deleted_set:
-                    self.message_cache.pop(msg_id, None)
-                    self.attachment_cache.pop(msg_id, None)
+            for msg_id in set(active_deletes):
+                self.message_cache.pop(msg_id, None)
+                self.attachment_cache.pop(msg_id, None)
 
             if active_updates or active_deletes:
-                index_by_id = {msg.get("id"): idx for idx, msg in enumerate(self.current_messages) if msg.get("id")}
-                for msg in active_updates:
-                    msg_id = msg.get("id")
-                    if not msg_id:
-                        continue
-                    idx = index_by_id.get(msg_id)
-                    if idx is None:
-                        self.current_messages.insert(0, msg)
-                    else:
-                        self.current_messages[idx] = msg
-                self._render_message_list()
+                self._apply_message_list_updates(active_updates, active_deletes)
                 if self.message_list.count() == 0:
                     self._show_message_list()
                     self._clear_detail_view("No messages in this folder.")
                 self._ensure_detail_message_visible()
+                self._schedule_body_prefetch()
 
             if new_unread:
                 self._set_status(f"{len(new_unread)} new unread message(s)")
@@ -276,6 +396,17 @@ class AuthPollMixin:
             self._prune_known_ids()
         finally:
             self._poll_in_flight = False
+            self._schedule_next_poll()
+
+    def _record_poll_results(self, payload):
+        scheduler = getattr(self, "poll_scheduler", None)
+        if scheduler is None:
+            return
+        updates_by_folder = payload.get("updates_by_folder") or {}
+        deleted_by_folder = payload.get("deleted_by_folder") or {}
+        for folder_id in payload.get("folder_ids") or []:
+            changed = bool(updates_by_folder.get(folder_id) or deleted_by_folder.get(folder_id))
+            scheduler.record_result(folder_id, changed)
 
     def _prune_known_ids(self, max_size=5000):
         """Prevent known_ids from growing without bound.
@@ -294,6 +425,11 @@ class AuthPollMixin:
         if poll_generation is not None and poll_generation != getattr(self, "_poll_generation", 0):
             return
         self._poll_in_flight = False
+        scheduler = getattr(self, "poll_scheduler", None)
+        if scheduler is not None:
+            for folder_id in getattr(self, "_poll_due_folders", None) or []:
+                scheduler.record_result(folder_id, False)
+        self._schedule_next_poll()
         self._set_status("Sync warning. Retrying...")
         print(trace_text)
 
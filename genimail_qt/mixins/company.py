@@ -208,6 +208,39 @@ class CompanyMixin:
             self.company_tab_buttons[entry["domain"]] = btn
 
         self.company_tabs_layout.addStretch(1)
+        self._refresh_company_tab_counts()
+
+    def _refresh_company_tab_counts(self):
+        """Show cached message and unread counts on the company tabs.
+
+        Counts come from the cache's per-company aggregate in one query, so the
+        cost does not grow with the number of loaded messages.  Only domain
+        tabs have aggregates; email and free-text tabs keep their plain label.
+        """
+        buttons = getattr(self, "company_tab_buttons", None) or {}
+        cache = getattr(self, "cache", None)
+        if not buttons or cache is None or not hasattr(cache, "get_company_counts"):
+            return
+        domains = [domain for domain in buttons if domain and self._parse_company_query(domain)[0] == "domain"]
+        folder_ids = [source.get("id") for source in getattr(self, "company_folder_sources", None) or []]
+        try:
+            counts = cache.get_company_counts(domains, folder_ids=[folder_id for folder_id in folder_ids if folder_id])
+        except Exception as exc:
+            print(f"[CACHE] company counts unavailable: {exc}")
+            return
+        self.company_counts = counts
+        for entry in getattr(self, "company_entries_visible", None) or []:
+            btn = buttons.get(entry["domain"])
+            if btn is None:
+                continue
+            stats = counts.get(entry["domain"])
+            if not stats:
+                btn.setText(entry["label"])
+                btn.setToolTip("")
+                continue
+            unread = stats["unread"]
+            btn.setText(f"{entry['label']} ({unread})" if unread else entry["label"])
+            btn.setToolTip(f"{stats['total']} cached message(s), {unread} unread")
 
     def _rebuild_company_folder_filter_chips(self):
         if not hasattr(self, "company_folder_filter_layout"):
@@ -440,8 +473,54 @@ class CompanyMixin:
             return "domain", normalized
         return "text", normalized
 
+    @staticmethod
+    def _message_participants(msg):
+        """Yield ``(address, name)`` for the sender and to/cc recipients, lowercased."""
+        sender = msg.get("from", {}).get("emailAddress", {})
+        yield (sender.get("address") or "").strip().lower(), (sender.get("name") or "").strip().lower()
+        for field in ("toRecipients", "ccRecipients"):
+            for entry in msg.get(field) or []:
+                email = (entry or {}).get("emailAddress", {})
+                yield (email.get("address") or "").strip().lower(), (email.get("name") or "").strip().lower()
+
+    @staticmethod
+    def _address_domain(address):
+        _local, at, domain = (address or "").partition("@")
+        return domain if at else ""
+
+    def _company_participant_index(self, messages):
+        """Return ``(ids_by_domain, ids_by_address)`` for a loaded message list.
+
+        The index is kept for the list object it was built from; pages appended
+        to that list are indexed incrementally, so tab counts become set
+        lookups instead of a per-message scan.
+        """
+        index = getattr(self, "_participant_index", None)
+        if index is None or index["source"] is not messages or index["indexed"] > len(messages):
+            index = {"source": messages, "indexed": 0, "by_domain": {}, "by_address": {}}
+            self._participant_index = index
+        by_domain = index["by_domain"]
+        by_address = index["by_address"]
+        for msg in messages[index["indexed"] :]:
+            msg_id = msg.get("id")
+            if not msg_id:
+                continue
+            for address, _name in self._message_participants(msg):
+                if not address:
+                    continue
+                by_address.setdefault(address, set()).add(msg_id)
+                domain = self._address_domain(address)
+                if domain:
+                    by_domain.setdefault(domain, set()).add(msg_id)
+        index["indexed"] = len(messages)
+        return by_domain, by_address
+
     def _count_messages_for_query(self, query):
         source = self.company_result_messages if self.company_result_messages else self.current_messages
+        kind, value = self._parse_company_query(query)
+        if value and kind in ("email", "domain"):
+            by_domain, by_address = self._company_participant_index(source)
+            return len((by_address if kind == "email" else by_domain).get(value, ()))
         return sum(1 for msg in source if self._message_matches_company_filter(msg, query))
 
     @classmethod
@@ -449,58 +528,23 @@ class CompanyMixin:
         kind, value = cls._parse_company_query(query)
         if not value:
             return True
-        participants = []
-
-        sender = msg.get("from", {}).get("emailAddress", {})
-        participants.append(
-            (
-                (sender.get("address") or "").strip().lower(),
-                (sender.get("name") or "").strip().lower(),
-            )
-        )
-
-        for field in ("toRecipients", "ccRecipients"):
-            for entry in msg.get(field) or []:
-                email = (entry or {}).get("emailAddress", {})
-                participants.append(
-                    (
-                        (email.get("address") or "").strip().lower(),
-                        (email.get("name") or "").strip().lower(),
-                    )
-                )
-
-        addresses = [address for address, _name in participants if address]
-        names = [name for _address, name in participants if name]
-
         if kind == "email":
-            return any(address == value for address in addresses)
+            return any(address == value for address, _name in cls._message_participants(msg))
         if kind == "domain":
-            for address in addresses:
-                if "@" not in address:
-                    continue
-                if address.split("@", 1)[1] == value:
-                    return True
-            return False
-        return any(value in address for address in addresses) or any(value in name for name in names)
+            return any(cls._address_domain(address) == value for address, _name in cls._message_participants(msg))
+        return any(
+            (address and value in address) or (name and value in name)
+            for address, name in cls._message_participants(msg)
+        )
 
     def _company_color_for_message(self, msg):
         """Return the company color hex for a message, or None."""
         color_map = getattr(self, "_company_color_map", {})
         if not color_map:
             return None
-        addresses = []
-        sender = (msg.get("from", {}).get("emailAddress", {}).get("address") or "").strip().lower()
-        if sender:
-            addresses.append(sender)
-        for field in ("toRecipients", "ccRecipients"):
-            for entry in msg.get(field) or []:
-                addr = ((entry or {}).get("emailAddress", {}).get("address") or "").strip().lower()
-                if addr:
-                    addresses.append(addr)
-        for address in addresses:
-            if "@" not in address:
-                continue
-            color = color_map.get(address.split("@", 1)[1])
+        for address, _name in self._message_participants(msg):
+            domain = self._address_domain(address)
+            color = color_map.get(domain) if domain else None
             if color:
                 return color
         return None
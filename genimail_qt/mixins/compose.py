@@ -78,6 +78,7 @@ class ComposeMixin:
 
     def _on_send_completed(self, dialog):
         self._set_status("Email sent")
+        self._boost_polling(["sentitems", "inbox"])
         QMessageBox.information(self, "Sent", "Email sent successfully.")
         dialog.accept()
 
@@ -8,9 +8,9 @@ that ``EmailListMixin`` (and other mixins) initialise on the window.
 import time
 
 from genimail.constants import (
-    EMAIL_COMPANY_CACHE_TTL_SEC,
     EMAIL_COMPANY_FETCH_PER_FOLDER,
-    EMAIL_COMPANY_MEMORY_CACHE_MAX,
+    EMAIL_COMPANY_SYNC_SLACK_SEC,
+    EMAIL_COMPANY_SYNC_STALE_SEC,
 )
 
 
@@ -35,24 +35,32 @@ class CompanySearchMixin:
             self._apply_company_folder_filter()
             self._set_status(f'Loaded {len(self.filtered_messages)} cached message(s) for "{query_key}".')
 
-        cached = self.company_query_cache.get(query_key)
-        now = time.time()
-        if cached and not showing_cache:
+        stale_sources = CompanySearchMixin._stale_company_sources(self)
+        if stale_sources == []:
+            # Delta sync has every source folder current, so SQLite is the answer.
+            if not showing_cache:
+                self.company_result_messages = []
+                self.company_folder_filter = self.company_folder_filter or "all"
+                self._show_message_list()
+                self._apply_company_folder_filter()
+            self._set_status(f'Loaded {len(self.filtered_messages)} message(s) for "{query_key}" from the synced cache.')
+            return
+
+        cached, cached_fresh = self.company_query_cache.lookup(CompanySearchMixin._company_cache_key(self, query_key))
+        if cached is not None and not showing_cache:
             cached_messages = list(cached.get("messages") or [])
             self.company_result_messages = cached_messages
             self.company_folder_filter = self.company_folder_filter or "all"
             self._apply_company_folder_filter()
 
-            cache_age = now - float(cached.get("fetched_at") or 0)
-            if cache_age <= EMAIL_COMPANY_CACHE_TTL_SEC:
+            if cached_fresh:
                 self._set_status(
                     f'Loaded {len(self.filtered_messages)} cached message(s) for "{query_key}".'
                 )
                 return
             self._set_status(f"Refreshing {query_key} across folders...")
-        elif cached and showing_cache:
-            cache_age = now - float(cached.get("fetched_at") or 0)
-            if cache_age <= EMAIL_COMPANY_CACHE_TTL_SEC:
+        elif cached is not None and showing_cache:
+            if cached_fresh:
                 return
             self._set_status(f"Refreshing {query_key} across folders...")
         elif showing_cache:
@@ -66,12 +74,14 @@ class CompanySearchMixin:
         self.company_query_inflight.add(query_key)
         self._company_load_token = getattr(self, "_company_load_token", 0) + 1
         load_token = self._company_load_token
-        if not cached and not showing_cache:
+        if cached is None and not showing_cache:
             self._show_message_list()
             self._set_messages([])
             self._clear_detail_view(f'Loading messages for "{query_key}"...')
         self.workers.submit(
-            lambda q=query_key, token=load_token: self._company_messages_worker(q, token),
+            lambda q=query_key, token=load_token, folders=stale_sources: self._company_messages_worker(
+                q, token, sources=folders
+            ),
             self._on_company_messages_loaded,
             lambda trace_text, q=query_key: self._on_company_messages_error(q, trace_text),
         )
@@ -80,11 +90,11 @@ class CompanySearchMixin:
     # Company: background workers
     # ------------------------------------------------------------------
 
-    def _company_messages_worker(self, company_query, token=None):
+    def _company_messages_worker(self, company_query, token=None, sources=None):
         deduped = {}
         errors = []
         fallback_count = 0
-        sources = list(self.company_folder_sources or [])
+        sources = list(sources or self.company_folder_sources or [])
         if not sources:
             sources = [{"id": self.current_folder_id, "key": self._folder_key_for_id(self.current_folder_id), "label": "Current"}]
 
@@ -98,6 +108,7 @@ class CompanySearchMixin:
                 page, _ = self.graph.get_messages(
                     folder_id=folder_id,
                     top=EMAIL_COMPANY_FETCH_PER_FOLDER,
+                    projection="company",
                     search=search_hint,
                     filter_str=filter_hint,
                 )
@@ -106,6 +117,7 @@ class CompanySearchMixin:
                     page, _ = self.graph.get_messages(
                         folder_id=folder_id,
                         top=EMAIL_COMPANY_FETCH_PER_FOLDER,
+                        projection="company",
                     )
                     fallback_count += 1
                 except Exception as exc:
@@ -114,7 +126,7 @@ class CompanySearchMixin:
 
             if page and hasattr(self, "cache") and hasattr(self.cache, "save_messages"):
                 try:
-                    self.cache.save_messages(page, folder_id)
+                    self._cache_sink().save_messages(page, folder_id)
                 except Exception as exc:
                     print(f"[CACHE] unable to save company page for {folder_label}: {exc}")
 
@@ -133,6 +145,8 @@ class CompanySearchMixin:
                 errors.append(f"{folder_label}: {exc}")
 
         messages = sorted(deduped.values(), key=lambda msg: msg.get("receivedDateTime", ""), reverse=True)
+        # _on_company_messages_loaded re-reads SQLite, so the pages must be committed first.
+        self._flush_cache_writes()
         return {"query": company_query, "messages": messages, "errors": errors, "fallback_count": fallback_count, "fetched_at": time.time(), "token": token}
 
     def _load_company_messages_from_cache(self, company_query, search_text=None):
@@ -188,6 +202,17 @@ class CompanySearchMixin:
 
         self.company_folder_filter = self.company_folder_filter or "all"
         self._show_message_list()
+        stale_sources = CompanySearchMixin._stale_company_sources(self)
+        if stale_sources == []:
+            self._company_search_override = {
+                "query": query_key,
+                "search_text": search_key,
+                "messages": CompanySearchMixin._load_company_messages_from_cache(self, query_key, search_key),
+                "fetched_at": time.time(),
+            }
+            self._apply_company_folder_filter()
+            self._set_status(f'Found {len(self.filtered_messages)} message(s) for "{query_key}" in the synced cache.')
+            return
         self._apply_company_folder_filter()
         local_count = len(self.filtered_messages)
 
@@ -202,18 +227,20 @@ class CompanySearchMixin:
         else:
             self._set_status(f'Searching "{search_key}" in "{query_key}"...')
         self.workers.submit(
-            lambda q=query_key, text=search_key, token=load_token: self._company_search_worker(q, text, token),
+            lambda q=query_key, text=search_key, token=load_token, folders=stale_sources: self._company_search_worker(
+                q, text, token, sources=folders
+            ),
             self._on_company_search_loaded,
             lambda trace_text, q=query_key, text=search_key, token=load_token: self._on_company_search_error(
                 q, text, token, trace_text
             ),
         )
 
-    def _company_search_worker(self, company_query, search_text, token):
+    def _company_search_worker(self, company_query, search_text, token, sources=None):
         deduped = {}
         errors = []
         fallback_count = 0
-        sources = list(self.company_folder_sources or [])
+        sources = list(sources or self.company_folder_sources or [])
         if not sources:
             sources = [{"id": self.current_folder_id, "key": self._folder_key_for_id(self.current_folder_id), "label": "Current"}]
 
@@ -226,6 +253,7 @@ class CompanySearchMixin:
                 page, _ = self.graph.get_messages(
                     folder_id=folder_id,
                     top=EMAIL_COMPANY_FETCH_PER_FOLDER,
+                    projection="company",
                     search=combined_search,
                 )
             except Exception:
@@ -233,6 +261,7 @@ class CompanySearchMixin:
                     page, _ = self.graph.get_messages(
                         folder_id=folder_id,
                         top=EMAIL_COMPANY_FETCH_PER_FOLDER,
+                        projection="company",
                     )
                     fallback_count += 1
                 except Exception as exc:
@@ -241,7 +270,7 @@ class CompanySearchMixin:
 
             if page and hasattr(self, "cache") and hasattr(self.cache, "save_messages"):
                 try:
-                    self.cache.save_messages(page, folder_id)
+                    self._cache_sink().save_messages(page, folder_id)
                 except Exception as exc:
                     print(f"[CACHE] unable to save company search page for {folder_label}: {exc}")
 
@@ -350,15 +379,17 @@ class CompanySearchMixin:
         # subset that the Graph API $search returned.
         refreshed = CompanySearchMixin._load_company_messages_from_cache(self, query)
         self.company_result_messages = refreshed if refreshed else (payload.get("messages") or [])
-        self.company_query_cache[query] = {
+        self.company_query_cache[CompanySearchMixin._company_cache_key(self, query)] = {
             "messages": list(self.company_result_messages),
             "errors": list(payload.get("errors") or []),
             "fetched_at": float(payload.get("fetched_at") or time.time()),
         }
-        self._evict_company_cache()
         self._company_search_override = None
         self.company_folder_filter = self.company_folder_filter or "all"
         self._apply_company_folder_filter()
+        refresh_company_tab_counts = getattr(self, "_refresh_company_tab_counts", None)
+        if refresh_company_tab_counts is not None:
+            refresh_company_tab_counts()
 
         errors = payload.get("errors") or []
         fallback_count = payload.get("fallback_count") or 0
@@ -385,15 +416,71 @@ class CompanySearchMixin:
     # Company: helpers
     # ------------------------------------------------------------------
 
-    def _evict_company_cache(self):
-        """Remove oldest entries when cache exceeds max size."""
-        cache = self.company_query_cache
-        if len(cache) <= EMAIL_COMPANY_MEMORY_CACHE_MAX:
-            return
-        by_age = sorted(cache.items(), key=lambda kv: float(kv[1].get("fetched_at") or 0))
-        while len(cache) > EMAIL_COMPANY_MEMORY_CACHE_MAX and by_age:
-            oldest_key, _ = by_age.pop(0)
-            cache.pop(oldest_key, None)
+    def _stale_company_sources(self):
+        """Return the company folder sources that need a Graph refresh.
+
+        In cache-authoritative mode a source is fresh when its last delta round
+        completed within the poll scheduler's current interval for that folder
+        plus ``EMAIL_COMPANY_SYNC_SLACK_SEC``, i.e. the poller has not missed
+        its slot.  Folders the scheduler does not track fall back to
+        ``EMAIL_COMPANY_SYNC_STALE_SEC``.  An empty list means SQLite already
+        holds everything.  Returns ``None`` when freshness is
+        unknown (mode off, or no sync state), in which case every source is
+        refreshed.
+        """
+        config = getattr(self, "config", None)
+        if config is None or not config.get("company_cache_authoritative", True):
+            return None
+        cache = getattr(self, "cache", None)
+        if cache is None or not hasattr(cache, "get_last_sync_times"):
+            return None
+        sources = list(getattr(self, "company_folder_sources", None) or [])
+        if not sources:
+            return None
+        try:
+            synced = cache.get_last_sync_times([source.get("id") for source in sources])
+        except Exception as exc:
+            print(f"[CACHE] sync state unavailable: {exc}")
+            return None
+        scheduler = getattr(self, "poll_scheduler", None)
+        intervals = scheduler.intervals() if scheduler is not None else {}
+        now = time.time()
+        stale = []
+        for source in sources:
+            folder_id = source.get("id")
+            max_age = intervals.get(folder_id, EMAIL_COMPANY_SYNC_STALE_SEC) + EMAIL_COMPANY_SYNC_SLACK_SEC
+            if synced.get(folder_id, 0) < now - max_age:
+                stale.append(source)
+        return stale
+
+    def _company_cache_key(self, query):
+        """Key results by query and by the folder sources they were gathered from."""
+        folder_ids = frozenset(
+            (source.get("id") or "").strip().lower()
+            for source in getattr(self, "company_folder_sources", None) or []
+            if (source.get("id") or "").strip()
+        )
+        return (query or "").strip().lower(), folder_ids
+
+    def _invalidate_company_cache(self, messages=None, deleted_ids=None):
+        """Drop cached company results that new or deleted mail makes out of date.
+
+        Called with each poll's delta results: an entry goes when one of the
+        new messages matches its company query or when it holds a message that
+        was deleted.
+        """
+        messages = [msg for msg in messages or [] if isinstance(msg, dict)]
+        deleted = {msg_id for msg_id in deleted_ids or [] if msg_id}
+        if not messages and not deleted:
+            return 0
+
+        def is_outdated(key, entry):
+            query = key[0]
+            if any(self._message_matches_company_filter(msg, query) for msg in messages):
+                return True
+            return bool(deleted) and any(msg.get("id") in deleted for msg in entry.get("messages") or [])
+
+        return self.company_query_cache.invalidate(is_outdated)
 
     def _company_query_hints(self, query):
         kind, value = self._parse_company_query(query)
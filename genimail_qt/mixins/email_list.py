@@ -3,7 +3,15 @@ from PySide6.QtGui import QColor, QFont, QFontMetrics, QPen
 from PySide6.QtWidgets import QLabel, QListWidgetItem, QMessageBox, QPushButton, QStyledItemDelegate, QStyle
 
 from genimail.browser.navigation import ensure_light_preview_html, wrap_plain_text_as_html
-from genimail.constants import EMAIL_COMPANY_FETCH_PER_FOLDER, EMAIL_LIST_FETCH_TOP, SEARCH_HISTORY_MAX_ITEMS
+from genimail.constants import (
+    EMAIL_COMPANY_FETCH_PER_FOLDER,
+    EMAIL_LIST_FETCH_TOP,
+    BODY_PREFETCH_MAX_MESSAGES,
+    EMAIL_LIST_PAGE_SIZE,
+    SEARCH_HIGHLIGHT_END,
+    SEARCH_HIGHLIGHT_START,
+    SEARCH_HISTORY_MAX_ITEMS,
+)
 from genimail.domain.helpers import format_date, format_size, strip_html
 from genimail_qt.constants import (
     ATTACHMENT_THUMBNAIL_MAX_INITIAL,
@@ -14,6 +22,16 @@ from genimail_qt.constants import (
     EMAIL_LIST_DENSITY_CONFIG_KEY,
     SEARCH_HISTORY_CONFIG_KEY,
 )
+from genimail_qt.message_list_model import (
+    DomainsRole,
+    PreviewHighlightRole,
+    PreviewRole,
+    ReceivedRole,
+    SenderRole,
+    SubjectHighlightRole,
+    SubjectRole,
+    UnreadRole,
+)
 from genimail_qt.webview_utils import (
     is_inline_attachment,
     normalize_cid_value,
@@ -38,6 +56,22 @@ def _normalize_density_mode(value):
     return _DENSITY_COMPACT if mode == _DENSITY_COMPACT else _DENSITY_COMFORTABLE
 
 
+def _highlight_segments(text):
+    """Split marked search text into ``(segment, is_match)`` pairs."""
+    segments = []
+    matched = False
+    start = 0
+    for pos, char in enumerate(text or ""):
+        if char in (SEARCH_HIGHLIGHT_START, SEARCH_HIGHLIGHT_END):
+            if pos > start:
+                segments.append((text[start:pos], matched))
+            matched = char == SEARCH_HIGHLIGHT_START
+            start = pos + 1
+    if start < len(text or ""):
+        segments.append((text[start:], matched))
+    return segments
+
+
 class CompanyColorDelegate(QStyledItemDelegate):
     """Custom delegate with density-aware rendering for the message list."""
 
@@ -57,22 +91,11 @@ class CompanyColorDelegate(QStyledItemDelegate):
         self._density_mode = _normalize_density_mode(mode)
 
     @staticmethod
-    def _company_color_for_msg(msg, color_map):
+    def _company_color_for_domains(domains, color_map):
         if not color_map:
             return None
-        addresses = []
-        sender = (msg.get("from", {}).get("emailAddress", {}).get("address") or "").strip().lower()
-        if sender:
-            addresses.append(sender)
-        for field in ("toRecipients", "ccRecipients"):
-            for entry in msg.get(field) or []:
-                addr = ((entry or {}).get("emailAddress", {}).get("address") or "").strip().lower()
-                if addr:
-                    addresses.append(addr)
-        for address in addresses:
-            if "@" not in address:
-                continue
-            color = color_map.get(address.split("@", 1)[1])
+        for domain in domains or ():
+            color = color_map.get(domain)
             if color:
                 return color
         return None
@@ -131,14 +154,35 @@ class CompanyColorDelegate(QStyledItemDelegate):
         preview_rect = QRect(preview_x, line2_y, preview_w, line2_h)
         return date_rect, sender_rect, subject_rect, preview_rect, fm_date
 
+    @staticmethod
+    def _draw_highlighted_text(painter, rect, text, font, color, match_color):
+        """Draw marked search text left to right with matches in bold, eliding at the edge."""
+        match_font = QFont(font)
+        match_font.setBold(True)
+        x = rect.left()
+        right = rect.right() + 1
+        for segment, matched in _highlight_segments(text):
+            available = right - x
+            if available <= 0:
+                break
+            segment_font = match_font if matched else font
+            metrics = QFontMetrics(segment_font)
+            width = metrics.horizontalAdvance(segment)
+            if width > available:
+                segment = metrics.elidedText(segment, Qt.ElideRight, available)
+                width = available
+            painter.setFont(segment_font)
+            painter.setPen(match_color if matched else color)
+            painter.drawText(QRect(x, rect.top(), width, rect.height()), Qt.AlignLeft | Qt.AlignVCenter, segment)
+            x += width
+
     def paint(self, painter, option, index):
         painter.save()
         dark_mode = self._is_dark_mode
 
         # -- background (selection / alternate) --
         is_selected = bool(option.state & QStyle.State_Selected)
-        msg = index.data(Qt.UserRole) or {}
-        company_color = self._company_color_for_msg(msg, self._color_map) if isinstance(msg, dict) else None
+        company_color = self._company_color_for_domains(index.data(DomainsRole), self._color_map)
         selection_color = QColor("#3A302A" if dark_mode else "#F4D1C7")
         alternate_color = QColor("#1E1B16" if dark_mode else "#FAF8F5")
 
@@ -158,14 +202,14 @@ class CompanyColorDelegate(QStyledItemDelegate):
                 QColor(company_color),
             )
 
-        # -- parse payload --
-        is_unread = isinstance(msg, dict) and not msg.get("isRead", True)
-        fields = index.data(Qt.DisplayRole) or ""
-        parts = fields.split("\x1f") if "\x1f" in fields else [fields]
-        date_text = parts[0] if len(parts) > 0 else ""
-        sender_text = parts[1] if len(parts) > 1 else ""
-        subject_text = parts[2] if len(parts) > 2 else ""
-        preview_text = parts[3] if len(parts) > 3 else ""
+        # -- row fields --
+        is_unread = bool(index.data(UnreadRole))
+        date_text = index.data(ReceivedRole) or ""
+        sender_text = index.data(SenderRole) or ""
+        subject_text = index.data(SubjectRole) or ""
+        preview_text = index.data(PreviewRole) or ""
+        subject_highlight = index.data(SubjectHighlightRole)
+        preview_highlight = index.data(PreviewHighlightRole)
         row_rect = option.rect.adjusted(_STRIPE_W + _PAD_LEFT, 0, -_PAD_RIGHT, 0)
         if row_rect.width() <= 8:
             painter.restore()
@@ -184,6 +228,7 @@ class CompanyColorDelegate(QStyledItemDelegate):
         date_color = QColor("#A0A3B5" if dark_mode else "#A0A3B5")
         subject_color = QColor("#E8E4DE" if dark_mode else "#3D405B")
         preview_color = QColor("#A0A3B5" if dark_mode else "#6B6E8A")
+        match_color = QColor("#E07A5F")
 
         if self._density_mode == _DENSITY_COMPACT:
             sender_font = self._font(base_font, 13, bold=True)
@@ -192,8 +237,10 @@ class CompanyColorDelegate(QStyledItemDelegate):
 
             date_rect, sender_rect, body_rect, fm_date = self._compute_compact_geometry(row_rect, date_text, date_font)
             body_text = subject_text
+            marked_body = subject_highlight or subject_text
             if preview_text and preview_text != "No preview available":
                 body_text = f"{subject_text} · {preview_text}"
+                marked_body = f"{marked_body} · {preview_highlight or preview_text}"
 
             painter.setFont(sender_font)
             painter.setPen(sender_color)
@@ -209,7 +256,9 @@ class CompanyColorDelegate(QStyledItemDelegate):
                 Qt.AlignRight | Qt.AlignVCenter,
                 fm_date.elidedText(date_text, Qt.ElideRight, date_rect.width()),
             )
-            if body_rect.width() > 12:
+            if body_rect.width() > 12 and (subject_highlight or preview_highlight):
+                self._draw_highlighted_text(painter, body_rect, marked_body, body_font, subject_color, match_color)
+            elif body_rect.width() > 12:
                 painter.setFont(body_font)
                 painter.setPen(subject_color)
                 painter.drawText(
@@ -241,14 +290,23 @@ class CompanyColorDelegate(QStyledItemDelegate):
                 Qt.AlignRight | Qt.AlignVCenter,
                 fm_date.elidedText(date_text, Qt.ElideRight, date_rect.width()),
             )
-            painter.setFont(subject_font)
-            painter.setPen(subject_color)
-            painter.drawText(
-                subject_rect,
-                Qt.AlignLeft | Qt.AlignVCenter,
-                QFontMetrics(subject_font).elidedText(subject_text, Qt.ElideRight, subject_rect.width()),
-            )
-            if preview_rect.width() > 16:
+            if subject_highlight:
+                self._draw_highlighted_text(
+                    painter, subject_rect, subject_highlight, subject_font, subject_color, match_color
+                )
+            else:
+                painter.setFont(subject_font)
+                painter.setPen(subject_color)
+                painter.drawText(
+                    subject_rect,
+                    Qt.AlignLeft | Qt.AlignVCenter,
+                    QFontMetrics(subject_font).elidedText(subject_text, Qt.ElideRight, subject_rect.width()),
+                )
+            if preview_rect.width() > 16 and preview_highlight:
+                self._draw_highlighted_text(
+                    painter, preview_rect, preview_highlight, preview_font, preview_color, match_color
+                )
+            elif preview_rect.width() > 16:
                 painter.setFont(preview_font)
                 painter.setPen(preview_color)
                 painter.drawText(
@@ -265,24 +323,77 @@ class CompanyColorDelegate(QStyledItemDelegate):
 
 
 class EmailListMixin:
-    def _set_messages(self, messages, *, track_ids=True):
+    def _set_messages(self, messages, *, track_ids=True, page_cursor=None, page_search=None):
         """Single entry point for updating the displayed message list.
 
         All code paths that change the full message list should call this
         instead of writing ``current_messages`` and ``_render_message_list``
         separately.  Keeps ``current_messages``, ``filtered_messages`` and
-        ``known_ids`` in sync.
+        ``known_ids`` in sync.  ``page_cursor`` is the cache cursor for the
+        next page of a lazily loaded folder, or ``None`` when the list is complete;
+        ``page_search`` is the search text when the pages are local search results.
         """
         self.current_messages = list(messages)
+        self._message_page_cursor = page_cursor
+        self._message_page_search = page_search if page_cursor is not None else None
         if track_ids:
             self.known_ids = {msg.get("id") for msg in self.current_messages if msg.get("id")}
         self._render_message_list()
 
+    def _append_messages(self, messages):
+        """Append a further page to the displayed list without re-rendering it."""
+        present = {msg.get("id") for msg in self.current_messages if msg.get("id")}
+        added = [msg for msg in messages if msg.get("id") not in present]
+        if not added:
+            return
+        self.current_messages.extend(added)
+        self.filtered_messages.extend(added)
+        self.known_ids.update(msg.get("id") for msg in added if msg.get("id"))
+        self.message_list.model().append_messages(added)
+
+    def _apply_message_list_updates(self, updates, deleted_ids):
+        """Apply poll results as row removals, in-place changes and top inserts."""
+        model = self.message_list.model()
+        newer_than = None
+        if getattr(self, "_message_page_cursor", None) is not None:
+            # Older pages are still in SQLite; scrolling serves them in order.
+            newer_than = min((msg.get("receivedDateTime") or "" for msg in self.current_messages), default="")
+        model.apply_updates(updates, deleted_ids, newer_than=newer_than)
+        self.current_messages = model.messages()
+        self.filtered_messages = list(self.current_messages)
+
+    def _on_message_list_scrolled(self, value):
+        scrollbar = self.message_list.verticalScrollBar()
+        if scrollbar.maximum() - value > scrollbar.pageStep():
+            return
+        self._load_next_message_page()
+
+    def _load_next_message_page(self):
+        cursor = getattr(self, "_message_page_cursor", None)
+        if cursor is None or self.company_filter_domain:
+            return
+        folder_id = self.current_folder_id
+        search_text = getattr(self, "_message_page_search", None)
+        try:
+            if search_text:
+                messages, next_cursor = self.cache.search_messages_page(
+                    search_text, folder_id=folder_id, limit=EMAIL_LIST_PAGE_SIZE, cursor=cursor
+                )
+            else:
+                messages, next_cursor = self.cache.get_messages_page(folder_id, limit=EMAIL_LIST_PAGE_SIZE, cursor=cursor)
+        except Exception:
+            self._message_page_cursor = None
+            return
+        self._message_page_cursor = next_cursor
+        folder_key = self._folder_key_for_id(folder_id)
+        self._append_messages([self._with_folder_meta(msg, folder_id, folder_key) for msg in messages])
+
     def _load_messages(self):
         if not self.graph:
             QMessageBox.information(self, "Connect First", "Connect to Microsoft before loading messages.")
             return
 
+        self._cancel_body_prefetch()
         if self.company_filter_domain:
             search_text = self.search_input.text().strip() or None
             if search_text:
@@ -293,29 +404,37 @@ class EmailListMixin:
 
         search_text = self.search_input.text().strip() or None
         folder_id = self.current_folder_id
+        # Every caller is a user action (folder pick, search, refresh): poll this folder soon.
+        self._boost_polling([folder_id])
         self._company_search_override = None
         self._message_load_token = getattr(self, "_message_load_token", 0) + 1
         load_token = self._message_load_token
         self._show_message_list()
 
         # Cache-first: show cached messages instantly before network fetch.
+        # Folder views and local search results show the first page only and
+        # pull the rest on scroll.
         has_cached = False
         if search_text:
             self._record_search_history(search_text)
         try:
             if search_text:
-                cached = self.cache.search_messages(search_text, folder_id=folder_id, limit=EMAIL_LIST_FETCH_TOP)
+                cached, cursor = self.cache.search_messages_page(
+                    search_text, folder_id=folder_id, limit=EMAIL_LIST_PAGE_SIZE
+                )
             else:
-                cached = self.cache.get_messages(folder_id, limit=EMAIL_LIST_FETCH_TOP)
+                cached, cursor = self.cache.get_messages_page(folder_id, limit=EMAIL_LIST_PAGE_SIZE)
             if cached:
                 folder_key = self._folder_key_for_id(folder_id)
                 enriched = [self._with_folder_meta(msg, folder_id, folder_key) for msg in cached]
-                self._set_messages(enriched)
+                self._set_messages(enriched, page_cursor=cursor, page_search=search_text)
                 if self.message_list.count() > 0:
                     self.message_list.setCurrentRow(0)
                 has_cached = True
         except Exception:
             pass
+        # With nothing cached, the first Graph page is shown as soon as it lands.
+        self._awaiting_first_page_token = None if has_cached else load_token
 
         if search_text:
             self._set_status("Refreshing..." if has_cached else "Searching online...")
@@ -328,25 +447,64 @@ class EmailListMixin:
 
     def _messages_worker(self, folder_id, search_text, token):
         try:
-            messages, _ = self.graph.get_messages(
-                folder_id=folder_id,
-                top=EMAIL_LIST_FETCH_TOP,
-                search=search_text,
-            )
+            messages = self._collect_message_pages(folder_id, search_text, token)
         except Exception:
             if not search_text:
                 raise
             # Graph search can fail for some folders/tenants. Fall back to local filtering.
-            messages, _ = self.graph.get_messages(folder_id=folder_id, top=EMAIL_LIST_FETCH_TOP)
+            messages = self._collect_message_pages(folder_id, None, token, notify_first_page=False)
             search_lower = search_text.strip().lower()
             messages = [msg for msg in (messages or []) if self._message_matches_search(msg, search_lower)]
-        # Persist results to cache for instant future loads and FTS search.
-        if messages:
+        cursor = None
+        if not search_text:
+            # Render from the refreshed cache a page at a time, as _load_messages does.
+            try:
+                self._flush_cache_writes()
+                messages, cursor = self.cache.get_messages_page(folder_id, limit=EMAIL_LIST_PAGE_SIZE)
+            except Exception:
+                cursor = None
+        return {"token": token, "folder_id": folder_id, "messages": messages or [], "cursor": cursor}
+
+    def _collect_message_pages(self, folder_id, search_text, token, notify_first_page=True):
+        """Pull list-projection pages from Graph, caching each as it arrives.
+
+        The first page of a plain folder view is handed to the UI right away
+        through ``message_page_ready`` so it renders before the rest arrive.
+        """
+        messages = []
+        for page in self.graph.iter_message_pages(
+            folder_id=folder_id,
+            search=search_text,
+            projection="list",
+            max_messages=EMAIL_LIST_FETCH_TOP,
+        ):
+            # Persist results to cache for instant future loads and FTS search.
             try:
-                self.cache.save_messages(messages, folder_id)
+                self._cache_sink().save_messages(page, folder_id)
             except Exception:
                 pass
-        return {"token": token, "folder_id": folder_id, "messages": messages or []}
+            if not messages and notify_first_page and hasattr(self, "message_page_ready"):
+                self.message_page_ready.emit(
+                    {"token": token, "folder_id": folder_id, "messages": list(page), "cursor": None}
+                )
+            messages.extend(page)
+        return messages
+
+    def _on_first_message_page(self, payload):
+        """Show the first Graph page when the cache had nothing to render yet."""
+        token = payload.get("token")
+        if token is None or token != getattr(self, "_awaiting_first_page_token", None):
+            return
+        self._awaiting_first_page_token = None
+        if token != getattr(self, "_message_load_token", None) or self.company_filter_domain:
+            return
+        folder_id = payload.get("folder_id") or self.current_folder_id
+        folder_key = self._folder_key_for_id(folder_id)
+        enriched = [self._with_folder_meta(msg, folder_id, folder_key) for msg in payload.get("messages") or []]
+        self._set_messages(enriched)
+        if self.message_list.count() > 0:
+            self.message_list.setCurrentRow(0)
+        self._set_status(f"Loaded {len(enriched)} messages, fetching more...")
 
     def _on_messages_loaded(self, payload):
         if isinstance(payload, dict):
@@ -355,9 +513,11 @@ class EmailListMixin:
                 return
             folder_id = payload.get("folder_id") or self.current_folder_id
             messages = payload.get("messages") or []
+            cursor = payload.get("cursor")
         else:
             folder_id = self.current_folder_id
             messages = payload or []
+            cursor = None
 
         # If user switched to company mode after this worker was submitted,
         # discard the folder results to avoid stomping the company view.
@@ -368,7 +528,7 @@ class EmailListMixin:
         self.company_result_messages = []
         self._company_search_override = None
         enriched = [self._with_folder_meta(msg, folder_id, folder_key) for msg in messages]
-        self._set_messages(enriched)
+        self._set_messages(enriched, page_cursor=cursor)
         self._refresh_company_sidebar()
         self._set_status(f"Loaded {len(self.filtered_messages)} of {len(self.current_messages)} messages")
         if self.message_list.count() > 0:
@@ -378,6 +538,28 @@ class EmailListMixin:
             self._show_message_list()
             self._clear_detail_view("No messages in this folder.")
         self._ensure_detail_message_visible()
+        self._schedule_body_prefetch()
+
+    # ------------------------------------------------------------------
+    # Body prefetch
+    # ------------------------------------------------------------------
+
+    def _schedule_body_prefetch(self):
+        """Warm cached bodies for the top rows, unread first."""
+        prefetcher = getattr(self, "body_prefetcher", None)
+        if prefetcher is None or self.company_filter_domain:
+            return
+        head = self.filtered_messages[:BODY_PREFETCH_MAX_MESSAGES]
+        ordered = [msg for msg in head if not msg.get("isRead", True)]
+        ordered += [msg for msg in head if msg.get("isRead", True)]
+        prefetcher.prefetch(
+            [msg.get("id") for msg in ordered if msg.get("id") and msg.get("id") not in self.message_cache]
+        )
+
+    def _cancel_body_prefetch(self):
+        prefetcher = getattr(self, "body_prefetcher", None)
+        if prefetcher is not None:
+            prefetcher.cancel()
 
     # ------------------------------------------------------------------
     # Helpers shared with CompanySearchMixin
@@ -501,18 +683,8 @@ class EmailListMixin:
 
     def _render_message_list(self):
         self.filtered_messages = list(self.current_messages)
-        self.message_list.clear()
         self._ensure_company_color_delegate()
-        for msg in self.filtered_messages:
-            sender = msg.get("from", {}).get("emailAddress", {}).get("name") or "Unknown"
-            subject = msg.get("subject") or "(No subject)"
-            received = format_date(msg.get("receivedDateTime", ""))
-            preview = self._summarize_preview(msg.get("bodyPreview", ""), max_chars=200)
-            # Fields separated by \x1f (unit separator) for the delegate to parse
-            line = f"{received}\x1f{sender}\x1f{subject}\x1f{preview}"
-            item = QListWidgetItem(line)
-            item.setData(Qt.UserRole, msg)
-            self.message_list.addItem(item)
+        self.message_list.model().set_messages(self.filtered_messages)
 
     def _ensure_company_color_delegate(self):
         if not hasattr(self, "_company_color_delegate"):
@@ -531,15 +703,15 @@ class EmailListMixin:
         if row < 0:
             self.current_message = None
             return
-        item = self.message_list.item(row)
-        if item is None:
+        msg = self.message_list.message_at(row)
+        if msg is None:
             return
-        self.current_message = item.data(Qt.UserRole) or {}
+        self.current_message = msg
 
-    def _on_message_opened(self, item):
-        if item is None:
+    def _on_message_opened(self, index):
+        if index is None or not index.isValid():
             return
-        self._open_message_row(self.message_list.row(item))
+        self._open_message_row(index.row())
 
     def _on_message_selected(self, row):
         self._open_message_row(row)
@@ -547,55 +719,120 @@ class EmailListMixin:
     def _open_message_row(self, row):
         if row < 0:
             return
-        item = self.message_list.item(row)
-        if item is None:
+        msg = self.message_list.message_at(row)
+        if msg is None:
             return
-        msg = item.data(Qt.UserRole) or {}
         self.current_message = msg
         message_id = msg.get("id")
         if not message_id:
             return
         self.message_header.setText("Loading message...")
         self._show_message_detail()
-        if message_id in self.message_cache:
-            self._render_message_detail(
-                self.message_cache[message_id],
-                self.attachment_cache.get(message_id, []),
-            )
+        detail = self.message_cache.get(message_id)
+        attachments = self.attachment_cache.get(message_id)
+        if detail is not None and attachments is not None:
+            self._render_message_detail(detail, attachments)
+            return
+        cached = self._cached_message_detail(msg)
+        if cached is not None:
+            detail, attachments = cached
+            self.message_cache[message_id] = detail
+            self.attachment_cache[message_id] = attachments
+            self._render_message_detail(detail, attachments)
             return
         self.workers.submit(
             lambda: self._fetch_message_detail(message_id),
             self._on_message_detail_loaded,
         )
 
+    def _cached_message_detail(self, msg):
+        """Build a detail payload from the SQLite body cache, or ``None`` to fetch from Graph."""
+        message_id = msg.get("id")
+        try:
+            body = self.cache.get_message_body(message_id)
+            if not body:
+                return None
+            content = body.get("content") or ""
+            # Inline images need their bytes from Graph; cached metadata has none.
+            if (body.get("contentType") or "").lower() == "html" and "cid:" in content.lower():
+                return None
+            attachments = self.cache.get_attachments(message_id)
+        except Exception:
+            return None
+        detail = dict(msg)
+        detail["body"] = body
+        return detail, attachments
+
+    def _cache_sink(self):
+        """Target for worker-thread cache writes: the write-behind queue when there is one."""
+        return getattr(self, "cache_writer", None) or self.cache
+
+    def _flush_cache_writes(self):
+        """Wait for queued cache writes so the next read sees them."""
+        cache_writer = getattr(self, "cache_writer", None)
+        if cache_writer is not None:
+            cache_writer.flush()
+
+    def _spill_message_detail(self, message_id, detail):
+        """Persist an evicted detail body so reopening it stays off the network."""
+        body = (detail or {}).get("body") or {}
+        if not body.get("content"):
+            return
+        try:
+            if message_id not in self.cache.get_cached_body_ids([message_id]):
+                self._cache_sink().save_message_body(message_id, body.get("contentType", ""), body.get("content", ""))
+        except Exception as exc:
+            print(f"[CACHE] unable to spill message body {message_id}: {exc}")
+
+    def _spill_attachments(self, message_id, attachments):
+        """Persist evicted attachment metadata; inline bytes are refetched on demand."""
+        if not attachments:
+            return
+        try:
+            if not self.cache.get_attachments(message_id):
+                self._cache_sink().save_attachments(message_id, attachments)
+        except Exception as exc:
+            print(f"[CACHE] unable to spill attachments {message_id}: {exc}")
+
     def _hydrate_inline_attachment_bytes(self, message_id, attachments):
-        hydrated = []
+        pending_ids = []
         for attachment in attachments or []:
             file_type = attachment.get("@odata.type") == "#microsoft.graph.fileAttachment"
             inline = bool(attachment.get("isInline"))
             cid = normalize_cid_value(attachment.get("contentId") or attachment.get("contentLocation"))
-            if not (file_type and inline and cid):
-                hydrated.append(attachment)
-                continue
-            if attachment.get("contentBytes"):
-                hydrated.append(attachment)
-                continue
-            attachment_id = attachment.get("id")
-            if not attachment_id:
-                hydrated.append(attachment)
-                continue
+            if file_type and inline and cid and not attachment.get("contentBytes") and attachment.get("id"):
+                pending_ids.append(attachment.get("id"))
+        if not pending_ids:
+            return list(attachments or [])
+
+        downloaded = {}
+        if hasattr(self.graph, "download_attachments"):
+            # One $batch call covers every inline image of the message.
             try:
-                full_attachment = self.graph.download_attachment(message_id, attachment_id)
-                merged = dict(attachment)
-                if full_attachment.get("contentBytes"):
-                    merged["contentBytes"] = full_attachment.get("contentBytes")
-                if full_attachment.get("contentType"):
-                    merged["contentType"] = full_attachment.get("contentType")
-                if full_attachment.get("name"):
-                    merged["name"] = full_attachment.get("name")
-                hydrated.append(merged)
+                downloaded = self.graph.download_attachments(message_id, pending_ids)
             except Exception:
+                downloaded = {}
+        else:
+            for attachment_id in pending_ids:
+                try:
+                    downloaded[attachment_id] = self.graph.download_attachment(message_id, attachment_id)
+                except Exception:
+                    continue
+
+        hydrated = []
+        for attachment in attachments or []:
+            full_attachment = downloaded.get(attachment.get("id"))
+            if not full_attachment:
                 hydrated.append(attachment)
+                continue
+            merged = dict(attachment)
+            if full_attachment.get("contentBytes"):
+                merged["contentBytes"] = full_attachment.get("contentBytes")
+            if full_attachment.get("contentType"):
+                merged["contentType"] = full_attachment.get("contentType")
+            if full_attachment.get("name"):
+                merged["name"] = full_attachment.get("name")
+            hydrated.append(merged)
         return hydrated
 
     def _build_inline_cid_data_urls(self, attachments):
@@ -611,14 +848,18 @@ class EmailListMixin:
         return cid_map
 
     def _fetch_message_detail(self, message_id):
-        detail = self.graph.get_message(message_id)
-        attachments = self.graph.get_attachments(message_id)
+        if hasattr(self.graph, "get_message_with_attachments"):
+            detail, attachments = self.graph.get_message_with_attachments(message_id)
+        else:
+            detail = self.graph.get_message(message_id)
+            attachments = self.graph.get_attachments(message_id)
         attachments = self._hydrate_inline_attachment_bytes(message_id, attachments)
         body = detail.get("body", {})
         content_type = (body.get("contentType") or "").lower()
         content = body.get("content") or ""
-        self.cache.save_message_body(message_id, body.get("contentType", ""), body.get("content", ""))
-        self.cache.save_attachments(message_id, attachments)
+        sink = self._cache_sink()
+        sink.save_message_body(message_id, body.get("contentType", ""), body.get("content", ""))
+        sink.save_attachments(message_id, attachments)
         return {"id": message_id, "detail": detail, "attachments": attachments}
 
     def _on_message_detail_loaded(self, payload):
@@ -742,15 +983,6 @@ class EmailListMixin:
             return name
         return name[: ATTACHMENT_THUMBNAIL_NAME_MAX_CHARS - 3] + "..."
 
-    @staticmethod
-    def _summarize_preview(text, max_chars=90):
-        compact = " ".join((text or "").split())
-        if not compact:
-            return "No preview available"
-        if len(compact) <= max_chars:
-            return compact
-        return compact[: max_chars - 3].rstrip() + "..."
-
     def _ensure_detail_message_visible(self):
         if not hasattr(self, "message_stack"):
             return
@@ -22,6 +22,7 @@ from genimail_qt.constants import (
     EMAIL_LIST_DENSITY_COMFORTABLE,
     EMAIL_LIST_DENSITY_COMPACT,
 )
+from genimail_qt.message_list_model import MessageListView
 
 
 class EmailUiMixin:
@@ -123,7 +124,7 @@ class EmailUiMixin:
         messages_header_row.addWidget(self.email_density_compact_btn)
         messages_header_row.addWidget(self.email_density_comfortable_btn)
         list_layout.addLayout(messages_header_row)
-        self.message_list = QListWidget()
+        self.message_list = MessageListView()
         self.message_list.setObjectName("messageList")
         self.message_list.setAlternatingRowColors(False)
         list_layout.addWidget(self.message_list, 1)
@@ -209,7 +210,8 @@ class EmailUiMixin:
             lambda _checked=False: self._on_email_density_button_clicked(EMAIL_LIST_DENSITY_COMFORTABLE)
         )
         self.message_list.currentRowChanged.connect(self._on_message_row_changed)
-        self.message_list.itemActivated.connect(self._on_message_opened)
+        self.message_list.activated.connect(self._on_message_opened)
+        self.message_list.verticalScrollBar().valueChanged.connect(self._on_message_list_scrolled)
         self.back_to_list_btn.clicked.connect(self._show_message_list)
         self.open_attachment_btn.clicked.connect(self._open_selected_attachment)
         self.save_attachment_btn.clicked.connect(self._save_selected_attachment)
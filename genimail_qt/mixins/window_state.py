@@ -14,18 +14,52 @@ class WindowStateMixin:
             height = max(QT_WINDOW_MIN_HEIGHT, int(fallback_height))
         self.resize(width, height)
 
+    def _start_search_index_rebuild(self):
+        """Fill a missing search index on a worker so startup never waits on it."""
+        cache = getattr(self, "cache", None)
+        if cache is None or not cache.search_index_needs_rebuild():
+            return
+        self._search_rebuild_stopping = False
+        self._set_status("Indexing mail for search...")
+        self.workers.submit(
+            lambda: cache.rebuild_search_index(
+                on_progress=self.search_index_progress.emit,
+                should_stop=lambda: self._search_rebuild_stopping,
+            ),
+            self._on_search_index_rebuilt,
+            self._on_search_index_rebuild_error,
+        )
+
+    def _on_search_index_progress(self, done, total):
+        self._set_status(f"Indexing mail for search... {done}/{total}")
+
+    def _on_search_index_rebuilt(self, done):
+        if not getattr(self, "_search_rebuild_stopping", False):
+            self._set_status(f"Search index ready ({done} messages).")
+
+    def _on_search_index_rebuild_error(self, trace_text):
+        print(f"[CACHE] search index rebuild failed: {trace_text}")
+
     def closeEvent(self, event):
         self._poll_timer.stop()
+        # An unfinished index rebuild resumes on next start.
+        self._search_rebuild_stopping = True
         docs_cleanup = getattr(self, "_docs_cleanup", None)
         if callable(docs_cleanup):
             docs_cleanup()
         if hasattr(self, "thread_pool"):
             self.thread_pool.waitForDone(2000)
+        close_services = getattr(self, "_close_background_services", None)
+        if callable(close_services):
+            close_services()
         graph = getattr(self, "graph", None)
         if graph is not None:
             close_graph = getattr(graph, "close", None)
             if callable(close_graph):
                 close_graph()
+        cache_writer = getattr(self, "cache_writer", None)
+        if cache_writer is not None:
+            cache_writer.close()
         cache = getattr(self, "cache", None)
         if cache is not None:
             close_cache = getattr(cache, "close", None)
@@ -203,7 +203,7 @@ QLabel#toastLabel {
     font-weight: 600;
     font-size: 12px;
 }
-QLineEdit, QTextEdit, QListWidget {
+QLineEdit, QTextEdit, QListWidget, QListView#messageList {
     border: 1px solid #E8E4DE;
     border-radius: 8px;
     background: #ffffff;
@@ -279,7 +279,7 @@ QListWidget#folderList,
 QListWidget#companyList {
     font-size: 14px;
 }
-QListWidget#messageList {
+QListView#messageList {
     font-size: 13px;
 }
 QWidget#folderButtonsWidget {
@@ -304,14 +304,14 @@ QPushButton#folderButton:checked {
     border-color: #E07A5F;
     color: #3D405B;
 }
-QListWidget#messageList::item {
+QListView#messageList::item {
     min-height: 0;
     padding: 0;
 }
-QListWidget#messageList::item:selected {
+QListView#messageList::item:selected {
     background: transparent;
 }
-QListWidget#messageList::item:alternate {
+QListView#messageList::item:alternate {
     background: transparent;
 }
 QListWidget#companyList::item {
@@ -505,7 +505,7 @@ QFrame#toastFrame {
 QLabel#toastLabel {
     color: #f8fafc;
 }
-QLineEdit, QTextEdit, QListWidget {
+QLineEdit, QTextEdit, QListWidget, QListView#messageList {
     border: 1px solid #4A443C;
     background: #1E1B16;
     color: #E8E4DE;
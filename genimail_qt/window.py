@@ -1,9 +1,20 @@
 from PySide6.QtCore import QEvent, QThreadPool, QTimer, Signal
 from PySide6.QtWidgets import QApplication, QMainWindow
 
-from genimail.constants import POLL_INTERVAL_MS, QT_THREAD_POOL_MAX_WORKERS
+from genimail.constants import (
+    ATTACHMENT_CACHE_MAX_BYTES,
+    EMAIL_COMPANY_CACHE_TTL_SEC,
+    EMAIL_COMPANY_MEMORY_CACHE_MAX,
+    MESSAGE_DETAIL_CACHE_MAX_BYTES,
+    POLL_INTERVAL_MS,
+    QT_THREAD_POOL_MAX_WORKERS,
+)
+from genimail.infra.blob_store import AttachmentBlobStore
 from genimail.infra.cache_store import EmailCache
+from genimail.infra.cache_writer import CacheWriteBehind
 from genimail.infra.config_store import Config
+from genimail.infra.memory_cache import SizedLRUCache, TTLLRUCache
+from genimail.services.poll_scheduler import PollScheduler
 from genimail_qt.helpers import Toaster, WorkerManager
 from genimail_qt.mixins import (
     AuthPollMixin,
@@ -40,38 +51,52 @@ class GeniMailQtWindow(
     QMainWindow,
 ):
     auth_code_received = Signal(str)
+    attachment_download_progress = Signal(str, object, object)
+    message_page_ready = Signal(object)
+    delta_sync_progress = Signal(str, object, object)
+    folder_change_notified = Signal(str)
+    search_index_progress = Signal(object, object)
 
     def __init__(self, config=None):
         super().__init__()
         self.config = config or Config()
         self._theme_mode = normalize_theme_mode(self.config.get("theme_mode", THEME_LIGHT))
         self._apply_theme_stylesheet()
-        self.cache = EmailCache()
+        self.cache = EmailCache(defer_search_rebuild=True)
+        self.cache_writer = CacheWriteBehind(self.cache)
         self.graph = None
         self.sync_service = None
+        self.body_prefetcher = None
+        self.sync_trigger = None
         self.current_user_email = ""
         self.current_folder_id = "inbox"
         self.current_messages = []
         self.filtered_messages = []
         self.current_message = None
-        self.message_cache = {}
-        self.attachment_cache = {}
+        self.message_cache = SizedLRUCache(MESSAGE_DETAIL_CACHE_MAX_BYTES, on_evict=self._spill_message_detail)
+        self.attachment_cache = SizedLRUCache(ATTACHMENT_CACHE_MAX_BYTES, on_evict=self._spill_attachments)
+        self.attachment_blobs = AttachmentBlobStore()
         self.known_ids = set()
+        self._message_page_cursor = None
+        self._message_page_search = None
         self.company_filter_domain = None
         self.company_domain_labels = {}
         self.company_result_messages = []
         self.company_folder_filter = "all"
         self.company_folder_sources = []
-        self.company_query_cache = {}
+        self.company_counts = {}
+        self.company_query_cache = TTLLRUCache(EMAIL_COMPANY_MEMORY_CACHE_MAX, EMAIL_COMPANY_CACHE_TTL_SEC)
         self.company_query_inflight = set()
         self._company_load_token = 0
         self._web_page_sources = {}
         self._download_profile_ids = set()
         self._poll_in_flight = False
         self._poll_generation = 0
+        self.poll_scheduler = PollScheduler()
         self.thread_pool = QThreadPool(self)
         self.thread_pool.setMaxThreadCount(QT_THREAD_POOL_MAX_WORKERS)
         self._poll_timer = QTimer(self)
+        self._poll_timer.setSingleShot(True)
         self._poll_timer.setInterval(POLL_INTERVAL_MS)
         self._poll_timer.timeout.connect(self._poll_once)
         self.toaster = Toaster(self, lambda: self._top_bar.height() if hasattr(self, "_top_bar") else 0)
@@ -81,7 +106,13 @@ class GeniMailQtWindow(
         self._sync_theme_toggle_button()
         self._restore_window_geometry()
         self.auth_code_received.connect(self._show_auth_code_dialog)
+        self.attachment_download_progress.connect(self._on_attachment_download_progress)
+        self.message_page_ready.connect(self._on_first_message_page)
+        self.delta_sync_progress.connect(self._on_delta_sync_progress)
+        self.folder_change_notified.connect(self._on_folder_change_notified)
+        self.search_index_progress.connect(self._on_search_index_progress)
         QTimer.singleShot(250, self._auto_connect_on_startup)
+        QTimer.singleShot(250, self._start_search_index_rebuild)
 
     def _apply_theme_stylesheet(self):
         app = QApplication.instance()
@@ -139,6 +170,7 @@ class GeniMailQtWindow(
         if event.type() != QEvent.WindowStateChange:
             return
 
+        self._set_poll_background(self.isMinimized())
         if self.isMinimized():
             if hasattr(self, "_minimize_external_browser"):
                 self._minimize_external_browser()
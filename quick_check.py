@@ -10,6 +10,7 @@ PY_FILES = [
     "pdf_takeoff_tool.py",
     "pdf_viewer.py",
     "scanner_app_v4.py",
+    "bench_cache_store.py",
     "genimail/paths.py",
     "genimail/constants.py",
     "genimail/com_runtime.py",
@@ -23,9 +24,16 @@ PY_FILES = [
     "genimail/domain/quotes.py",
     "genimail/infra/document_store.py",
     "genimail/infra/cache_store.py",
+    "genimail/infra/cache_writer.py",
     "genimail/infra/graph_client.py",
+    "genimail/infra/graph_throttle.py",
     "genimail/infra/config_store.py",
+    "genimail/infra/memory_cache.py",
+    "genimail/infra/blob_store.py",
     "genimail/services/mail_sync.py",
+    "genimail/services/body_prefetch.py",
+    "genimail/services/poll_scheduler.py",
+    "genimail/services/sync_triggers.py",
     "genimail_qt/__init__.py",
     "genimail_qt/constants.py",
     "genimail_qt/helpers/__init__.py",
@@ -38,6 +46,7 @@ PY_FILES = [
     "genimail_qt/company_tab_manager_dialog.py",
     "genimail_qt/webview_utils.py",
     "genimail_qt/webview_page.py",
+    "genimail_qt/message_list_model.py",
     "genimail_qt/pdf_graphics_view.py",
     "genimail_qt/takeoff_engine.py",
     "genimail_qt/window.py",
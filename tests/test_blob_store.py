@@ -0,0 +1,67 @@
+import os
+
+from genimail.infra.blob_store import AttachmentBlobStore, hash_bytes, hash_file
+
+
+def test_put_deduplicates_identical_payloads(tmp_path):
+    store = AttachmentBlobStore(root_dir=str(tmp_path), max_bytes=1024)
+
+    first = store.put(b"plan set")
+    second = store.put(b"plan set")
+
+    assert first == second == hash_bytes(b"plan set")
+    path = store.path_for(first)
+    assert path == os.path.join(str(tmp_path), first[:2], first)
+    assert hash_file(path) == first
+    assert store.total_bytes() == len(b"plan set")
+
+
+def test_path_for_rejects_unknown_or_malformed_hashes(tmp_path):
+    store = AttachmentBlobStore(root_dir=str(tmp_path), max_bytes=1024)
+
+    assert store.path_for(None) is None
+    assert store.path_for("../etc/passwd") is None
+    assert store.path_for(hash_bytes(b"never stored")) is None
+    assert store.has(hash_bytes(b"never stored")) is False
+
+
+def test_put_evicts_least_recently_used_blobs_past_budget(tmp_path):
+    store = AttachmentBlobStore(root_dir=str(tmp_path), max_bytes=10)
+    old = store.put(b"aaaa")
+    recent = store.put(b"bbbb")
+    os.utime(store.path_for(old), (1, 1))
+    os.utime(store.path_for(recent), (2, 2))
+
+    newest = store.put(b"cccc")
+
+    assert store.has(old) is False
+    assert store.has(recent) is True
+    assert store.has(newest) is True
+    assert store.evictions == 1
+    assert store.total_bytes() == 8
+
+
+def test_oversized_blob_is_kept_by_its_own_put(tmp_path):
+    store = AttachmentBlobStore(root_dir=str(tmp_path), max_bytes=4)
+
+    blob_hash = store.put(b"x" * 16)
+
+    assert store.has(blob_hash) is True
+
+
+def test_put_file_consumes_incoming_download_and_deduplicates(tmp_path):
+    store = AttachmentBlobStore(root_dir=str(tmp_path), max_bytes=1024)
+    first_incoming = store.incoming_path()
+    with open(first_incoming, "wb") as handle:
+        handle.write(b"drawing")
+    second_incoming = store.incoming_path()
+    with open(second_incoming, "wb") as handle:
+        handle.write(b"drawing")
+
+    first = store.put_file(first_incoming)
+    second = store.put_file(second_incoming)
+
+    assert first == second == hash_bytes(b"drawing")
+    assert not os.path.exists(first_incoming)
+    assert not os.path.exists(second_incoming)
+    assert store.total_bytes() == len(b"drawing")
@@ -0,0 +1,127 @@
+import threading
+
+from genimail.services.body_prefetch import BodyPrefetcher
+
+
+class DummyCache:
+    def __init__(self, cached_ids=()):
+        self.cached_ids = set(cached_ids)
+        self.bodies = {}
+        self.attachments = {}
+
+    def get_cached_body_ids(self, message_ids):
+        return {message_id for message_id in message_ids if message_id in self.cached_ids}
+
+    def save_message_body(self, message_id, content_type, content):
+        self.bodies[message_id] = (content_type, content)
+
+    def save_attachments(self, message_id, attachments):
+        self.attachments[message_id] = list(attachments)
+
+
+class DummyGraph:
+    def __init__(self, fail_ids=()):
+        self.fail_ids = set(fail_ids)
+        self.calls = []
+
+    def get_message_with_attachments(self, message_id):
+        self.calls.append(message_id)
+        if message_id in self.fail_ids:
+            raise RuntimeError("boom")
+        detail = {"id": message_id, "body": {"contentType": "html", "content": f"<p>{message_id}</p>"}}
+        return detail, [{"id": f"{message_id}-att", "name": "a.pdf"}]
+
+
+class BlockingGraph(DummyGraph):
+    def __init__(self):
+        super().__init__()
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def get_message_with_attachments(self, message_id):
+        self.started.set()
+        self.release.wait(2)
+        return super().get_message_with_attachments(message_id)
+
+
+def _run(prefetcher, message_ids):
+    thread = prefetcher.prefetch(message_ids)
+    if thread is not None:
+        thread.join(2)
+    return thread
+
+
+def test_prefetch_writes_uncached_bodies_through_cache():
+    cache = DummyCache(cached_ids={"m2"})
+    graph = DummyGraph()
+    prefetcher = BodyPrefetcher(graph, cache, max_messages=10, min_interval_sec=0)
+
+    _run(prefetcher, ["m1", "m2", "m3", "m1"])
+
+    assert graph.calls == ["m1", "m3"]
+    assert cache.bodies["m1"] == ("html", "<p>m1</p>")
+    assert cache.attachments["m3"] == [{"id": "m3-att", "name": "a.pdf"}]
+    assert prefetcher.fetched_count == 2
+
+
+def test_prefetch_saves_through_the_cache_writer_when_given():
+    cache = DummyCache()
+    writer = DummyCache()
+    prefetcher = BodyPrefetcher(DummyGraph(), cache, cache_writer=writer, min_interval_sec=0)
+
+    _run(prefetcher, ["m1"])
+
+    assert writer.bodies["m1"] == ("html", "<p>m1</p>")
+    assert writer.attachments["m1"] == [{"id": "m1-att", "name": "a.pdf"}]
+    assert cache.bodies == {} and cache.attachments == {}
+
+
+def test_prefetch_caps_run_at_max_messages():
+    graph = DummyGraph()
+    prefetcher = BodyPrefetcher(graph, DummyCache(), max_messages=2, min_interval_sec=0)
+
+    _run(prefetcher, ["m1", "m2", "m3"])
+
+    assert graph.calls == ["m1", "m2"]
+
+
+def test_prefetch_stops_after_consecutive_failures():
+    graph = DummyGraph(fail_ids={"m1", "m2"})
+    prefetcher = BodyPrefetcher(graph, DummyCache(), min_interval_sec=0, max_consecutive_failures=2)
+
+    _run(prefetcher, ["m1", "m2", "m3"])
+
+    assert graph.calls == ["m1", "m2"]
+    assert prefetcher.failed_count == 2
+
+
+def test_cancel_discards_in_flight_fetch_and_stops_run():
+    cache = DummyCache()
+    graph = BlockingGraph()
+    prefetcher = BodyPrefetcher(graph, cache, min_interval_sec=0)
+
+    thread = prefetcher.prefetch(["m1", "m2"])
+    assert graph.started.wait(2)
+    prefetcher.cancel()
+    graph.release.set()
+    thread.join(2)
+
+    assert not thread.is_alive()
+    assert graph.calls == ["m1"]
+    assert cache.bodies == {}
+
+
+def test_min_interval_spaces_requests_and_is_interruptible():
+    graph = DummyGraph()
+    prefetcher = BodyPrefetcher(graph, DummyCache(), min_interval_sec=30)
+
+    thread = prefetcher.prefetch(["m1", "m2"])
+    for _ in range(200):
+        if graph.calls:
+            break
+        threading.Event().wait(0.01)
+    prefetcher.close()
+    thread.join(2)
+
+    assert not thread.is_alive()
+    assert graph.calls == ["m1"]
@@ -1,3 +1,6 @@
+import pytest
+
+from genimail.constants import SEARCH_HIGHLIGHT_END, SEARCH_HIGHLIGHT_START
 from genimail.infra.cache_store import EmailCache
 
 
@@ -88,6 +91,60 @@ def test_search_messages_respects_limit(tmp_path):
     assert len(results) == 3
 
 
+def test_search_messages_page_walks_ranked_results(tmp_path):
+    cache = EmailCache(db_path=str(tmp_path / "cache.db"))
+    cache.save_messages([_make_msg(f"m{i}", subject=f"Report {i}") for i in range(7)], folder_id="inbox")
+    expected = [msg["id"] for msg in cache.search_messages("report")]
+
+    seen = []
+    page, cursor = cache.search_messages_page("report", folder_id="inbox", limit=3)
+    seen.extend(msg["id"] for msg in page)
+    while cursor is not None:
+        page, cursor = cache.search_messages_page("report", folder_id="inbox", limit=3, cursor=cursor)
+        seen.extend(msg["id"] for msg in page)
+
+    assert seen == expected
+    assert len(seen) == 7
+    assert "_searchSubject" in page[0]
+
+
+def test_search_messages_page_walks_like_fallback(tmp_path):
+    cache = EmailCache(db_path=str(tmp_path / "cache.db"))
+    cache.save_messages([_make_msg(f"m{i}", subject="Report") for i in range(5)], folder_id="inbox")
+    cache._fts5_supported_cache = False
+
+    first, cursor = cache.search_messages_page("report", limit=3)
+    rest, end = cache.search_messages_page("report", limit=3, cursor=cursor)
+
+    assert cursor == 3 and end is None
+    assert len({msg["id"] for msg in first + rest}) == 5
+
+
+@pytest.mark.parametrize("walk_min_matches", [None, 0])
+def test_search_candidates_are_the_newest_received_not_the_last_indexed(tmp_path, monkeypatch, walk_min_matches):
+    from genimail.constants import SEARCH_RANK_CANDIDATES
+    from genimail.infra import cache_store
+
+    if walk_min_matches is not None:
+        monkeypatch.setattr(cache_store, "SEARCH_FOLDER_WALK_MIN_MATCHES", walk_min_matches)
+    cache = EmailCache(db_path=str(tmp_path / "cache.db"))
+    total = SEARCH_RANK_CANDIDATES + 500
+    messages = []
+    for i in range(total):
+        msg = _make_msg(f"m{i:05d}", subject="Report")
+        year = 2004 if i < total - SEARCH_RANK_CANDIDATES else 2002
+        msg["receivedDateTime"] = f"{year}-01-01T00:{i // 60 % 60:02d}:{i % 60:02d}Z"
+        messages.append(msg)
+    # Saved newest first, so the oldest messages get the highest FTS rowids.
+    cache.save_messages(messages, folder_id="inbox")
+
+    results = cache.search_messages("report", limit=50)
+    folder_results = cache.search_messages("report", folder_id="inbox", limit=50)
+
+    assert all(msg["receivedDateTime"].startswith("2004") for msg in results)
+    assert [msg["id"] for msg in folder_results] == [msg["id"] for msg in results]
+
+
 def test_search_messages_empty_text_returns_empty(tmp_path):
     cache = EmailCache(db_path=str(tmp_path / "cache.db"))
     cache.save_messages([_make_msg("m1")], folder_id="inbox")
@@ -110,3 +167,151 @@ def test_search_messages_default_limit_applies_when_unspecified(tmp_path):
 
     results = cache.search_messages("report")
     assert len(results) == EmailCache.DEFAULT_SEARCH_LIMIT
+
+
+def test_search_index_follows_body_updates_and_deletes(tmp_path):
+    cache = EmailCache(db_path=str(tmp_path / "cache.db"))
+    cache.save_messages([_make_msg("m1", subject="Hello")], folder_id="inbox")
+    cache.save_message_body("m1", "text", "drywall estimate")
+    cache.save_message_body("m1", "text", "primer schedule")
+    assert cache.search_messages("drywall") == []
+    assert [msg["id"] for msg in cache.search_messages("primer")] == ["m1"]
+
+    cache.delete_messages(["m1"])
+    assert cache.search_messages("primer") == []
+    conn = cache.conn
+    assert conn.execute("SELECT COUNT(*) FROM message_search_docs").fetchone()[0] == 0
+
+
+def test_search_index_resave_keeps_body_and_replaces_subject(tmp_path):
+    cache = EmailCache(db_path=str(tmp_path / "cache.db"))
+    cache.save_messages([_make_msg("m1", subject="Invoice")], folder_id="inbox")
+    cache.save_message_body("m1", "text", "quarterly revenue")
+    cache.save_messages([_make_msg("m1", subject="Invoice")], folder_id="inbox")
+    cache.save_messages([_make_msg("m1", subject="Estimate")], folder_id="inbox")
+
+    assert cache.search_messages("invoice") == []
+    assert [msg["id"] for msg in cache.search_messages("estimate")] == ["m1"]
+    assert [msg["id"] for msg in cache.search_messages("quarterly")] == ["m1"]
+    conn = cache.conn
+    conn.execute("INSERT INTO message_search_fts(message_search_fts) VALUES('integrity-check')")
+
+
+def test_rebuild_search_index_runs_in_chunks(tmp_path):
+    cache = EmailCache(db_path=str(tmp_path / "cache.db"))
+    cache.save_messages([_make_msg(f"m{i}", subject="Report") for i in range(7)], folder_id="inbox")
+    conn = cache.conn
+    with cache._write_transaction() as write_conn:
+        write_conn.execute("DELETE FROM message_search_docs")
+    assert cache.search_messages("report") == []
+
+    progress = []
+    rebuilt = cache.rebuild_search_index(chunk_size=3, on_progress=lambda done, total: progress.append((done, total)))
+
+    assert rebuilt == 7
+    assert progress == [(3, 7), (6, 7), (7, 7)]
+    assert len(cache.search_messages("report")) == 7
+    assert conn.execute("SELECT COUNT(*) FROM message_search_docs").fetchone()[0] == 7
+
+
+def test_v4_search_table_migrates_to_external_content_index(tmp_path):
+    db_path = str(tmp_path / "cache.db")
+    cache = EmailCache(db_path=db_path)
+    cache.save_messages([_make_msg("m1", subject="Invoice reminder")], folder_id="inbox")
+    conn = cache.conn
+    conn.execute("DROP TABLE message_search_fts")
+    conn.execute("DROP TABLE message_search_docs")
+    conn.execute("CREATE VIRTUAL TABLE message_search_fts USING fts5(message_id UNINDEXED, searchable_text)")
+    conn.execute("DELETE FROM schema_version WHERE version > 4")
+    conn.commit()
+    cache.close()
+
+    migrated = EmailCache(db_path=db_path)
+    assert migrated._current_schema_version(migrated.conn) == EmailCache.SCHEMA_VERSION
+    assert [msg["id"] for msg in migrated.search_messages("invoice")] == ["m1"]
+
+
+def test_search_messages_ranks_subject_matches_above_body_matches(tmp_path):
+    cache = EmailCache(db_path=str(tmp_path / "cache.db"))
+    older = _make_msg("subject-hit", subject="Drywall estimate")
+    newer = _make_msg("body-hit", subject="Hello", body_preview="also some drywall")
+    newer["receivedDateTime"] = "2026-02-01T00:00:00Z"
+    cache.save_messages([older, newer], folder_id="inbox")
+
+    assert [msg["id"] for msg in cache.search_messages("drywall")] == ["subject-hit", "body-hit"]
+
+
+def test_search_messages_matches_last_word_as_prefix(tmp_path):
+    cache = EmailCache(db_path=str(tmp_path / "cache.db"))
+    cache.save_messages([_make_msg("m1", subject="Paint schedule")], folder_id="inbox")
+
+    assert [msg["id"] for msg in cache.search_messages("pa")] == ["m1"]
+    assert [msg["id"] for msg in cache.search_messages("paint sched")] == ["m1"]
+    assert cache.search_messages("pai schedule") == []
+
+
+def test_search_messages_returns_highlighted_subject_and_snippet(tmp_path):
+    cache = EmailCache(db_path=str(tmp_path / "cache.db"))
+    cache.save_messages(
+        [_make_msg("m1", subject="Primer order"), _make_msg("m2", subject="Site visit")],
+        folder_id="inbox",
+    )
+    cache.save_message_body("m2", "html", '<div class="x">Bring the <b>primer</b> &amp; rollers</div>')
+
+    results = {msg["id"]: msg for msg in cache.search_messages("primer")}
+
+    mark = f"{SEARCH_HIGHLIGHT_START}primer{SEARCH_HIGHLIGHT_END}"
+    assert results["m1"]["_searchSubject"] == f"{SEARCH_HIGHLIGHT_START}Primer{SEARCH_HIGHLIGHT_END} order"
+    assert "_searchSnippet" not in results["m1"]
+    assert "_searchSubject" not in results["m2"]
+    assert results["m2"]["_searchSnippet"] == f"Bring the {mark} & rollers"
+
+
+def test_v12_search_index_gains_prefix_indexes(tmp_path):
+    db_path = str(tmp_path / "cache.db")
+    cache = EmailCache(db_path=db_path)
+    cache.save_messages([_make_msg("m1", subject="Invoice reminder")], folder_id="inbox")
+    conn = cache.conn
+    conn.execute("DROP TABLE message_search_fts")
+    conn.execute(
+        "CREATE VIRTUAL TABLE message_search_fts USING fts5("
+        "subject, sender, recipients, preview, body, "
+        "content='message_search_docs', content_rowid='doc_id')"
+    )
+    conn.execute("UPDATE schema_version SET version = 12")
+    conn.commit()
+    cache.close()
+
+    migrated = EmailCache(db_path=db_path)
+    table_sql = migrated.conn.execute(
+        "SELECT sql FROM sqlite_master WHERE name = 'message_search_fts'"
+    ).fetchone()[0]
+    assert "prefix='2 3'" in table_sql
+    assert [msg["id"] for msg in migrated.search_messages("invo")] == ["m1"]
+    migrated.conn.execute("INSERT INTO message_search_fts(message_search_fts) VALUES('integrity-check')")
+
+
+def test_deferred_rebuild_leaves_migrated_index_for_the_caller(tmp_path):
+    db_path = str(tmp_path / "cache.db")
+    cache = EmailCache(db_path=db_path)
+    cache.save_messages([_make_msg(f"m{i}", subject="Invoice") for i in range(5)], folder_id="inbox")
+    conn = cache.conn
+    conn.execute("DROP TABLE message_search_fts")
+    conn.execute(
+        "CREATE VIRTUAL TABLE message_search_fts USING fts5("
+        "subject, sender, recipients, preview, body, "
+        "content='message_search_docs', content_rowid='doc_id')"
+    )
+    conn.execute("UPDATE schema_version SET version = 12")
+    conn.commit()
+    cache.close()
+
+    migrated = EmailCache(db_path=db_path, defer_search_rebuild=True)
+    assert migrated.search_index_needs_rebuild()
+    assert migrated.search_messages("invoice") == []
+
+    assert migrated.rebuild_search_index(chunk_size=2, should_stop=lambda: True) == 0
+    assert migrated.rebuild_search_index(chunk_size=2) == 5
+    assert not migrated.search_index_needs_rebuild()
+    assert len(migrated.search_messages("invoice")) == 5
+    migrated.conn.execute("INSERT INTO message_search_fts(message_search_fts) VALUES('integrity-check')")
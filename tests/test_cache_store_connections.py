@@ -0,0 +1,65 @@
+import sqlite3
+import threading
+
+import pytest
+
+from genimail.infra.cache_store import EmailCache
+
+
+def _message(message_id):
+    return {"id": message_id, "subject": "Quote", "receivedDateTime": "2026-01-01T00:00:00Z"}
+
+
+def _in_thread(fn):
+    result = {}
+
+    def run():
+        try:
+            result["value"] = fn()
+        except Exception as exc:
+            result["error"] = exc
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    thread.join(5)
+    if "error" in result:
+        raise result["error"]
+    return result.get("value")
+
+
+def test_read_connection_is_read_only_and_sees_committed_writes(tmp_path):
+    cache = EmailCache(db_path=str(tmp_path / "cache.db"))
+    cache.save_messages([_message("m1")], "inbox")
+
+    assert cache.read_conn is not cache.conn
+    assert cache.read_conn.execute("PRAGMA query_only").fetchone()[0] == 1
+    assert cache.get_message_count("inbox") == 1
+    with pytest.raises(sqlite3.OperationalError):
+        cache.read_conn.execute("DELETE FROM messages")
+
+
+def test_reads_inside_a_write_transaction_see_uncommitted_rows(tmp_path):
+    cache = EmailCache(db_path=str(tmp_path / "cache.db"))
+
+    with cache._write_transaction():
+        cache.save_messages([_message("m1")], "inbox")
+        assert cache.get_message_count("inbox") == 1
+
+
+def test_integrity_check_runs_once_per_database_per_process(tmp_path, monkeypatch):
+    calls = []
+    original = EmailCache._integrity_check_ok
+
+    def counting_check(conn):
+        calls.append(conn)
+        return original(conn)
+
+    monkeypatch.setattr(EmailCache, "_integrity_check_ok", staticmethod(counting_check))
+    cache = EmailCache(db_path=str(tmp_path / "cache.db"))
+    cache.save_messages([_message("m1")], "inbox")
+
+    counts = [_in_thread(lambda: cache.get_message_count("inbox")) for _ in range(3)]
+    _in_thread(lambda: cache.save_messages([_message("m2")], "inbox"))
+
+    assert counts == [1, 1, 1]
+    assert len(calls) == 1
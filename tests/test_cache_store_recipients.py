@@ -323,3 +323,287 @@ def test_delete_messages_handles_large_batches_with_chunking(tmp_path):
     cache.delete_messages(all_ids)
 
     assert cache.get_message_count("inbox") == 0
+
+
+def _simple_message(msg_id, subject="Hello", to_address="to@example.com"):
+    return {
+        "id": msg_id,
+        "subject": subject,
+        "from": {"emailAddress": {"name": "Sender", "address": "sender@example.com"}},
+        "toRecipients": [{"emailAddress": {"name": "To", "address": to_address}}],
+        "ccRecipients": [],
+        "receivedDateTime": "2026-01-01T00:00:00Z",
+        "isRead": False,
+        "hasAttachments": False,
+        "bodyPreview": "",
+        "importance": "normal",
+    }
+
+
+def test_save_messages_resave_keeps_company_label_and_cached_body(tmp_path):
+    cache = EmailCache(db_path=str(tmp_path / "cache.db"))
+    cache.save_messages([_simple_message("m1")], folder_id="inbox")
+    cache.save_message_body("m1", "text", "full body")
+    cache.label_domain("example.com", "Example Co")
+
+    cache.save_messages([_simple_message("m1", subject="Hello again")], folder_id="inbox")
+
+    rows = cache.get_messages("inbox")
+    assert rows[0]["subject"] == "Hello again"
+    assert rows[0]["_companyLabel"] == "Example Co"
+    assert cache.get_message_body("m1") == {"contentType": "text", "content": "full body"}
+
+
+def test_save_messages_replaces_recipients_and_keeps_last_duplicate(tmp_path):
+    cache = EmailCache(db_path=str(tmp_path / "cache.db"))
+    cache.save_messages([_simple_message("m1", to_address="old@example.com")], folder_id="inbox")
+
+    cache.save_messages(
+        [
+            _simple_message("m1", subject="First", to_address="first@example.com"),
+            _simple_message("m2"),
+            _simple_message("m1", subject="Last", to_address="last@example.com"),
+        ],
+        folder_id="inbox",
+    )
+
+    by_id = {msg["id"]: msg for msg in cache.get_messages("inbox")}
+    assert by_id["m1"]["subject"] == "Last"
+    assert [item["emailAddress"]["address"] for item in by_id["m1"]["toRecipients"]] == ["last@example.com"]
+    assert cache.get_message_count("inbox") == 2
+
+
+def test_get_messages_page_walks_folder_with_keyset_cursor(tmp_path):
+    cache = EmailCache(db_path=str(tmp_path / "cache.db"))
+    messages = []
+    for idx in range(7):
+        msg = _simple_message(f"m{idx}")
+        # Two messages share each timestamp so the id tie-break is exercised.
+        msg["receivedDateTime"] = f"2026-01-0{1 + idx // 2}T00:00:00Z"
+        messages.append(msg)
+    for msg_id in ("u1", "u2"):
+        undated = _simple_message(msg_id)
+        undated["receivedDateTime"] = None
+        messages.append(undated)
+    cache.save_messages(messages + [_simple_message("other")], folder_id="inbox")
+    cache.save_messages([_simple_message("elsewhere")], folder_id="archive")
+
+    seen = []
+    page, cursor = cache.get_messages_page("inbox", limit=3)
+    seen.extend(msg["id"] for msg in page)
+    while cursor is not None:
+        page, cursor = cache.get_messages_page("inbox", limit=3, cursor=cursor)
+        seen.extend(msg["id"] for msg in page)
+
+    assert seen == ["m6", "m5", "m4", "m3", "m2", "other", "m1", "m0", "u2", "u1"]
+    assert [msg["id"] for msg in page] == ["u1"]
+    assert page[0]["toRecipients"][0]["emailAddress"]["address"] == "to@example.com"
+
+
+def test_get_messages_page_returns_no_cursor_when_page_is_exact(tmp_path):
+    cache = EmailCache(db_path=str(tmp_path / "cache.db"))
+    cache.save_messages([_simple_message("m1"), _simple_message("m2")], folder_id="inbox")
+
+    page, cursor = cache.get_messages_page("inbox", limit=2)
+
+    assert [msg["id"] for msg in page] == ["m2", "m1"]
+    assert cursor is None
+
+
+def test_cached_body_ids_and_inline_attachment_metadata_round_trip(tmp_path):
+    cache = EmailCache(db_path=str(tmp_path / "cache.db"))
+    cache.save_messages([_simple_message("m1"), _simple_message("m2")], folder_id="inbox")
+    cache.save_message_body("m1", "html", "<p>body</p>")
+    cache.save_attachments(
+        "m1",
+        [
+            {
+                "@odata.type": "#microsoft.graph.fileAttachment",
+                "id": "a1",
+                "name": "logo.png",
+                "isInline": True,
+                "contentId": "<logo>",
+            },
+            {"@odata.type": "#microsoft.graph.fileAttachment", "id": "a2", "name": "doc.pdf"},
+        ],
+    )
+
+    assert cache.get_cached_body_ids(["m1", "m2", "missing"]) == {"m1"}
+    attachments = {item["id"]: item for item in cache.get_attachments("m1")}
+    assert attachments["a1"]["isInline"] is True
+    assert attachments["a1"]["contentId"] == "<logo>"
+    assert attachments["a2"]["isInline"] is False
+
+
+def test_attachment_blob_hash_survives_metadata_refresh(tmp_path):
+    cache = EmailCache(db_path=str(tmp_path / "cache.db"))
+    cache.save_messages([_simple_message("m1")], folder_id="inbox")
+    attachment = {"@odata.type": "#microsoft.graph.fileAttachment", "id": "a1", "name": "plans.pdf"}
+    cache.save_attachments("m1", [attachment])
+
+    assert cache.get_attachment_blob_hash("a1") is None
+    cache.set_attachment_blob_hash("a1", "abc123")
+    cache.save_attachments("m1", [dict(attachment, name="plans-rev2.pdf")])
+
+    assert cache.get_attachment_blob_hash("a1") == "abc123"
+    assert cache.get_attachments("m1")[0]["name"] == "plans-rev2.pdf"
+    assert cache.get_attachment_blob_hash("missing") is None
+
+
+def test_save_messages_keeps_cached_recipients_when_payload_omits_them(tmp_path):
+    cache = EmailCache(db_path=str(tmp_path / "cache.db"))
+    cache.save_messages([_simple_message("m1", to_address="client@acme.com")], folder_id="inbox")
+    lean = {key: value for key, value in _simple_message("m1", subject="Updated").items() if "Recipients" not in key}
+
+    cache.save_messages([lean], folder_id="inbox")
+
+    page, _ = cache.get_messages_page("inbox", limit=10)
+    assert page[0]["subject"] == "Updated"
+    assert page[0]["toRecipients"][0]["emailAddress"]["address"] == "client@acme.com"
+
+
+def test_apply_delta_page_checkpoints_until_round_completes(tmp_path):
+    cache = EmailCache(db_path=str(tmp_path / "cache.db"))
+    cache.save_messages([{"id": "old", "receivedDateTime": "2026-01-01T00:00:00Z"}], "inbox")
+
+    cache.apply_delta_page(
+        "inbox",
+        [{"id": "m1", "receivedDateTime": "2026-01-02T00:00:00Z"}],
+        ["old"],
+        next_link="next-1",
+    )
+
+    assert cache.get_message_count("inbox") == 1
+    assert cache.get_delta_checkpoint("inbox") == "next-1"
+    assert cache.get_delta_link("inbox") is None
+
+    cache.apply_delta_page("inbox", [], [], delta_link="delta-1")
+
+    assert cache.get_delta_checkpoint("inbox") is None
+    assert cache.get_delta_link("inbox") == "delta-1"
+
+
+def test_replaying_a_delta_page_is_idempotent(tmp_path):
+    cache = EmailCache(db_path=str(tmp_path / "cache.db"))
+    page = [
+        {
+            "id": "m1",
+            "subject": "Quote",
+            "toRecipients": [{"emailAddress": {"name": "Acme", "address": "sales@acme.com"}}],
+            "receivedDateTime": "2026-01-02T00:00:00Z",
+        }
+    ]
+
+    cache.apply_delta_page("inbox", page, [], next_link="next-1")
+    first = cache.get_sync_progress("inbox")
+    cache.apply_delta_page("inbox", page, [], next_link="next-1")
+
+    assert cache.get_message_count("inbox") == 1
+    assert cache.conn.execute("SELECT COUNT(*) FROM message_recipients").fetchone()[0] == 1
+    assert cache.get_sync_progress("inbox")["pages_synced"] == 2
+    assert cache.get_sync_progress("inbox")["started_at"] == first["started_at"]
+
+
+def _participants(cache, msg_id):
+    rows = cache.conn.execute(
+        "SELECT role, address, domain FROM message_participants WHERE message_id = ? ORDER BY role, address",
+        (msg_id,),
+    ).fetchall()
+    return [tuple(row) for row in rows]
+
+
+def test_message_participants_track_sender_and_recipient_domains(tmp_path):
+    cache = EmailCache(db_path=str(tmp_path / "cache.db"))
+    cache.save_messages([_simple_message("m1", to_address="Client@Acme.com")], folder_id="inbox")
+
+    assert _participants(cache, "m1") == [
+        ("from", "sender@example.com", "example.com"),
+        ("to", "client@acme.com", "acme.com"),
+    ]
+
+    lean = {key: value for key, value in _simple_message("m1").items() if "Recipients" not in key}
+    lean["from"] = {"emailAddress": {"name": "Other", "address": "ops@vendor.org"}}
+    cache.save_messages([lean], folder_id="inbox")
+
+    assert _participants(cache, "m1") == [
+        ("from", "ops@vendor.org", "vendor.org"),
+        ("to", "client@acme.com", "acme.com"),
+    ]
+    assert [msg["id"] for msg in cache.search_company_messages("acme.com")] == ["m1"]
+    assert cache.search_company_messages("example.com") == []
+
+    cache.delete_messages(["m1"])
+
+    assert _participants(cache, "m1") == []
+
+
+def test_v10_schema_backfills_message_participants(tmp_path):
+    db_path = str(tmp_path / "cache.db")
+    cache = EmailCache(db_path=db_path)
+    cache.save_messages([_simple_message("m1", to_address="client@acme.com")], folder_id="inbox")
+    with cache._write_transaction() as conn:
+        conn.execute("DROP TABLE message_participants")
+        cache._set_schema_version(conn, 10)
+    cache.close()
+
+    reopened = EmailCache(db_path=db_path)
+
+    assert _participants(reopened, "m1") == [
+        ("from", "sender@example.com", "example.com"),
+        ("to", "client@acme.com", "acme.com"),
+    ]
+    assert [msg["id"] for msg in reopened.search_by_domain("acme.com")] == ["m1"]
+
+
+def _company_counts_table(cache):
+    rows = cache.conn.execute(
+        "SELECT domain, folder_id, total, unread, last_received FROM company_counts ORDER BY domain, folder_id"
+    ).fetchall()
+    return [tuple(row) for row in rows]
+
+
+def test_company_counts_follow_saves_read_changes_and_deletes(tmp_path):
+    cache = EmailCache(db_path=str(tmp_path / "cache.db"))
+    first = _simple_message("m1", to_address="client@acme.com")
+    second = dict(_simple_message("m2", to_address="ops@acme.com"), receivedDateTime="2026-01-02T00:00:00Z")
+    cache.save_messages([first, second], folder_id="inbox")
+    cache.save_messages([_simple_message("m3", to_address="client@acme.com")], folder_id="sentitems")
+
+    assert cache.get_company_counts(["acme.com", "Example.com", "none.org"]) == {
+        "acme.com": {"total": 3, "unread": 3, "last_received": "2026-01-02T00:00:00Z"},
+        "example.com": {"total": 3, "unread": 3, "last_received": "2026-01-02T00:00:00Z"},
+    }
+    assert cache.get_company_counts(["acme.com"], folder_ids=["sentitems"])["acme.com"]["total"] == 1
+
+    cache.update_read_status("m1", True)
+    cache.save_messages([dict(second, isRead=True)], folder_id="inbox")
+    assert cache.get_company_counts(["acme.com"], folder_ids=["inbox"])["acme.com"]["unread"] == 0
+
+    cache.delete_messages(["m2"])
+    assert cache.get_company_counts(["acme.com"], folder_ids=["inbox"])["acme.com"] == {
+        "total": 1,
+        "unread": 0,
+        "last_received": "2026-01-01T00:00:00Z",
+    }
+
+    snapshot = _company_counts_table(cache)
+    with cache._write_transaction() as conn:
+        cache._rebuild_company_counts(conn)
+    assert _company_counts_table(cache) == snapshot
+
+    cache.delete_messages(["m1", "m3"])
+    assert cache.get_company_counts(["acme.com", "example.com"]) == {}
+    assert _company_counts_table(cache) == []
+
+
+def test_last_sync_times_only_report_completed_rounds(tmp_path):
+    cache = EmailCache(db_path=str(tmp_path / "cache.db"))
+    cache.save_delta_link("inbox", "delta-inbox")
+    cache.save_delta_link("sentitems", "delta-sent")
+    cache.apply_delta_page("sentitems", [], [], next_link="next-1")
+    cache.apply_delta_page("drafts", [], [], next_link="next-2")
+
+    synced = cache.get_last_sync_times(["inbox", "sentitems", "drafts", "archive"])
+
+    assert list(synced) == ["inbox"]
+    assert synced["inbox"] >= int(time.time()) - 5
@@ -0,0 +1,78 @@
+import threading
+
+from genimail.infra.cache_store import EmailCache
+from genimail.infra.cache_writer import CacheWriteBehind
+
+
+def _message(message_id, received="2026-01-01T00:00:00Z"):
+    return {"id": message_id, "subject": message_id, "receivedDateTime": received}
+
+
+def test_flush_makes_queued_writes_visible(tmp_path):
+    cache = EmailCache(db_path=str(tmp_path / "cache.db"))
+    writer = CacheWriteBehind(cache)
+    try:
+        writer.save_messages([_message("m1"), _message("m2")], "inbox")
+        writer.save_message_body("m1", "text", "hello")
+
+        assert writer.flush(timeout=5)
+        assert cache.get_message_count("inbox") == 2
+        assert cache.get_message_body("m1")["content"] == "hello"
+    finally:
+        writer.close()
+
+
+class _GatedCache:
+    """Holds the writer on its first write so later writes pile up in the queue."""
+
+    def __init__(self, cache):
+        self.cache = cache
+        self.gate = threading.Event()
+        self.entered = threading.Event()
+        self.transactions = 0
+        self.body_writes = []
+
+    def _write_transaction(self):
+        self.transactions += 1
+        return self.cache._write_transaction()
+
+    def save_messages(self, messages, folder_id):
+        self.entered.set()
+        self.gate.wait(5)
+        self.cache.save_messages(messages, folder_id)
+
+    def save_message_body(self, message_id, content_type, content):
+        self.body_writes.append((message_id, content))
+        self.cache.save_message_body(message_id, content_type, content)
+
+
+def test_queued_writes_share_one_transaction_and_coalesce_bodies(tmp_path):
+    cache = _GatedCache(EmailCache(db_path=str(tmp_path / "cache.db")))
+    writer = CacheWriteBehind(cache)
+    try:
+        writer.save_messages([_message("m0")], "inbox")
+        assert cache.entered.wait(5)
+        writer.save_messages([_message("m1")], "inbox")
+        writer.save_message_body("m1", "text", "draft")
+        writer.save_message_body("m1", "text", "final")
+        cache.gate.set()
+
+        assert writer.flush(timeout=5)
+        assert cache.transactions == 2
+        assert cache.body_writes == [("m1", "final")]
+        assert writer.stats()["coalesced"] == 1
+    finally:
+        writer.close()
+
+
+def test_close_flushes_and_later_writes_run_inline(tmp_path):
+    cache = EmailCache(db_path=str(tmp_path / "cache.db"))
+    writer = CacheWriteBehind(cache)
+    writer.save_messages([_message("m1")], "inbox")
+
+    writer.close()
+    assert cache.get_message_count("inbox") == 1
+
+    writer.save_messages([_message("m2")], "inbox")
+    assert cache.get_message_count("inbox") == 2
+    assert writer.flush() is True
@@ -396,7 +396,9 @@ def test_attachment_routes_docx_to_preview(tmp_path, monkeypatch):
     probe._set_status = lambda msg: None
     probe._unique_output_path = staticmethod(lambda d, f: os.path.join(d, f))
 
-    probe._on_open_attachment_ready((b"fake content", "test.docx"))
+    blob = tmp_path / "blob"
+    blob.write_bytes(b"fake content")
+    probe._on_open_attachment_ready(probe._materialize_attachment(str(blob), "test.docx"))
 
     assert len(preview_calls) == 1
     assert preview_calls[0].endswith(".docx")
@@ -421,7 +423,9 @@ def test_attachment_routes_pdf_to_pdf_viewer(tmp_path, monkeypatch):
     probe._set_status = lambda msg: None
     probe._unique_output_path = staticmethod(lambda d, f: os.path.join(d, f))
 
-    probe._on_open_attachment_ready((b"fake content", "test.pdf"))
+    blob = tmp_path / "blob"
+    blob.write_bytes(b"fake content")
+    probe._on_open_attachment_ready(probe._materialize_attachment(str(blob), "test.pdf"))
 
     assert len(pdf_calls) == 1
     assert len(preview_calls) == 0
@@ -510,3 +514,29 @@ def test_docs_cleanup_blocks_future_preview_requests(tmp_path, monkeypatch):
     DocsMixin._open_doc_preview(probe, str(doc))
 
     assert probe._doc_preview_path is None
+
+
+def test_attachment_file_is_copied_on_the_worker(tmp_path, monkeypatch):
+    """_fetch_attachment_file materializes or saves the blob and returns the final path."""
+    from genimail_qt.mixins.attachments import EmailAttachmentMixin
+
+    monkeypatch.setattr("genimail_qt.mixins.attachments.PDF_DIR", str(tmp_path / "pdf"))
+    blob = tmp_path / "blob"
+    blob.write_bytes(b"plan set")
+
+    class _Probe(EmailAttachmentMixin):
+        def _fetch_attachment_blob(self, message_id, attachment_id, filename=None):
+            return str(blob), filename
+
+    probe = _Probe()
+    probe._unique_output_path = staticmethod(lambda d, f: os.path.join(d, f))
+
+    opened = probe._fetch_attachment_file("m1", "a1", "plans.pdf")
+    saved = probe._fetch_attachment_file("m1", "a1", "plans.pdf", target_path=str(tmp_path / "saved.pdf"))
+
+    assert opened == str(tmp_path / "pdf" / "plans.pdf")
+    assert saved == str(tmp_path / "saved.pdf")
+    with open(opened, "rb") as handle:
+        assert handle.read() == b"plan set"
+    with open(saved, "rb") as handle:
+        assert handle.read() == b"plan set"
@@ -0,0 +1,119 @@
+from genimail.infra import graph_client
+from genimail.infra.graph_client import GRAPH_BASE, GraphClient
+
+
+class _BatchResponse:
+    def __init__(self, payload):
+        self._payload = payload
+        self.status_code = 200
+
+    def json(self):
+        return self._payload
+
+
+def _client_with_batch_responder(responder):
+    client = GraphClient.__new__(GraphClient)
+    posts = []
+
+    def _post(url, data):
+        posts.append((url, [dict(item) for item in data["requests"]]))
+        return _BatchResponse({"responses": responder(data["requests"])})
+
+    client._post = _post
+    client.rate_limit_retries = 3
+    client.max_retry_after_sec = 30
+    return client, posts
+
+
+def test_batch_chunks_requests_and_preserves_input_order():
+    def _responder(requests):
+        # Graph may answer in any order.
+        return [{"id": item["id"], "status": 200, "body": {"url": item["url"]}} for item in reversed(requests)]
+
+    client, posts = _client_with_batch_responder(_responder)
+
+    results = client.batch([{"method": "GET", "url": f"{GRAPH_BASE}/me/messages/m{idx}"} for idx in range(25)])
+
+    assert [len(requests) for _, requests in posts] == [20, 5]
+    assert all(url == f"{GRAPH_BASE}/$batch" for url, _ in posts)
+    assert posts[0][1][0] == {"id": "1", "method": "GET", "url": "/me/messages/m0"}
+    assert [result["body"]["url"] for result in results] == [f"/me/messages/m{idx}" for idx in range(25)]
+
+
+def test_batch_retries_only_throttled_sub_requests_after_retry_after(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(graph_client.time, "sleep", sleeps.append)
+    rounds = []
+
+    def _responder(requests):
+        rounds.append([item["id"] for item in requests])
+        if len(rounds) == 1:
+            return [
+                {"id": "1", "status": 200, "body": {"ok": 1}},
+                {"id": "2", "status": 429, "headers": {"Retry-After": "4"}, "body": {}},
+                {"id": "3", "status": 429, "headers": {"retry-after": "2"}, "body": {}},
+            ]
+        return [{"id": item["id"], "status": 200, "body": {"ok": item["id"]}} for item in requests]
+
+    client, _ = _client_with_batch_responder(_responder)
+
+    results = client.batch([{"method": "GET", "url": f"/me/messages/m{idx}"} for idx in range(3)])
+
+    assert rounds == [["1", "2", "3"], ["2", "3"]]
+    assert sleeps == [4]
+    assert [result["status"] for result in results] == [200, 200, 200]
+
+
+def test_batch_returns_429_once_retries_are_exhausted(monkeypatch):
+    monkeypatch.setattr(graph_client.time, "sleep", lambda _seconds: None)
+    client, posts = _client_with_batch_responder(
+        lambda requests: [{"id": item["id"], "status": 429, "headers": {}, "body": {}} for item in requests]
+    )
+    client.rate_limit_retries = 1
+
+    results = client.batch([{"method": "GET", "url": "/me/messages/m1"}])
+
+    assert len(posts) == 2
+    assert results[0]["status"] == 429
+
+
+def test_get_message_with_attachments_uses_one_batch_call():
+    def _responder(requests):
+        return [
+            {"id": "1", "status": 200, "body": {"id": "m1", "subject": "Hello"}},
+            {"id": "2", "status": 200, "body": {"value": [{"id": "a1"}]}},
+        ]
+
+    client, posts = _client_with_batch_responder(_responder)
+
+    detail, attachments = client.get_message_with_attachments("m1")
+
+    assert len(posts) == 1
+    assert posts[0][1][0]["url"].startswith("/me/messages/m1?$select=")
+    assert posts[0][1][1]["url"].startswith("/me/messages/m1/attachments?$select=")
+    assert "contentBytes" not in posts[0][1][1]["url"]
+    assert detail["subject"] == "Hello"
+    assert attachments == [{"id": "a1"}]
+
+
+def test_download_attachments_and_mark_read_many_report_failed_sub_requests():
+    def _responder(requests):
+        return [
+            {"id": item["id"], "status": 404 if item["id"] == "2" else 200, "body": {"contentBytes": item["id"]}}
+            for item in requests
+        ]
+
+    client, posts = _client_with_batch_responder(_responder)
+
+    downloaded = client.download_attachments("m1", ["a1", "a2", ""])
+    failed = client.mark_read_many(["m1", "m2"], is_read=True)
+
+    assert downloaded == {"a1": {"contentBytes": "1"}}
+    assert failed == ["m2"]
+    assert posts[1][1][0] == {
+        "id": "1",
+        "method": "PATCH",
+        "url": "/me/messages/m1",
+        "body": {"isRead": True},
+        "headers": {"Content-Type": "application/json"},
+    }
@@ -183,3 +183,203 @@ def test_get_messages_delta_detects_pagination_cycle():
 
     with pytest.raises(RuntimeError, match="pagination cycle"):
         client.get_messages_delta(folder_id="inbox")
+
+
+def test_iter_delta_pages_fetches_next_page_only_when_consumed():
+    client = graph_client.GraphClient.__new__(graph_client.GraphClient)
+    requested = []
+    pages = {
+        None: {
+            "value": [{"id": "m1"}, {"id": "gone", "@removed": {"reason": "deleted"}}],
+            "@odata.nextLink": "https://example.invalid/page2",
+        },
+        "https://example.invalid/page2": {
+            "value": [{"id": "m2"}],
+            "@odata.deltaLink": "https://example.invalid/delta",
+        },
+    }
+
+    class _Session:
+        @staticmethod
+        def request(_method, url, **_kwargs):
+            key = None if url.endswith("/messages/delta") else url
+            requested.append(key)
+            return _FakeResponse(200, pages[key])
+
+    _set_session(client, _Session())
+    client._headers = lambda: {"Authorization": "Bearer token"}
+    client.authenticate = lambda: False
+    client.request_timeout = (1, 1)
+    client.get_retries = 0
+    client.rate_limit_retries = 0
+
+    iterator = client.iter_delta_pages(folder_id="inbox")
+    first = next(iterator)
+
+    assert first == ([{"id": "m1"}], ["gone"], "https://example.invalid/page2", None)
+    assert requested == [None]
+    assert list(iterator) == [([{"id": "m2"}], [], None, "https://example.invalid/delta")]
+    assert requested == [None, "https://example.invalid/page2"]
+
+
+def test_iter_delta_pages_reports_expired_link():
+    client = graph_client.GraphClient.__new__(graph_client.GraphClient)
+
+    class _Session:
+        @staticmethod
+        def request(*_args, **_kwargs):
+            return _FakeResponse(410)
+
+    _set_session(client, _Session())
+    client._headers = lambda: {"Authorization": "Bearer token"}
+    client.authenticate = lambda: False
+    client.request_timeout = (1, 1)
+    client.get_retries = 0
+    client.rate_limit_retries = 0
+
+    pages = list(client.iter_delta_pages(folder_id="inbox", delta_link="https://example.invalid/old"))
+
+    assert pages == [(None, None, None, None)]
+    assert client.get_messages_delta(folder_id="inbox", delta_link="https://example.invalid/old") == (
+        None,
+        None,
+        None,
+    )
+
+
+def test_download_attachment_to_streams_value_endpoint_in_chunks(tmp_path):
+    client = graph_client.GraphClient.__new__(graph_client.GraphClient)
+    seen = {}
+
+    class _StreamResponse(_FakeResponse):
+        closed = False
+
+        def iter_content(self, chunk_size=None):
+            seen["chunk_size"] = chunk_size
+            yield b"%PDF-"
+            yield b""
+            yield b"1.7"
+
+        def close(self):
+            _StreamResponse.closed = True
+
+    class _Session:
+        @staticmethod
+        def request(_method, url, **kwargs):
+            seen["url"] = url
+            seen["stream"] = kwargs.get("stream")
+            return _StreamResponse(200, headers={"Content-Length": "8"})
+
+    _set_session(client, _Session())
+    client._headers = lambda: {"Authorization": "Bearer token"}
+    client.authenticate = lambda: False
+    client.request_timeout = (1, 1)
+    client.get_retries = 0
+    progress = []
+    target = tmp_path / "plans.pdf"
+
+    written = client.download_attachment_to("m1", "a1", str(target), on_progress=lambda *args: progress.append(args))
+
+    assert written == 8
+    assert target.read_bytes() == b"%PDF-1.7"
+    assert seen["url"].endswith("/me/messages/m1/attachments/a1/$value")
+    assert seen["stream"] is True
+    assert seen["chunk_size"] == graph_client.ATTACHMENT_DOWNLOAD_CHUNK_BYTES
+    assert progress == [(5, 8), (8, 8)]
+    assert _StreamResponse.closed is True
+
+
+def test_request_backs_off_and_retries_get_on_503(monkeypatch):
+    client = graph_client.GraphClient.__new__(graph_client.GraphClient)
+    responses = [_FakeResponse(503), _FakeResponse(504), _FakeResponse(200, {"ok": True})]
+    calls = {"count": 0}
+
+    class _Session:
+        @staticmethod
+        def request(*_args, **_kwargs):
+            response = responses[calls["count"]]
+            calls["count"] += 1
+            return response
+
+    backoffs = []
+    _set_session(client, _Session())
+    client._headers = lambda: {"Authorization": "Bearer token"}
+    client.authenticate = lambda: False
+    client.request_timeout = (1, 1)
+    client.get_retries = 0
+    client.server_error_retries = 2
+    client.throttle.wait_for_backoff = backoffs.append
+
+    response = client._request("GET", "https://example.invalid")
+
+    assert response.status_code == 200
+    assert backoffs == [1, 2]
+
+
+def test_request_does_not_replay_post_after_server_error():
+    client = graph_client.GraphClient.__new__(graph_client.GraphClient)
+    calls = {"count": 0}
+
+    class _Session:
+        @staticmethod
+        def request(*_args, **_kwargs):
+            calls["count"] += 1
+            return _FakeResponse(503)
+
+    _set_session(client, _Session())
+    client._headers = lambda: {"Authorization": "Bearer token"}
+    client.authenticate = lambda: False
+    client.request_timeout = (1, 1)
+    client.get_retries = 0
+
+    with pytest.raises(Exception):
+        client._request("POST", "https://example.invalid")
+    assert calls["count"] == 1
+
+
+def _pooled_client():
+    client = graph_client.GraphClient.__new__(graph_client.GraphClient)
+    client._thread_local = threading.local()
+    client._sessions_lock = threading.Lock()
+    client._sessions = graph_client.weakref.WeakSet()
+    client._adapter = None
+    return client
+
+
+def test_thread_sessions_share_one_adapter_and_close_together():
+    client = _pooled_client()
+    sessions = []
+    worker = threading.Thread(target=lambda: sessions.append(client.session))
+    worker.start()
+    worker.join()
+    sessions.append(client.session)
+
+    first, second = sessions
+    assert first is not second
+    assert first.get_adapter("https://graph.microsoft.com") is second.get_adapter("https://graph.microsoft.com")
+    assert second.headers["Accept-Encoding"] == "gzip, deflate"
+    assert client._adapter._pool_maxsize == graph_client.GraphClient.HTTP_POOL_MAXSIZE
+
+    closed = []
+    for session in sessions:
+        session.close = lambda s=session: closed.append(s)
+    client.close()
+
+    assert set(map(id, closed)) == set(map(id, sessions))
+    assert client._adapter is None
+
+
+def test_connection_stats_report_reused_connections():
+    client = _pooled_client()
+
+    class _Pool:
+        num_requests = 12
+        num_connections = 3
+
+    class _Adapter:
+        class poolmanager:
+            pools = {"graph": _Pool()}
+
+    client._adapter = _Adapter()
+
+    assert client.connection_stats() == {"requests": 12, "new_connections": 3, "reused_connections": 9}
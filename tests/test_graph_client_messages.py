@@ -0,0 +1,67 @@
+import pytest
+
+from genimail.infra.graph_client import GRAPH_BASE, GraphClient
+
+
+def _client_with_pages(pages):
+    client = GraphClient.__new__(GraphClient)
+    calls = []
+
+    def _get(url, params=None):
+        calls.append((url, params))
+        return pages[url]
+
+    client._get = _get
+    return client, calls
+
+
+def test_iter_message_pages_follows_next_link_only_when_consumed():
+    first_url = f"{GRAPH_BASE}/me/mailFolders/inbox/messages"
+    client, calls = _client_with_pages(
+        {
+            first_url: {"value": [{"id": "m1"}, {"id": "m2"}], "@odata.nextLink": "https://next/2"},
+            "https://next/2": {"value": [{"id": "m3"}]},
+        }
+    )
+
+    pages = client.iter_message_pages("inbox", page_size=2)
+    assert next(pages) == [{"id": "m1"}, {"id": "m2"}]
+    assert len(calls) == 1
+    assert calls[0][1]["$top"] == "2"
+    assert calls[0][1]["$select"] == GraphClient._MESSAGE_PROJECTIONS["list"]
+    assert "toRecipients" not in calls[0][1]["$select"]
+
+    assert list(pages) == [[{"id": "m3"}]]
+    assert calls[1] == ("https://next/2", None)
+
+
+def test_get_messages_stops_at_top_across_pages():
+    first_url = f"{GRAPH_BASE}/me/mailFolders/inbox/messages"
+    client, calls = _client_with_pages(
+        {
+            first_url: {"value": [{"id": "m1"}, {"id": "m2"}], "@odata.nextLink": "https://next/2"},
+            "https://next/2": {"value": [{"id": "m3"}, {"id": "m4"}], "@odata.nextLink": "https://next/3"},
+        }
+    )
+
+    messages, _ = client.get_messages("inbox", top=3, projection="company")
+
+    assert [msg["id"] for msg in messages] == ["m1", "m2", "m3"]
+    assert [url for url, _ in calls] == [first_url, "https://next/2"]
+    assert "toRecipients" in calls[0][1]["$select"]
+
+
+def test_iter_message_pages_rejects_unknown_projection_and_cycles():
+    client, _ = _client_with_pages({})
+    with pytest.raises(ValueError):
+        next(client.iter_message_pages("inbox", projection="everything"))
+
+    first_url = f"{GRAPH_BASE}/me/mailFolders/inbox/messages"
+    client, _ = _client_with_pages(
+        {
+            first_url: {"value": [{"id": "m1"}], "@odata.nextLink": "https://loop"},
+            "https://loop": {"value": [{"id": "m2"}], "@odata.nextLink": "https://loop"},
+        }
+    )
+    with pytest.raises(RuntimeError, match="pagination cycle"):
+        list(client.iter_message_pages("inbox"))
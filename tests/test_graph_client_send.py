@@ -39,3 +39,109 @@ def test_send_mail_reply_mode_still_posts_sendmail():
 
     assert len(calls) == 1
     assert calls[0][0] == f"{GRAPH_BASE}/me/sendMail"
+
+
+class _JsonResponse:
+    def __init__(self, status_code=200, payload=None):
+        self.status_code = status_code
+        self._payload = payload or {}
+        self.headers = {}
+
+    def json(self):
+        return self._payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"status={self.status_code}")
+
+
+def test_send_mail_inlines_small_file_backed_attachments(tmp_path):
+    client = GraphClient.__new__(GraphClient)
+    calls = []
+    client._post = lambda url, data: calls.append((url, data))
+    path = tmp_path / "note.txt"
+    path.write_bytes(b"hello")
+
+    client.send_mail(["to@example.com"], [], "S", "B", attachments=[{"name": "note.txt", "path": str(path), "size": 5}])
+
+    assert len(calls) == 1
+    attachment = calls[0][1]["message"]["attachments"][0]
+    assert attachment["contentBytes"] == "aGVsbG8="
+    assert attachment["name"] == "note.txt"
+
+
+def test_send_mail_uploads_large_attachments_through_a_draft_and_resumes(tmp_path, monkeypatch):
+    from genimail.infra import graph_client
+
+    monkeypatch.setattr(graph_client, "ATTACHMENT_INLINE_SEND_MAX_BYTES", 4)
+    monkeypatch.setattr(graph_client, "ATTACHMENT_UPLOAD_CHUNK_BYTES", 4)
+    client = GraphClient.__new__(GraphClient)
+    client.request_timeout = (1, 1)
+    client.upload_retries = 1
+    events = []
+    client.throttle.wait_for_backoff = lambda attempt: events.append(("backoff", attempt))
+    posts = []
+
+    def _post(url, data):
+        posts.append((url, data))
+        if url.endswith("/me/messages"):
+            return _JsonResponse(201, {"id": "draft1"})
+        if url.endswith("/createUploadSession"):
+            return _JsonResponse(201, {"uploadUrl": "https://upload.invalid/session"})
+        return _JsonResponse(202)
+
+    puts = []
+    put_responses = [
+        _JsonResponse(202, {"nextExpectedRanges": ["4-"]}),
+        _JsonResponse(503),
+        _JsonResponse(202, {"nextExpectedRanges": ["8-9"]}),
+        _JsonResponse(201),
+    ]
+
+    class _Session:
+        @staticmethod
+        def put(url, data=None, headers=None, timeout=None):
+            puts.append((headers["Content-Range"], data))
+            events.append(("put", headers["Content-Range"]))
+            return put_responses[len(puts) - 1]
+
+        @staticmethod
+        def get(url, timeout=None):
+            return _JsonResponse(200, {"nextExpectedRanges": ["4-9"]})
+
+    client._post = _post
+    client._thread_local = graph_client.threading.local()
+    client._thread_local.session = _Session()
+    big = tmp_path / "plans.pdf"
+    big.write_bytes(b"0123456789")
+    small = tmp_path / "a.txt"
+    small.write_bytes(b"hi")
+
+    client.send_mail(
+        ["to@example.com"],
+        [],
+        "Plans",
+        "See attached",
+        attachments=[
+            {"name": "plans.pdf", "path": str(big), "size": 10},
+            {"name": "a.txt", "path": str(small), "size": 2},
+        ],
+    )
+
+    urls = [url for url, _ in posts]
+    assert urls == [
+        f"{GRAPH_BASE}/me/messages",
+        f"{GRAPH_BASE}/me/messages/draft1/attachments/createUploadSession",
+        f"{GRAPH_BASE}/me/messages/draft1/attachments",
+        f"{GRAPH_BASE}/me/messages/draft1/send",
+    ]
+    assert posts[1][1]["AttachmentItem"]["size"] == 10
+    assert posts[2][1]["contentBytes"] == "aGk="
+    assert puts == [
+        ("bytes 0-3/10", b"0123"),
+        ("bytes 4-7/10", b"4567"),
+        ("bytes 4-7/10", b"4567"),
+        ("bytes 8-9/10", b"89"),
+    ]
+    # The 503 is followed by a backoff before the chunk is re-sent.
+    assert events[1:4] == [("put", "bytes 4-7/10"), ("backoff", 1), ("put", "bytes 4-7/10")]
@@ -0,0 +1,74 @@
+from genimail.infra import graph_throttle
+from genimail.infra.graph_throttle import ThrottleGovernor
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def _patch_sleep(monkeypatch, clock):
+    sleeps = []
+
+    def _sleep(seconds):
+        sleeps.append(round(seconds, 3))
+        clock.now += seconds
+
+    monkeypatch.setattr(graph_throttle.time, "sleep", _sleep)
+    return sleeps
+
+
+def test_acquire_spends_burst_then_waits_for_refill(monkeypatch):
+    clock = _Clock()
+    sleeps = _patch_sleep(monkeypatch, clock)
+    governor = ThrottleGovernor(rate_per_sec=2, burst=2, clock=clock)
+
+    governor.acquire()
+    governor.acquire()
+    assert sleeps == []
+
+    governor.acquire()
+    assert sleeps == [0.5]
+    assert governor.stats()["requests"] == 3
+
+
+def test_retry_after_window_holds_back_other_threads_but_not_the_waiter(monkeypatch):
+    import threading
+
+    clock = _Clock()
+    sleeps = _patch_sleep(monkeypatch, clock)
+    governor = ThrottleGovernor(rate_per_sec=100, burst=10, clock=clock)
+
+    governor.wait_for_retry_after(3)
+    clock.now -= 3  # the waiter's own sleep has not advanced other threads yet
+    governor.acquire()
+    assert sleeps == [3.0]
+
+    other = threading.Thread(target=governor.acquire)
+    other.start()
+    other.join()
+
+    assert sleeps == [3.0, 3.0]
+    stats = governor.stats()
+    assert stats["throttled"] == 1
+    assert stats["retried"] == 1
+
+
+def test_backoff_delay_is_jittered_and_capped(monkeypatch):
+    clock = _Clock()
+    sleeps = _patch_sleep(monkeypatch, clock)
+    monkeypatch.setattr(graph_throttle.random, "uniform", lambda low, high: high)
+    governor = ThrottleGovernor(backoff_base_sec=1, backoff_max_sec=5, clock=clock)
+
+    assert governor.wait_for_backoff(1) == 1
+    assert governor.wait_for_backoff(3) == 4
+    assert governor.wait_for_backoff(6) == 5
+    assert sleeps == [1, 4, 5]
+    assert governor.stats()["retried"] == 3
+
+
+def test_shared_governor_is_process_wide():
+    assert graph_throttle.shared_governor() is graph_throttle.shared_governor()
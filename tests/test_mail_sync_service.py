@@ -1,3 +1,8 @@
+import threading
+
+import pytest
+
+from genimail.infra.cache_store import EmailCache
 from genimail.services.mail_sync import MailSyncService, collect_new_unread
 
 
@@ -194,3 +199,142 @@ def test_sync_delta_for_folders_continues_when_one_folder_fails():
     assert payload["all_deleted_ids"] == ["deleted-1", "deleted-2"]
     assert len(payload["errors"]) == 1
     assert "sentitems" in payload["errors"][0]
+
+
+class BarrierGraph(FolderAwareGraph):
+    """Delta calls only complete once every folder is in flight at the same time."""
+
+    def __init__(self, parties):
+        super().__init__()
+        self.barrier = threading.Barrier(parties, timeout=5)
+
+    def get_messages_delta(self, folder_id="inbox", delta_link=None):
+        self.barrier.wait()
+        return super().get_messages_delta(folder_id=folder_id, delta_link=delta_link)
+
+
+class ExclusiveCache(DummyCache):
+    """Flags any cache write that overlaps another one."""
+
+    def __init__(self, delta=None):
+        super().__init__(delta=delta)
+        self.active_writes = 0
+        self.overlapped = False
+
+    def save_messages(self, messages, folder_id):
+        self.active_writes += 1
+        if self.active_writes > 1:
+            self.overlapped = True
+        threading.Event().wait(0.01)
+        super().save_messages(messages, folder_id)
+        self.active_writes -= 1
+
+
+def test_sync_delta_for_folders_runs_folders_concurrently_and_serializes_writes():
+    cache = ExclusiveCache(delta="existing")
+    cache.delta_links.update({"sentitems": "existing", "junkemail": "existing"})
+    graph = BarrierGraph(parties=3)
+    service = MailSyncService(graph, cache, max_workers=3)
+    try:
+        payload = service.sync_delta_for_folders(["sentitems", "junkemail"], primary_folder_id="inbox")
+    finally:
+        service.close()
+
+    assert payload["errors"] == []
+    assert [msg["id"] for msg in payload["all_messages"]] == ["in-1", "sent-1", "junk-1"]
+    assert sorted(folder for folder, _ in cache.saved_messages) == ["inbox", "junkemail", "sentitems"]
+    assert cache.overlapped is False
+    assert set(payload["timings_ms"]) == {"inbox", "sentitems", "junkemail"}
+    assert payload["elapsed_ms"] >= 0
+
+
+def test_sync_delta_for_folders_single_worker_runs_in_folder_order():
+    cache = DummyCache(delta="existing")
+    cache.delta_links.update({"sentitems": "existing", "junkemail": "existing"})
+    graph = FolderAwareGraph()
+    service = MailSyncService(graph, cache, max_workers=1)
+
+    payload = service.sync_delta_for_folders(["junkemail", "sentitems"], primary_folder_id="inbox")
+
+    assert [folder for folder, _ in graph.get_delta_calls] == ["inbox", "junkemail", "sentitems"]
+    assert list(payload["timings_ms"]) == ["inbox", "junkemail", "sentitems"]
+    assert service._executor is None
+
+
+def test_initialize_delta_tokens_runs_concurrently_and_reports_timings():
+    cache = DummyCache(delta=None)
+    graph = BarrierGraph(parties=3)
+    service = MailSyncService(graph, cache, max_workers=3)
+    try:
+        payload = service.initialize_delta_tokens(["sentitems", "junkemail"], primary_folder_id="inbox")
+    finally:
+        service.close()
+
+    assert payload["ready"] == ["inbox", "sentitems", "junkemail"]
+    assert cache.delta_links == {
+        "inbox": "delta-inbox",
+        "sentitems": "delta-sentitems",
+        "junkemail": "delta-junkemail",
+    }
+    assert set(payload["timings_ms"]) == {"inbox", "sentitems", "junkemail"}
+
+
+class PagedDeltaGraph:
+    """Serves a delta round in pages and can fail part way through."""
+
+    def __init__(self, pages, fail_after=None):
+        self.pages = pages
+        self.fail_after = fail_after
+        self.requested_links = []
+
+    def iter_delta_pages(self, folder_id="inbox", delta_link=None):
+        self.requested_links.append(delta_link)
+        start = 0 if delta_link is None else int(delta_link.rsplit("-", 1)[1])
+        for index in range(start, len(self.pages)):
+            if self.fail_after is not None and index >= self.fail_after:
+                raise RuntimeError("connection dropped")
+            messages = [{"id": message_id, "isRead": True} for message_id in self.pages[index]]
+            last = index == len(self.pages) - 1
+            yield messages, [], None if last else f"next-{index + 1}", "delta-final" if last else None
+
+
+def test_initialize_delta_token_commits_pages_and_resumes_from_checkpoint(tmp_path):
+    cache = EmailCache(db_path=str(tmp_path / "cache.db"))
+    graph = PagedDeltaGraph([["m1", "m2"], ["m3"], ["m4"]], fail_after=2)
+    service = MailSyncService(graph, cache)
+
+    with pytest.raises(RuntimeError, match="connection dropped"):
+        service.initialize_delta_token("inbox")
+
+    assert cache.get_message_count("inbox") == 3
+    assert cache.get_delta_checkpoint("inbox") == "next-2"
+    assert cache.get_delta_link("inbox") is None
+
+    graph.fail_after = None
+    assert service.initialize_delta_token("inbox") == "delta-final"
+
+    assert graph.requested_links == [None, "next-2"]
+    assert cache.get_message_count("inbox") == 4
+    assert cache.get_delta_checkpoint("inbox") is None
+    assert cache.get_delta_link("inbox") == "delta-final"
+
+
+def test_resumed_initial_sync_reports_progress_from_saved_page_count(tmp_path):
+    cache = EmailCache(db_path=str(tmp_path / "cache.db"))
+    graph = PagedDeltaGraph([["m1"], ["m2"], ["m3"], ["m4"]], fail_after=2)
+    service = MailSyncService(graph, cache)
+    progress = []
+
+    with pytest.raises(RuntimeError):
+        service.initialize_delta_token("inbox", on_progress=lambda *args: progress.append(args))
+
+    saved = cache.get_sync_progress("inbox")
+    assert saved["next_link"] == "next-2"
+    assert saved["pages_synced"] == 2
+    assert saved["started_at"] is not None
+
+    graph.fail_after = None
+    service.initialize_delta_token("inbox", on_progress=lambda *args: progress.append(args))
+
+    assert progress == [("inbox", 1, 1), ("inbox", 2, 2), ("inbox", 3, 1), ("inbox", 4, 2)]
+    assert cache.get_sync_progress("inbox") is None
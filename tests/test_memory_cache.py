@@ -0,0 +1,114 @@
+from genimail.infra.memory_cache import SizedLRUCache, TTLLRUCache, approximate_size
+
+
+def _len_size(value):
+    return len(value)
+
+
+def test_evicts_least_recently_used_entries_past_byte_budget():
+    evicted = []
+    cache = SizedLRUCache(10, sizeof=_len_size, on_evict=lambda key, value: evicted.append(key))
+    cache["a"] = "xxxx"
+    cache["b"] = "xxxx"
+    assert cache["a"] == "xxxx"
+
+    cache["c"] = "xxxx"
+
+    assert evicted == ["b"]
+    assert "b" not in cache
+    assert cache.keys() == ["a", "c"]
+    assert cache.current_bytes == 8
+
+
+def test_replacing_entry_updates_byte_accounting():
+    cache = SizedLRUCache(100, sizeof=_len_size)
+    cache["a"] = "x" * 40
+    cache["a"] = "x" * 10
+
+    assert len(cache) == 1
+    assert cache.current_bytes == 10
+    assert cache.pop("a") == "x" * 10
+    assert cache.current_bytes == 0
+    assert cache.pop("a", "gone") == "gone"
+
+
+def test_oversized_entry_is_kept_until_next_insert():
+    evicted = []
+    cache = SizedLRUCache(5, sizeof=_len_size, on_evict=lambda key, value: evicted.append((key, value)))
+    cache["small"] = "xx"
+    cache["big"] = "x" * 20
+
+    assert cache.keys() == ["big"]
+    assert evicted == [("small", "xx")]
+
+    cache["next"] = "x"
+    assert cache.keys() == ["next"]
+
+
+def test_stats_report_hits_misses_and_evictions():
+    cache = SizedLRUCache(6, sizeof=_len_size)
+    cache["a"] = "xxx"
+    cache["b"] = "xxx"
+    cache.get("a")
+    cache.get("missing")
+    cache["c"] = "xxx"
+    cache.clear()
+
+    assert cache.stats() == {
+        "entries": 0,
+        "bytes": 0,
+        "max_bytes": 6,
+        "hits": 1,
+        "misses": 1,
+        "evictions": 1,
+        "evicted_bytes": 3,
+    }
+
+
+def test_approximate_size_counts_nested_payloads():
+    small = {"body": {"content": "x"}}
+    large = {"body": {"content": "x" * 10_000}, "attachments": [{"contentBytes": "y" * 5_000}]}
+
+    assert approximate_size(large) - approximate_size(small) >= 15_000
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_lru_cache_serves_stale_entries_only_through_lookup():
+    clock = _Clock()
+    cache = TTLLRUCache(4, ttl_sec=10, clock=clock)
+    cache["a"] = {"messages": []}
+
+    assert cache.lookup("a") == ({"messages": []}, True)
+    clock.now += 11
+    assert cache.lookup("a") == ({"messages": []}, False)
+    assert cache.get("a") is None
+    assert cache.lookup("missing") == (None, False)
+
+    cache["a"] = {"messages": [1]}
+    assert cache.get("a") == {"messages": [1]}
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["stale_hits"] == 2
+    assert cache.stats()["misses"] == 1
+
+
+def test_ttl_lru_cache_evicts_least_recently_used_and_invalidates_by_predicate():
+    cache = TTLLRUCache(2, ttl_sec=60, clock=_Clock())
+    cache["a"] = 1
+    cache["b"] = 2
+    cache.lookup("a")
+    cache["c"] = 3
+
+    assert cache.keys() == ["a", "c"]
+    assert cache.stats()["evictions"] == 1
+
+    assert cache.invalidate(lambda key, value: value > 2) == 1
+    assert cache.keys() == ["a"]
+    assert cache.pop("a") == 1
+    assert len(cache) == 0
@@ -0,0 +1,96 @@
+from genimail.constants import POLL_FOLDER_INTERVAL_SEC, POLL_INBOX_INTERVAL_SEC, POLL_LOW_TRAFFIC_INTERVAL_SEC
+from genimail.services.poll_scheduler import PollScheduler, base_interval_for_folder
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _scheduler(clock, **kwargs):
+    options = {"backoff_factor": 2, "max_backoff_factor": 4, "background_factor": 3, "activity_delay_sec": 2}
+    options.update(kwargs)
+    return PollScheduler(clock=clock, **options)
+
+
+def test_base_interval_for_folder_tiers():
+    assert base_interval_for_folder("Inbox") == POLL_INBOX_INTERVAL_SEC
+    assert base_interval_for_folder("sentitems") == POLL_FOLDER_INTERVAL_SEC
+    assert base_interval_for_folder("deleteditems") == POLL_LOW_TRAFFIC_INTERVAL_SEC
+    assert base_interval_for_folder("archive") == POLL_LOW_TRAFFIC_INTERVAL_SEC
+
+
+def test_new_folders_are_due_and_then_follow_their_own_cadence():
+    clock = _Clock()
+    scheduler = _scheduler(clock)
+    scheduler.set_folders({"inbox": 30, "deleteditems": 600})
+
+    assert scheduler.due_folders() == ["inbox", "deleteditems"]
+    scheduler.record_result("inbox", changed=True)
+    scheduler.record_result("deleteditems", changed=True)
+
+    assert scheduler.due_folders() == []
+    assert scheduler.seconds_until_next() == 30
+    clock.now += 30
+    assert scheduler.due_folders() == ["inbox"]
+
+
+def test_empty_polls_back_off_up_to_the_ceiling_and_changes_reset():
+    clock = _Clock()
+    scheduler = _scheduler(clock)
+    scheduler.set_folders({"inbox": 30})
+
+    seen = []
+    for _ in range(4):
+        scheduler.record_result("inbox", changed=False)
+        seen.append(scheduler.intervals()["inbox"])
+    assert seen == [60, 120, 120, 120]
+
+    scheduler.record_result("inbox", changed=True)
+    assert scheduler.intervals()["inbox"] == 30
+
+
+def test_background_slows_polls_and_boost_pulls_folders_forward():
+    clock = _Clock()
+    scheduler = _scheduler(clock)
+    scheduler.set_folders({"inbox": 30, "sentitems": 120})
+    scheduler.set_background(True)
+    scheduler.record_result("inbox", changed=False)
+    scheduler.record_result("sentitems", changed=False)
+
+    assert scheduler.seconds_until_next() == 180
+
+    scheduler.boost(["sentitems"])
+
+    assert scheduler.seconds_until_next() == 2
+    assert scheduler.intervals()["sentitems"] == 360
+    clock.now += 2
+    assert scheduler.due_folders() == ["sentitems"]
+
+
+def test_set_folders_keeps_backoff_state_and_drops_removed_folders():
+    clock = _Clock()
+    scheduler = _scheduler(clock)
+    scheduler.set_folders({"inbox": 30, "junkemail": 600})
+    scheduler.record_result("inbox", changed=False)
+
+    scheduler.set_folders({"inbox": 30, "drafts": 120})
+
+    assert scheduler.folder_ids() == ["inbox", "drafts"]
+    assert scheduler.intervals()["inbox"] == 60
+    assert scheduler.due_folders() == ["drafts"]
+
+
+def test_boost_during_an_in_flight_poll_survives_its_result():
+    clock = _Clock()
+    scheduler = _scheduler(clock)
+    scheduler.set_folders({"inbox": 30})
+    assert scheduler.due_folders() == ["inbox"]
+
+    scheduler.boost(["inbox"])
+    scheduler.record_result("inbox", changed=False)
+
+    assert scheduler.seconds_until_next() == 2
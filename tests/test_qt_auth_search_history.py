@@ -166,7 +166,7 @@ def test_poll_result_always_resets_in_flight_when_callback_raises():
             pass
 
         @staticmethod
-        def _render_message_list():
+        def _apply_message_list_updates(_updates, _deleted_ids):
             raise RuntimeError("render failed")
 
     probe = _Probe()
@@ -199,3 +199,177 @@ def test_poll_result_ignores_stale_generation_payload():
 
     assert probe.current_messages == [{"id": "old"}]
     assert probe._poll_in_flight is False
+
+
+def test_poll_once_syncs_only_due_folders_and_rearms_timer():
+    from genimail.services.poll_scheduler import PollScheduler
+
+    class _Workers:
+        def __init__(self):
+            self.calls = []
+
+        def submit(self, fn, on_result, on_error=None):
+            self.calls.append((fn, on_result, on_error))
+
+    class _Timer:
+        def __init__(self):
+            self.started = []
+
+        def start(self, msec=None):
+            self.started.append(msec)
+
+    class _Sync:
+        def __init__(self):
+            self.folder_calls = []
+
+        def sync_delta_for_folders(self, folder_ids, fallback_top, primary_folder_id):
+            self.folder_calls.append((list(folder_ids), primary_folder_id))
+            return {"folder_ids": list(folder_ids), "updates_by_folder": {}, "deleted_by_folder": {}}
+
+    class _Probe(AuthPollMixin):
+        def __init__(self):
+            self.sync_service = _Sync()
+            self.workers = _Workers()
+            self._poll_timer = _Timer()
+            self._poll_generation = 1
+            self._poll_in_flight = False
+            self.poll_scheduler = PollScheduler(clock=lambda: 0.0)
+            self.company_folder_sources = [
+                {"id": "inbox-id", "key": "inbox"},
+                {"id": "trash-id", "key": "deleteditems"},
+            ]
+            self.current_folder_id = "inbox-id"
+            self.company_filter_domain = "acme.com"
+            self.known_ids = set()
+
+        def _set_status(self, _text):
+            pass
+
+    probe = _Probe()
+    probe.poll_scheduler.set_folders({"inbox-id": 30, "trash-id": 600})
+    probe.poll_scheduler.record_result("trash-id", changed=True)
+
+    AuthPollMixin._poll_once(probe)
+    fn, on_result, _ = probe.workers.calls[0]
+    payload = fn()
+    on_result(payload)
+
+    assert probe.sync_service.folder_calls == [(["inbox-id"], "inbox-id")]
+    assert probe._poll_in_flight is False
+    assert probe._poll_timer.started == [60000]
+
+
+def test_folder_change_notification_logs_unpolled_folder(capsys):
+    from genimail.services.poll_scheduler import PollScheduler
+
+    class _Probe(AuthPollMixin):
+        def __init__(self):
+            self.poll_scheduler = PollScheduler(clock=lambda: 0.0)
+            self.company_folder_sources = [
+                {"id": "inbox-id", "key": "inbox"},
+                {"id": "sent-id", "key": "sentitems"},
+            ]
+            self.sync_service = None
+            self._poll_in_flight = False
+
+    probe = _Probe()
+    probe.poll_scheduler.set_folders({"inbox-id": 30, "sent-id": 120})
+
+    AuthPollMixin._on_folder_change_notified(probe, "SentItems")
+    assert capsys.readouterr().out == ""
+
+    AuthPollMixin._on_folder_change_notified(probe, "archive")
+    assert "unpolled folder: archive" in capsys.readouterr().out
+
+
+def test_poll_result_refreshes_company_tab_counts_when_mail_changes():
+    class _Probe(AuthPollMixin):
+        def __init__(self):
+            self._poll_generation = 1
+            self._poll_in_flight = True
+            self.known_ids = set()
+            self.company_filter_domain = "acme.com"
+            self.refreshes = 0
+
+        def _refresh_company_tab_counts(self):
+            self.refreshes += 1
+
+        @staticmethod
+        def _set_status(_text):
+            pass
+
+        @staticmethod
+        def _schedule_next_poll():
+            pass
+
+    probe = _Probe()
+    quiet = {"_poll_generation": 1, "all_messages": [], "all_deleted_ids": []}
+    AuthPollMixin._on_poll_result(probe, quiet)
+    assert probe.refreshes == 0
+
+    AuthPollMixin._on_poll_result(probe, dict(quiet, all_messages=[{"id": "m1", "isRead": True}]))
+    AuthPollMixin._on_poll_result(probe, dict(quiet, all_deleted_ids=["m0"]))
+    assert probe.refreshes == 2
+
+
+def test_loading_a_folder_boosts_its_polling():
+    from genimail.services.poll_scheduler import PollScheduler
+
+    class _Search:
+        @staticmethod
+        def text():
+            return ""
+
+    class _Cache:
+        @staticmethod
+        def get_messages_page(_folder_id, limit=100, cursor=None):
+            return [], None
+
+    class _Workers:
+        def __init__(self):
+            self.submitted = []
+
+        def submit(self, fn, on_result, on_error=None):
+            self.submitted.append(fn)
+
+    class _Timer:
+        def __init__(self):
+            self.started = []
+
+        def start(self, msec=None):
+            self.started.append(msec)
+
+    class _Probe(AuthPollMixin, EmailListMixin):
+        def __init__(self):
+            self.graph = object()
+            self.cache = _Cache()
+            self.workers = _Workers()
+            self.search_input = _Search()
+            self.company_filter_domain = None
+            self.company_folder_sources = [{"id": "inbox-id", "key": "inbox"}, {"id": "sent-id", "key": "sentitems"}]
+            self.current_folder_id = "sent-id"
+            self.sync_service = object()
+            self._poll_timer = _Timer()
+            self._poll_in_flight = False
+            self.poll_scheduler = PollScheduler(clock=lambda: 0.0)
+
+        def _cancel_body_prefetch(self):
+            pass
+
+        def _show_message_list(self):
+            pass
+
+        def _set_status(self, _text):
+            pass
+
+    probe = _Probe()
+    probe.poll_scheduler.set_folders({"inbox-id": 30, "sent-id": 120})
+    for folder_id in ("inbox-id", "sent-id"):
+        probe.poll_scheduler.record_result(folder_id, changed=False)
+
+    probe._load_messages()
+
+    assert probe.poll_scheduler.due_folders() == []
+    assert probe.poll_scheduler.seconds_until_next() == 2
+    assert probe._poll_timer.started == [2000]
+    assert len(probe.workers.submitted) == 1
@@ -1,5 +1,6 @@
 import time
 
+from genimail.infra.memory_cache import TTLLRUCache
 from genimail_qt.window import GeniMailQtWindow
 
 
@@ -45,6 +46,34 @@ def test_message_matches_company_filter_rules():
     assert not GeniMailQtWindow._message_matches_company_filter(sent_msg, "example.com")
 
 
+def test_count_messages_for_query_uses_incremental_participant_index():
+    from genimail_qt.mixins.company import CompanyMixin
+
+    class _Probe(CompanyMixin):
+        def __init__(self):
+            self.company_result_messages = []
+            self.current_messages = [
+                {"id": "1", "from": {"emailAddress": {"address": "Billing@Acme.com"}}},
+                {
+                    "id": "2",
+                    "from": {"emailAddress": {"address": "me@mycompany.com"}},
+                    "toRecipients": [{"emailAddress": {"address": "ops@acme.com"}}],
+                },
+            ]
+
+    probe = _Probe()
+    assert probe._count_messages_for_query("acme.com") == 2
+    assert probe._count_messages_for_query("billing@acme.com") == 1
+    assert probe._count_messages_for_query("mycompany") == 1
+
+    probe.current_messages.extend([{"id": "3", "from": {"emailAddress": {"address": "sales@acme.com"}}}])
+    assert probe._count_messages_for_query("acme.com") == 3
+
+    probe.current_messages = [{"id": "4", "from": {"emailAddress": {"address": "x@other.org"}}}]
+    assert probe._count_messages_for_query("acme.com") == 0
+    assert probe._count_messages_for_query("other.org") == 1
+
+
 def test_load_company_queries_supports_legacy_dict_and_new_list():
     fake_dict = _FakeWindow({"companies": {"airmiles": "airmiles", "airmiles.ca": "airmiles.ca"}})
     assert GeniMailQtWindow._load_company_queries(fake_dict) == [
@@ -108,11 +137,10 @@ def test_cached_empty_company_results_are_applied_before_ttl_return():
     class _Probe:
         def __init__(self):
             self.graph = object()
-            self.company_query_cache = {
-                "acme.com": {
-                    "messages": [],
-                    "fetched_at": time.time(),
-                }
+            self.company_query_cache = TTLLRUCache(20, 120)
+            self.company_query_cache[("acme.com", frozenset())] = {
+                "messages": [],
+                "fetched_at": time.time(),
             }
             self.company_query_inflight = set()
             self.company_result_messages = [{"id": "stale"}]
@@ -182,7 +210,7 @@ def test_company_load_uses_sqlite_cache_before_background_refresh():
             self.message_list = _List()
             self.current_folder_id = "inbox"
             self.company_folder_sources = [{"id": "sentitems", "key": "sentitems", "label": "Sent"}]
-            self.company_query_cache = {}
+            self.company_query_cache = TTLLRUCache(20, 120)
             self.company_query_inflight = set()
             self.company_result_messages = []
             self.company_folder_filter = "all"
@@ -301,30 +329,28 @@ def test_messages_worker_falls_back_to_local_filter_when_graph_search_fails():
     from genimail_qt.mixins.email_list import EmailListMixin
 
     class _Graph:
-        def get_messages(self, folder_id="inbox", top=50, search=None, filter_str=None):
-            _ = top, filter_str
+        def iter_message_pages(self, folder_id="inbox", search=None, projection="list", max_messages=None):
+            _ = folder_id, projection, max_messages
             if search:
                 raise RuntimeError("search unsupported")
-            return (
-                [
-                    {
-                        "id": "1",
-                        "subject": "Invoice",
-                        "bodyPreview": "Payment due",
-                        "from": {"emailAddress": {"name": "Acme", "address": "billing@acme.com"}},
-                    },
-                    {
-                        "id": "2",
-                        "subject": "Status",
-                        "bodyPreview": "Nothing due",
-                        "from": {"emailAddress": {"name": "Other", "address": "noreply@example.com"}},
-                    },
-                ],
-                None,
-            )
+            yield [
+                {
+                    "id": "1",
+                    "subject": "Invoice",
+                    "bodyPreview": "Payment due",
+                    "from": {"emailAddress": {"name": "Acme", "address": "billing@acme.com"}},
+                },
+                {
+                    "id": "2",
+                    "subject": "Status",
+                    "bodyPreview": "Nothing due",
+                    "from": {"emailAddress": {"name": "Other", "address": "noreply@example.com"}},
+                },
+            ]
 
     class _Probe:
         graph = _Graph()
+        _collect_message_pages = EmailListMixin._collect_message_pages
 
         @staticmethod
         def _message_matches_search(msg, text):
@@ -394,6 +420,113 @@ def test_on_messages_loaded_ignores_stale_payload_token():
     assert probe.render_calls == 0
 
 
+
+def test_load_next_message_page_appends_cached_page_and_advances_cursor():
+    from genimail_qt.mixins.email_list import EmailListMixin
+
+    class _Cache:
+        def __init__(self):
+            self.calls = []
+
+        def get_messages_page(self, folder_id, limit=100, cursor=None):
+            self.calls.append((folder_id, limit, cursor))
+            return [{"id": "b"}, {"id": "c"}], None
+
+    class _Model:
+        def __init__(self):
+            self.appended = []
+
+        def append_messages(self, messages):
+            self.appended.extend(msg["id"] for msg in messages)
+
+    class _View:
+        def __init__(self):
+            self._model = _Model()
+
+        def model(self):
+            return self._model
+
+    class _Probe:
+        def __init__(self):
+            self.cache = _Cache()
+            self.company_filter_domain = None
+            self.current_folder_id = "inbox"
+            self._message_page_cursor = ("2026-01-01T00:00:00Z", "b")
+            self.current_messages = [{"id": "a"}, {"id": "b"}]
+            self.filtered_messages = list(self.current_messages)
+            self.known_ids = {"a", "b"}
+            self.message_list = _View()
+
+        @staticmethod
+        def _folder_key_for_id(_folder_id):
+            return "inbox"
+
+        @staticmethod
+        def _with_folder_meta(msg, folder_id, folder_key, folder_label=None):
+            return EmailListMixin._with_folder_meta(msg, folder_id, folder_key, folder_label)
+
+        def _append_messages(self, messages):
+            EmailListMixin._append_messages(self, messages)
+
+    probe = _Probe()
+    EmailListMixin._load_next_message_page(probe)
+    EmailListMixin._load_next_message_page(probe)
+
+    assert probe.cache.calls == [("inbox", 100, ("2026-01-01T00:00:00Z", "b"))]
+    assert probe._message_page_cursor is None
+    assert [msg["id"] for msg in probe.current_messages] == ["a", "b", "c"]
+    assert probe.message_list.model().appended == ["c"]
+    assert probe.known_ids == {"a", "b", "c"}
+
+
+def test_load_next_message_page_continues_local_search_results():
+    from genimail_qt.mixins.email_list import EmailListMixin
+
+    class _Cache:
+        def __init__(self):
+            self.calls = []
+
+        def search_messages_page(self, search_text, folder_id=None, limit=100, cursor=None):
+            self.calls.append((search_text, folder_id, limit, cursor))
+            return [{"id": "c"}], 200
+
+        @staticmethod
+        def get_messages_page(*_args, **_kwargs):
+            raise AssertionError("search results must not page through the folder")
+
+    class _Probe:
+        def __init__(self):
+            self.cache = _Cache()
+            self.company_filter_domain = None
+            self.current_folder_id = "inbox"
+            self.appended = []
+
+        @staticmethod
+        def _folder_key_for_id(_folder_id):
+            return "inbox"
+
+        @staticmethod
+        def _with_folder_meta(msg, folder_id, folder_key, folder_label=None):
+            return EmailListMixin._with_folder_meta(msg, folder_id, folder_key, folder_label)
+
+        @staticmethod
+        def _render_message_list():
+            pass
+
+        def _append_messages(self, messages):
+            self.appended.extend(msg["id"] for msg in messages)
+
+    probe = _Probe()
+    EmailListMixin._set_messages(probe, [{"id": "a"}], page_cursor=100, page_search="invoice")
+    EmailListMixin._load_next_message_page(probe)
+
+    assert probe.cache.calls == [("invoice", "inbox", 100, 100)]
+    assert probe._message_page_cursor == 200
+    assert probe.appended == ["c"]
+
+    EmailListMixin._set_messages(probe, [{"id": "z"}])
+    assert probe._message_page_search is None
+
 def test_company_load_token_prevents_stale_results():
     from genimail_qt.mixins.email_company_search import CompanySearchMixin
 
@@ -419,10 +552,6 @@ def test_company_load_token_prevents_stale_results():
         def _set_company_tabs_enabled(_enabled):
             pass
 
-        @staticmethod
-        def _evict_company_cache():
-            pass
-
     probe = _Probe()
     payload = {
         "token": 1,
@@ -435,7 +564,7 @@ def test_company_load_token_prevents_stale_results():
     CompanySearchMixin._on_company_messages_loaded(probe, payload)
 
     # Stale results (wrong token) are fully discarded — no cache update, no display update.
-    assert "acme.com" not in probe.company_query_cache
+    assert probe.company_query_cache == {}
     assert probe.apply_calls == 0
     assert probe.company_result_messages == ["stale"]
 
@@ -704,3 +833,244 @@ def test_company_search_loads_from_sqlite_cache_before_remote_refine():
     assert probe.workers.submit_calls == 1
     assert probe._company_load_token == 1
     assert "local message" in probe.status.lower()
+
+
+def test_refresh_company_tab_counts_reads_aggregates_in_one_call():
+    from genimail_qt.mixins.company import CompanyMixin
+
+    class _Btn:
+        def __init__(self):
+            self.text = ""
+            self.tooltip = ""
+
+        def setText(self, text):
+            self.text = text
+
+        def setToolTip(self, text):
+            self.tooltip = text
+
+    class _Cache:
+        def __init__(self):
+            self.calls = []
+
+        def get_company_counts(self, domains, folder_ids=None):
+            self.calls.append((sorted(domains), folder_ids))
+            return {"acme.com": {"total": 12, "unread": 3, "last_received": None}}
+
+    class _Probe(CompanyMixin):
+        def __init__(self):
+            self.cache = _Cache()
+            self.company_folder_sources = [{"id": "inbox-id"}, {"id": "sent-id"}]
+            self.company_entries_visible = [
+                {"domain": "acme.com", "label": "Acme"},
+                {"domain": "other.org", "label": "Other"},
+                {"domain": "airmiles", "label": "Air Miles"},
+            ]
+            self.company_tab_buttons = {entry["domain"]: _Btn() for entry in self.company_entries_visible}
+
+    probe = _Probe()
+    probe._refresh_company_tab_counts()
+
+    assert probe.cache.calls == [(["acme.com", "other.org"], ["inbox-id", "sent-id"])]
+    assert probe.company_tab_buttons["acme.com"].text == "Acme (3)"
+    assert probe.company_tab_buttons["acme.com"].tooltip == "12 cached message(s), 3 unread"
+    assert probe.company_tab_buttons["other.org"].text == "Other"
+    assert probe.company_tab_buttons["airmiles"].text == "Air Miles"
+
+
+def _company_cache_probe(last_sync_times, authoritative=True):
+    from genimail_qt.mixins.email_list import EmailListMixin
+
+    class _Cache:
+        def __init__(self):
+            self.searches = []
+
+        def search_company_messages(self, query, search_text=None):
+            self.searches.append((query, search_text))
+            return [
+                {
+                    "id": "c1",
+                    "subject": "Invoice",
+                    "from": {"emailAddress": {"name": "Acme", "address": "billing@acme.com"}},
+                    "receivedDateTime": "2026-01-01T00:00:00Z",
+                    "_folder_id": "inbox-id",
+                }
+            ]
+
+        @staticmethod
+        def get_last_sync_times(folder_ids):
+            return {folder_id: last_sync_times[folder_id] for folder_id in folder_ids if folder_id in last_sync_times}
+
+    class _Workers:
+        def __init__(self):
+            self.submitted = []
+
+        def submit(self, fn, _on_result, _on_error=None):
+            self.submitted.append(fn)
+
+    class _Search:
+        @staticmethod
+        def text():
+            return ""
+
+    class _Probe:
+        def __init__(self):
+            self.graph = object()
+            self.config = _FakeConfig({"company_cache_authoritative": authoritative})
+            self.cache = _Cache()
+            self.workers = _Workers()
+            self.search_input = _Search()
+            self.current_folder_id = "inbox-id"
+            self.company_folder_sources = [
+                {"id": "inbox-id", "key": "inbox", "label": "Inbox"},
+                {"id": "sent-id", "key": "sentitems", "label": "Sent"},
+            ]
+            self.company_query_cache = TTLLRUCache(20, 120)
+            self.company_query_inflight = set()
+            self.company_result_messages = []
+            self.company_folder_filter = "all"
+            self.filtered_messages = []
+            self._company_search_override = None
+            self.worker_calls = []
+            self.status = ""
+
+        @staticmethod
+        def _folder_key_for_id(folder_id):
+            return folder_id
+
+        @staticmethod
+        def _with_folder_meta(msg, folder_id, folder_key, folder_label=None):
+            return EmailListMixin._with_folder_meta(msg, folder_id, folder_key, folder_label)
+
+        @staticmethod
+        def _message_matches_company_filter(msg, query):
+            return GeniMailQtWindow._message_matches_company_filter(msg, query)
+
+        def _company_messages_worker(self, query, token=None, sources=None):
+            self.worker_calls.append((query, [source["id"] for source in sources or []]))
+
+        def _apply_company_folder_filter(self):
+            override = self._company_search_override or {}
+            self.filtered_messages = list(override.get("messages") or self.company_result_messages)
+
+        def _set_status(self, text):
+            self.status = text
+
+        @staticmethod
+        def _show_message_list():
+            pass
+
+        @staticmethod
+        def _set_messages(_messages):
+            pass
+
+        @staticmethod
+        def _clear_detail_view(_msg=None):
+            pass
+
+        @staticmethod
+        def _on_company_messages_loaded(_payload):
+            pass
+
+        @staticmethod
+        def _on_company_messages_error(_query, _trace_text):
+            pass
+
+    return _Probe()
+
+
+def test_company_load_answers_from_cache_when_every_source_is_synced():
+    from genimail_qt.mixins.email_company_search import CompanySearchMixin
+
+    now = int(time.time())
+    probe = _company_cache_probe({"inbox-id": now, "sent-id": now})
+    CompanySearchMixin._load_company_messages_all_folders(probe, "acme.com")
+
+    assert [msg["id"] for msg in probe.filtered_messages] == ["c1"]
+    assert probe.workers.submitted == []
+    assert probe.company_query_inflight == set()
+    assert "synced cache" in probe.status
+
+
+def test_company_load_refreshes_only_stale_sources():
+    from genimail_qt.mixins.email_company_search import CompanySearchMixin
+
+    probe = _company_cache_probe({"inbox-id": int(time.time()), "sent-id": 0})
+    CompanySearchMixin._load_company_messages_all_folders(probe, "acme.com")
+
+    assert len(probe.workers.submitted) == 1
+    probe.workers.submitted[0]()
+    assert probe.worker_calls == [("acme.com", ["sent-id"])]
+
+
+def test_stale_company_sources_follow_the_poll_schedule():
+    from genimail.services.poll_scheduler import PollScheduler
+    from genimail_qt.mixins.email_company_search import CompanySearchMixin
+
+    now = int(time.time())
+    probe = _company_cache_probe({"inbox-id": now - 20, "sent-id": now - 2000})
+    probe.poll_scheduler = PollScheduler(clock=lambda: 0.0)
+    probe.poll_scheduler.set_folders({"inbox-id": 30, "sent-id": 120})
+    assert [source["id"] for source in CompanySearchMixin._stale_company_sources(probe)] == ["sent-id"]
+
+    # Idle polls stretch Sent to 960 s and the background quadruples it, so a
+    # sync 2000 s old is still within the folder's slot.
+    for _ in range(3):
+        probe.poll_scheduler.record_result("sent-id", changed=False)
+    probe.poll_scheduler.set_background(True)
+    assert CompanySearchMixin._stale_company_sources(probe) == []
+
+    probe.poll_scheduler.record_result("sent-id", changed=True)
+    assert [source["id"] for source in CompanySearchMixin._stale_company_sources(probe)] == ["sent-id"]
+
+
+def test_company_load_refreshes_everything_when_cache_mode_is_off():
+    from genimail_qt.mixins.email_company_search import CompanySearchMixin
+
+    now = int(time.time())
+    probe = _company_cache_probe({"inbox-id": now, "sent-id": now}, authoritative=False)
+    CompanySearchMixin._load_company_messages_all_folders(probe, "acme.com")
+
+    probe.workers.submitted[0]()
+    assert probe.worker_calls == [("acme.com", [])]
+
+
+def test_company_search_uses_cache_when_every_source_is_synced():
+    from genimail_qt.mixins.email_company_search import CompanySearchMixin
+
+    now = int(time.time())
+    probe = _company_cache_probe({"inbox-id": now, "sent-id": now})
+    probe.company_result_messages = [{"id": "stale"}]
+    CompanySearchMixin._load_company_messages_with_search(probe, "acme.com", "Invoice")
+
+    assert probe.cache.searches == [("acme.com", "invoice")]
+    assert [msg["id"] for msg in probe.filtered_messages] == ["c1"]
+    assert probe._company_search_override["search_text"] == "invoice"
+    assert probe.workers.submitted == []
+
+
+def test_poll_results_invalidate_matching_company_cache_entries():
+    from genimail_qt.mixins.email_company_search import CompanySearchMixin
+
+    class _Probe(CompanySearchMixin):
+        def __init__(self):
+            self.company_folder_sources = [{"id": "Inbox-ID"}, {"id": "sent-id"}]
+            self.company_query_cache = TTLLRUCache(20, 120)
+
+        @staticmethod
+        def _message_matches_company_filter(msg, query):
+            return GeniMailQtWindow._message_matches_company_filter(msg, query)
+
+    probe = _Probe()
+    acme_key = probe._company_cache_key(" Acme.com ")
+    assert acme_key == ("acme.com", frozenset({"inbox-id", "sent-id"}))
+    probe.company_query_cache[acme_key] = {"messages": [{"id": "a1"}]}
+    probe.company_query_cache[probe._company_cache_key("other.org")] = {"messages": [{"id": "o1"}]}
+    probe.company_query_cache[probe._company_cache_key("quiet.net")] = {"messages": [{"id": "q1"}]}
+
+    new_mail = [{"id": "n1", "toRecipients": [{"emailAddress": {"address": "ops@acme.com"}}]}]
+    assert probe._invalidate_company_cache(new_mail, ["o1"]) == 2
+
+    assert [key[0] for key in probe.company_query_cache.keys()] == ["quiet.net"]
+    assert probe._invalidate_company_cache([], []) == 0
+    assert probe.company_query_cache.stats()["invalidations"] == 2
@@ -116,3 +116,149 @@ def test_hydrate_inline_attachment_bytes_skips_download_when_present():
 
     assert graph.calls == []
     assert hydrated[0]["contentBytes"] == "INLINE_DATA"
+
+
+def test_hydrate_inline_attachment_bytes_batches_downloads_when_supported():
+    class _BatchGraph:
+        def __init__(self):
+            self.batch_calls = []
+
+        def download_attachments(self, message_id, attachment_ids):
+            self.batch_calls.append((message_id, list(attachment_ids)))
+            return {"att-1": {"contentBytes": "AAA"}, "att-2": {"contentBytes": "BBB"}}
+
+        def download_attachment(self, message_id, attachment_id):
+            raise AssertionError("per-attachment download should not be used")
+
+    graph = _BatchGraph()
+    fake = _FakeWindow(graph)
+    attachments = [
+        {"@odata.type": "#microsoft.graph.fileAttachment", "id": "att-1", "isInline": True, "contentId": "<a>"},
+        {"@odata.type": "#microsoft.graph.fileAttachment", "id": "att-2", "isInline": True, "contentId": "<b>"},
+        {"@odata.type": "#microsoft.graph.fileAttachment", "id": "att-3", "isInline": False, "name": "doc.pdf"},
+    ]
+
+    hydrated = GeniMailQtWindow._hydrate_inline_attachment_bytes(fake, "msg-3", attachments)
+
+    assert graph.batch_calls == [("msg-3", ["att-1", "att-2"])]
+    assert [item.get("contentBytes") for item in hydrated] == ["AAA", "BBB", None]
+
+
+class _BodyCache:
+    def __init__(self, body, attachments=()):
+        self.body = body
+        self.attachments = list(attachments)
+
+    def get_message_body(self, message_id):
+        return self.body
+
+    def get_attachments(self, message_id):
+        return list(self.attachments)
+
+
+class _CacheWindow:
+    _cache_sink = GeniMailQtWindow._cache_sink
+
+    def __init__(self, cache, cache_writer=None):
+        self.cache = cache
+        self.cache_writer = cache_writer
+
+
+def test_cached_message_detail_uses_prefetched_body():
+    cache = _BodyCache(
+        {"contentType": "html", "content": "<p>hi</p>"},
+        [{"id": "att-1", "name": "doc.pdf", "isInline": False}],
+    )
+    msg = {"id": "msg-1", "subject": "Quote"}
+
+    detail, attachments = GeniMailQtWindow._cached_message_detail(_CacheWindow(cache), msg)
+
+    assert detail["subject"] == "Quote"
+    assert detail["body"] == {"contentType": "html", "content": "<p>hi</p>"}
+    assert attachments == [{"id": "att-1", "name": "doc.pdf", "isInline": False}]
+    assert "body" not in msg
+
+
+def test_cached_message_detail_defers_cid_bodies_to_graph():
+    cache = _BodyCache({"contentType": "html", "content": '<img src="cid:logo">'})
+
+    assert GeniMailQtWindow._cached_message_detail(_CacheWindow(cache), {"id": "msg-1"}) is None
+    assert GeniMailQtWindow._cached_message_detail(_CacheWindow(_BodyCache(None)), {"id": "msg-2"}) is None
+
+
+def test_schedule_body_prefetch_orders_unread_first_and_skips_loaded():
+    class _Prefetcher:
+        def __init__(self):
+            self.calls = []
+
+        def prefetch(self, message_ids):
+            self.calls.append(list(message_ids))
+
+    class _Window:
+        company_filter_domain = None
+
+    fake = _Window()
+    fake.body_prefetcher = _Prefetcher()
+    fake.message_cache = {"m3": {}}
+    fake.filtered_messages = [
+        {"id": "m1", "isRead": True},
+        {"id": "m2", "isRead": False},
+        {"id": "m3", "isRead": False},
+        {"id": "m4", "isRead": True},
+    ]
+
+    GeniMailQtWindow._schedule_body_prefetch(fake)
+    fake.company_filter_domain = "acme.com"
+    GeniMailQtWindow._schedule_body_prefetch(fake)
+
+    assert fake.body_prefetcher.calls == [["m2", "m1", "m4"]]
+
+
+def test_spill_message_detail_saves_body_missing_from_sqlite():
+    class _SpillCache:
+        def __init__(self, cached_ids):
+            self.cached_ids = set(cached_ids)
+            self.saved = []
+
+        def get_cached_body_ids(self, message_ids):
+            return {message_id for message_id in message_ids if message_id in self.cached_ids}
+
+        def save_message_body(self, message_id, content_type, content):
+            self.saved.append((message_id, content_type, content))
+
+    cache = _SpillCache(cached_ids={"m2"})
+    fake = _CacheWindow(cache)
+    detail = {"body": {"contentType": "html", "content": "<p>hi</p>"}}
+
+    GeniMailQtWindow._spill_message_detail(fake, "m1", detail)
+    GeniMailQtWindow._spill_message_detail(fake, "m2", detail)
+    GeniMailQtWindow._spill_message_detail(fake, "m3", {"body": {}})
+
+    assert cache.saved == [("m1", "html", "<p>hi</p>")]
+
+
+def test_spill_writes_go_through_the_write_behind_queue():
+    class _SpillCache:
+        def get_cached_body_ids(self, message_ids):
+            return set()
+
+        def get_attachments(self, message_id):
+            return []
+
+    class _Writer:
+        def __init__(self):
+            self.calls = []
+
+        def save_message_body(self, message_id, content_type, content):
+            self.calls.append(("body", message_id))
+
+        def save_attachments(self, message_id, attachments):
+            self.calls.append(("attachments", message_id))
+
+    writer = _Writer()
+    fake = _CacheWindow(_SpillCache(), cache_writer=writer)
+
+    GeniMailQtWindow._spill_message_detail(fake, "m1", {"body": {"contentType": "text", "content": "hi"}})
+    GeniMailQtWindow._spill_attachments(fake, "m1", [{"id": "a1"}])
+
+    assert writer.calls == [("body", "m1"), ("attachments", "m1")]
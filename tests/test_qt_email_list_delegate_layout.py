@@ -1,8 +1,9 @@
-from PySide6.QtCore import QRect, Qt
-from PySide6.QtGui import QFont, QStandardItem, QStandardItemModel
+from PySide6.QtCore import QRect
+from PySide6.QtGui import QFont
 from PySide6.QtWidgets import QApplication, QStyle, QStyleOptionViewItem
 
 from genimail_qt.constants import EMAIL_LIST_DENSITY_COMFORTABLE, EMAIL_LIST_DENSITY_COMPACT
+from genimail_qt.message_list_model import MessageListModel
 from genimail_qt.mixins.email_list import CompanyColorDelegate
 
 
@@ -11,18 +12,21 @@ def _ensure_app():
 
 
 def _build_index():
-    model = QStandardItemModel(1, 1)
-    item = QStandardItem("Jan 01\x1fAcme Painter Services\x1fBid Follow Up\x1fCan we schedule a site visit this week?")
-    item.setData(
-        {
-            "isRead": False,
-            "from": {"emailAddress": {"address": "estimating@acme.com"}},
-            "toRecipients": [],
-            "ccRecipients": [],
-        },
-        Qt.UserRole,
+    model = MessageListModel()
+    model.set_messages(
+        [
+            {
+                "id": "m1",
+                "subject": "Bid Follow Up",
+                "bodyPreview": "Can we schedule a site visit this week?",
+                "receivedDateTime": "2026-01-01T00:00:00Z",
+                "isRead": False,
+                "from": {"emailAddress": {"name": "Acme Painter Services", "address": "estimating@acme.com"}},
+                "toRecipients": [],
+                "ccRecipients": [],
+            }
+        ]
     )
-    model.setItem(0, 0, item)
     return model.index(0, 0)
 
 
@@ -0,0 +1,189 @@
+from PySide6.QtCore import QRect
+from PySide6.QtGui import QImage, QPainter
+from PySide6.QtWidgets import QApplication, QStyle, QStyleOptionViewItem
+
+from genimail.constants import SEARCH_HIGHLIGHT_END, SEARCH_HIGHLIGHT_START
+from genimail_qt.constants import EMAIL_LIST_DENSITY_COMPACT
+from genimail_qt.message_list_model import (
+    DomainsRole,
+    MessageListModel,
+    MessageRole,
+    PreviewHighlightRole,
+    PreviewRole,
+    SenderRole,
+    SubjectHighlightRole,
+    SubjectRole,
+    UnreadRole,
+)
+from genimail_qt.mixins.email_list import CompanyColorDelegate, _highlight_segments
+
+
+def _ensure_app():
+    return QApplication.instance() or QApplication([])
+
+
+def _msg(msg_id, subject="Hello", is_read=True, sender="billing@acme.com"):
+    return {
+        "id": msg_id,
+        "subject": subject,
+        "from": {"emailAddress": {"name": "Acme", "address": sender}},
+        "toRecipients": [{"emailAddress": {"name": "Me", "address": "me@example.com"}}],
+        "ccRecipients": [],
+        "receivedDateTime": "2026-01-01T00:00:00Z",
+        "isRead": is_read,
+        "bodyPreview": "  line one\n  line two ",
+    }
+
+
+def _record_signals(model):
+    events = []
+    model.rowsInserted.connect(lambda _parent, first, last: events.append(("insert", first, last)))
+    model.rowsRemoved.connect(lambda _parent, first, last: events.append(("remove", first, last)))
+    model.dataChanged.connect(lambda top, bottom, _roles=None: events.append(("change", top.row(), bottom.row())))
+    model.modelReset.connect(lambda: events.append(("reset",)))
+    return events
+
+
+def test_model_exposes_precomputed_row_fields():
+    _ensure_app()
+    model = MessageListModel()
+    model.set_messages([_msg("m1", subject="", is_read=False)])
+    index = model.index(0, 0)
+
+    assert index.data(SenderRole) == "Acme"
+    assert index.data(SubjectRole) == "(No subject)"
+    assert index.data(PreviewRole) == "line one line two"
+    assert index.data(UnreadRole) is True
+    assert index.data(DomainsRole) == ("acme.com", "example.com")
+    assert index.data(MessageRole)["id"] == "m1"
+
+
+def test_apply_updates_emits_row_signals_instead_of_reset():
+    _ensure_app()
+    model = MessageListModel()
+    model.set_messages([_msg("a"), _msg("b"), _msg("c")])
+    events = _record_signals(model)
+
+    model.apply_updates([_msg("c", subject="Changed"), _msg("n1"), _msg("n2")], deleted_ids=["b"])
+
+    assert ("reset",) not in events
+    assert events == [("remove", 1, 1), ("change", 1, 1), ("insert", 0, 0), ("insert", 0, 0)]
+    assert [msg["id"] for msg in model.messages()] == ["n2", "n1", "a", "c"]
+    assert model.index(3, 0).data(SubjectRole) == "Changed"
+
+
+def test_apply_updates_tracks_rows_of_messages_inserted_in_same_batch():
+    _ensure_app()
+    model = MessageListModel()
+    model.set_messages([_msg("a")])
+
+    model.apply_updates([_msg("n1"), _msg("n2"), _msg("n1", subject="Again"), _msg("a", subject="Edited")])
+
+    assert [msg["id"] for msg in model.messages()] == ["n2", "n1", "a"]
+    assert model.index(1, 0).data(SubjectRole) == "Again"
+    assert model.index(2, 0).data(SubjectRole) == "Edited"
+
+
+def test_apply_updates_skips_unknown_messages_older_than_the_loaded_page():
+    _ensure_app()
+    model = MessageListModel()
+    loaded = [_msg(f"m{i}") for i in range(100)]
+    for index, msg in enumerate(loaded):
+        msg["receivedDateTime"] = f"2026-01-01T00:{index // 60:02d}:{59 - index % 60:02d}Z"
+    model.set_messages(loaded)
+    old = _msg("m250", is_read=False)
+    old["receivedDateTime"] = "2020-06-01T00:00:00Z"
+    fresh = _msg("new")
+    fresh["receivedDateTime"] = "2026-02-01T00:00:00Z"
+
+    oldest_loaded = min(msg["receivedDateTime"] for msg in loaded)
+    model.apply_updates([old, fresh, _msg("m5", subject="Edited")], newer_than=oldest_loaded)
+
+    assert model.rowCount() == 101
+    assert model.data(model.index(0, 0), MessageRole)["id"] == "new"
+    assert "m250" not in [msg["id"] for msg in model.messages()]
+    assert model.data(model.index(6, 0), SubjectRole) == "Edited"
+
+
+def test_append_messages_inserts_rows_at_end():
+    _ensure_app()
+    model = MessageListModel()
+    model.set_messages([_msg("a")])
+    events = _record_signals(model)
+
+    model.append_messages([_msg("b"), _msg("c")])
+
+    assert events == [("insert", 1, 2)]
+    assert model.message_at(2)["id"] == "c"
+    assert model.message_at(3) is None
+
+
+def test_delegate_paints_from_model_roles():
+    _ensure_app()
+    model = MessageListModel()
+    model.set_messages([_msg("m1", is_read=False)])
+    delegate = CompanyColorDelegate()
+    delegate.set_color_map({"acme.com": "#123456"})
+    option = QStyleOptionViewItem()
+    option.rect = QRect(0, 0, 400, 64)
+    option.state = QStyle.State_Enabled
+    image = QImage(400, 64, QImage.Format_ARGB32)
+    image.fill(0)
+
+    painter = QPainter(image)
+    try:
+        delegate.paint(painter, option, model.index(0, 0))
+    finally:
+        painter.end()
+
+    assert image.pixelColor(1, 32).name() == "#123456"
+
+
+def _search_hit(msg_id):
+    msg = _msg(msg_id, subject="Drywall quote")
+    msg["_searchSubject"] = f"{SEARCH_HIGHLIGHT_START}Drywall{SEARCH_HIGHLIGHT_END} quote"
+    msg["_searchSnippet"] = f"…the {SEARCH_HIGHLIGHT_START}drywall{SEARCH_HIGHLIGHT_END} on site…"
+    return msg
+
+
+def test_search_hits_preview_the_matching_passage():
+    _ensure_app()
+    model = MessageListModel()
+    model.set_messages([_search_hit("m1"), _msg("m2")])
+    hit, plain = model.index(0, 0), model.index(1, 0)
+
+    assert hit.data(SubjectRole) == "Drywall quote"
+    assert hit.data(PreviewRole) == "…the drywall on site…"
+    assert hit.data(SubjectHighlightRole).startswith(SEARCH_HIGHLIGHT_START)
+    assert SEARCH_HIGHLIGHT_START in hit.data(PreviewHighlightRole)
+    assert plain.data(PreviewRole) == "line one line two"
+    assert plain.data(SubjectHighlightRole) is None
+    assert plain.data(PreviewHighlightRole) is None
+
+
+def test_highlight_segments_split_on_markers():
+    text = f"a {SEARCH_HIGHLIGHT_START}b{SEARCH_HIGHLIGHT_END} c {SEARCH_HIGHLIGHT_START}d"
+
+    assert _highlight_segments(text) == [("a ", False), ("b", True), (" c ", False), ("d", True)]
+    assert _highlight_segments("plain") == [("plain", False)]
+
+
+def test_delegate_paints_search_highlights_in_both_densities():
+    _ensure_app()
+    model = MessageListModel()
+    model.set_messages([_search_hit("m1")])
+    delegate = CompanyColorDelegate()
+    option = QStyleOptionViewItem()
+    option.state = QStyle.State_Enabled
+
+    for density in (None, EMAIL_LIST_DENSITY_COMPACT):
+        if density:
+            delegate.set_density_mode(density)
+        option.rect = QRect(0, 0, 400, 64)
+        image = QImage(400, 64, QImage.Format_ARGB32)
+        image.fill(0)
+        painter = QPainter(image)
+        try:
+            delegate.paint(painter, option, model.index(0, 0))
+        finally:
+            painter.end()
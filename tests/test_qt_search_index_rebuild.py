@@ -0,0 +1,59 @@
+from genimail_qt.mixins.window_state import WindowStateMixin
+
+
+class _Signal:
+    def __init__(self):
+        self.calls = []
+
+    def emit(self, *args):
+        self.calls.append(args)
+
+
+class _Workers:
+    def submit(self, fn, on_result, on_error=None):
+        on_result(fn())
+
+
+class _Cache:
+    def __init__(self, needs_rebuild):
+        self.needs_rebuild = needs_rebuild
+        self.rebuilds = 0
+
+    def search_index_needs_rebuild(self):
+        return self.needs_rebuild
+
+    def rebuild_search_index(self, on_progress=None, should_stop=None):
+        self.rebuilds += 1
+        assert not should_stop()
+        on_progress(3, 3)
+        return 3
+
+
+class _Probe(WindowStateMixin):
+    def __init__(self, cache):
+        self.cache = cache
+        self.workers = _Workers()
+        self.search_index_progress = _Signal()
+        self.statuses = []
+
+    def _set_status(self, text):
+        self.statuses.append(text)
+
+
+def test_search_index_rebuild_runs_on_worker_and_reports_progress():
+    probe = _Probe(_Cache(needs_rebuild=True))
+
+    probe._start_search_index_rebuild()
+
+    assert probe.cache.rebuilds == 1
+    assert probe.search_index_progress.calls == [(3, 3)]
+    assert probe.statuses == ["Indexing mail for search...", "Search index ready (3 messages)."]
+
+
+def test_complete_search_index_is_left_alone():
+    probe = _Probe(_Cache(needs_rebuild=False))
+
+    probe._start_search_index_rebuild()
+
+    assert probe.cache.rebuilds == 0
+    assert probe.statuses == []
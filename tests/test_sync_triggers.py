@@ -0,0 +1,93 @@
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from genimail.services.sync_triggers import ChangeNotificationReceiver
+
+
+def _post(url, payload=None, raw=None):
+    body = raw if raw is not None else json.dumps(payload).encode("utf-8")
+    request = urllib.request.Request(url, data=body, method="POST", headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status, response.read()
+    except urllib.error.HTTPError as exc:
+        return exc.code, exc.read()
+
+
+@pytest.fixture
+def receiver():
+    instance = ChangeNotificationReceiver(client_state="secret", subscriptions={"sub-inbox": "inbox"})
+    changed = []
+    event = threading.Event()
+
+    def on_folder_changed(folder_id):
+        changed.append(folder_id)
+        event.set()
+
+    instance.start(on_folder_changed)
+    instance.changed = changed
+    instance.changed_event = event
+    try:
+        yield instance
+    finally:
+        instance.stop()
+
+
+def test_receiver_echoes_subscription_validation_token(receiver):
+    status, body = _post(receiver.url + "?validationToken=abc%20123", raw=b"")
+
+    assert status == 200
+    assert body == b"abc 123"
+    assert receiver.changed == []
+
+
+def test_receiver_reports_each_changed_folder_once(receiver):
+    payload = {
+        "value": [
+            {"subscriptionId": "sub-inbox", "clientState": "secret", "resource": "Users/u/Messages/m1"},
+            {"subscriptionId": "sub-inbox", "clientState": "secret", "resource": "Users/u/Messages/m2"},
+            {"subscriptionId": "other", "clientState": "secret", "resource": "me/mailFolders('SentItems')/messages/m3"},
+        ]
+    }
+
+    status, _ = _post(receiver.url, payload)
+
+    assert status == 202
+    deadline = time.monotonic() + 5
+    while len(receiver.changed) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert receiver.changed == ["inbox", "SentItems"]
+    assert receiver.received == 3
+
+
+def test_receiver_drops_notifications_with_wrong_client_state(receiver):
+    payload = {"value": [{"subscriptionId": "sub-inbox", "clientState": "forged"}]}
+
+    status, _ = _post(receiver.url, payload)
+
+    assert status == 202
+    assert receiver.changed == []
+    assert receiver.rejected == 1
+
+
+def test_receiver_rejects_malformed_json(receiver):
+    status, _ = _post(receiver.url, raw=b"{not json")
+
+    assert status == 400
+    assert receiver.changed == []
+
+
+def test_stop_closes_the_listener():
+    instance = ChangeNotificationReceiver()
+    instance.start(lambda _folder_id: None)
+    url = instance.url
+    instance.stop()
+
+    assert instance.url is None
+    with pytest.raises(urllib.error.URLError):
+        urllib.request.urlopen(urllib.request.Request(url, data=b"{}", method="POST"), timeout=1)